@@ -0,0 +1,64 @@
+# arquivo: bench_classificador.py
+# Latência por chamada (uma linha de 132 features) do predict_proba do
+# sklearn contra o classificador compilado de utils/classificador_rapido.py,
+# para cada modelo em modelos/.
+#
+# Uso: python benchmarks/bench_classificador.py [--chamadas 5000]
+
+import argparse
+import glob
+import os
+import pickle
+import sys
+import time
+import warnings
+
+import numpy as np
+
+BASE_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..')
+sys.path.append(BASE_DIR)
+from utils.classificador_rapido import FusedLogisticClassifier, max_difference
+
+
+def latency_us(fn, n):
+    for _ in range(50):
+        fn()
+    tempos = np.empty(n)
+    for i in range(n):
+        t0 = time.perf_counter()
+        fn()
+        tempos[i] = time.perf_counter() - t0
+    return tempos * 1e6
+
+
+def main():
+    parser = argparse.ArgumentParser(description="sklearn predict_proba x classificador compilado")
+    parser.add_argument('--chamadas', type=int, default=5000)
+    args = parser.parse_args()
+
+    # Modelos treinados com DataFrame avisam sobre nomes de colunas a cada chamada
+    warnings.filterwarnings('ignore', category=UserWarning)
+    rng = np.random.default_rng(0)
+
+    for model_path in sorted(glob.glob(os.path.join(BASE_DIR, 'modelos', '*.pkl'))):
+        with open(model_path, 'rb') as f:
+            model = pickle.load(f)
+        fused = FusedLogisticClassifier.from_model(model)
+        name = os.path.basename(model_path)
+        if fused is None:
+            print(f"{name}: formato não suportado pelo caminho rápido")
+            continue
+
+        row = rng.uniform(0, 1, size=(33, 4)).astype(np.float32)
+        out = np.empty(fused.n_classes_)
+        sk = latency_us(lambda: model.predict_proba(row.reshape(1, -1)), args.chamadas)
+        fast = latency_us(lambda: fused.predict_proba_into(row, out), args.chamadas)
+
+        print(f"\n{name} ({fused.mode}, {fused.n_classes_} classes)")
+        print(f"  sklearn   : p50 {np.percentile(sk, 50):8.1f} us | p95 {np.percentile(sk, 95):8.1f} us")
+        print(f"  compilado : p50 {np.percentile(fast, 50):8.1f} us | p95 {np.percentile(fast, 95):8.1f} us")
+        print(f"  {np.median(sk) / np.median(fast):.0f}x mais rápido | diferença máxima {max_difference(model, fused):.1e}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,244 @@
+# arquivo: bench_etapas.py
+# Mede, uma a uma, as etapas por frame do caminho pose -> feedback da
+# MissionFrame: resize, cvtColor, Pose.process em cada model_complexity,
+# extração dos landmarks, predict_proba de cada modelo em modelos/ (sklearn e
+# compilado), desenho do esqueleto (draw_pose e mp_drawing.draw_landmarks) e a
+# conversão para a PhotoImage do Tk (nova a cada frame e paste()).
+#
+# Os frames vêm de um vídeo gravado (--video) ou são sintéticos; os landmarks
+# das etapas de classificação e desenho vêm de coord_videos/*.csv (poses reais).
+# O resultado sai em JSON com percentis, para comparar máquinas e commits.
+#
+# Uso: python benchmarks/bench_etapas.py [--video videos/asas_de_super_heroi.mp4]
+#                                         [--frames 200] [--saida etapas.json]
+
+import argparse
+import glob
+import json
+import os
+import pickle
+import platform
+import subprocess
+import sys
+import time
+import warnings
+from types import SimpleNamespace
+
+import cv2
+import numpy as np
+from PIL import Image
+
+BASE_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..')
+sys.path.append(BASE_DIR)
+from utils.classificador_rapido import compile_classifier
+from utils.exercicios import POSE_SETTINGS
+from utils.inferencia import draw_pose
+from utils.landmarks import NUM_LANDMARKS, landmarks_to_array, new_landmark_buffer
+
+FRAME_SIZE = (640, 480)
+PERCENTILES = (50, 90, 95, 99)
+
+
+def summarize(tempos_ms):
+    tempos = np.asarray(tempos_ms)
+    summary = {'n': int(tempos.size), 'media_ms': float(tempos.mean()),
+               'min_ms': float(tempos.min()), 'max_ms': float(tempos.max())}
+    for p in PERCENTILES:
+        summary[f'p{p}_ms'] = float(np.percentile(tempos, p))
+    return summary
+
+
+def measure(fn, inputs, n, warmup=5):
+    """Tempo (ms) de `fn(x)` percorrendo `inputs` em ciclo, depois do aquecimento."""
+    for i in range(warmup):
+        fn(inputs[i % len(inputs)])
+    tempos = np.empty(n)
+    for i in range(n):
+        x = inputs[i % len(inputs)]
+        t0 = time.perf_counter()
+        fn(x)
+        tempos[i] = time.perf_counter() - t0
+    return tempos * 1000
+
+
+def load_camera_frames(video_path, max_frames, size):
+    """Frames BGR no tamanho da câmera: do vídeo, ou sintéticos se não houver vídeo.
+
+    Retorna (frames, sintéticos?).
+    """
+    frames = []
+    if video_path:
+        cap = cv2.VideoCapture(video_path)
+        while len(frames) < max_frames:
+            ret, frame = cap.read()
+            if not ret:
+                break
+            frames.append(cv2.resize(frame, size))
+        cap.release()
+        if not frames:
+            print(f"AVISO: nenhum frame lido de {video_path}; usando frames sintéticos.")
+    if not frames:
+        rng = np.random.default_rng(1)
+        w, h = size
+        return [rng.integers(0, 255, size=(h, w, 3), dtype=np.uint8) for _ in range(8)], True
+    return frames, False
+
+
+def load_recorded_landmarks(max_rows):
+    """Landmarks (N, 33, 4) reais gravados em coord_videos/*.csv."""
+    import pandas as pd
+    columns = [f"{c}{i}" for i in range(1, NUM_LANDMARKS + 1) for c in ('x', 'y', 'z', 'v')]
+    arrays = [pd.read_csv(path, usecols=columns)[columns].to_numpy(np.float32)
+              for path in sorted(glob.glob(os.path.join(BASE_DIR, 'coord_videos', '*.csv')))]
+    if not arrays:
+        rng = np.random.default_rng(0)
+        data = rng.uniform(0.2, 0.8, size=(max_rows, NUM_LANDMARKS * 4)).astype(np.float32)
+    else:
+        data = np.vstack(arrays)[:max_rows]
+    return data.reshape(-1, NUM_LANDMARKS, 4)
+
+
+def fake_result(landmarks):
+    """Objeto com a mesma forma do resultado de Pose.process (pose_landmarks.landmark)."""
+    points = [SimpleNamespace(x=float(x), y=float(y), z=float(z), visibility=float(v))
+              for x, y, z, v in landmarks]
+    return SimpleNamespace(pose_landmarks=SimpleNamespace(landmark=points))
+
+
+def git_commit():
+    try:
+        return subprocess.run(['git', 'rev-parse', '--short', 'HEAD'], cwd=BASE_DIR,
+                              capture_output=True, text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def bench_pose(stages, frames_rgb, n):
+    try:
+        import mediapipe as mp
+    except ImportError as e:
+        print(f"AVISO: MediaPipe indisponível: {e}")
+        return
+    for complexity in (0, 1, 2):
+        settings = dict(POSE_SETTINGS, model_complexity=complexity)
+        try:
+            with mp.solutions.pose.Pose(**settings) as pose:
+                stages[f'pose_process_complexidade_{complexity}'] = summarize(
+                    measure(pose.process, frames_rgb, n, warmup=10))
+        except Exception as e:
+            # A complexidade 2 baixa o modelo na primeira execução e pode falhar offline
+            print(f"AVISO: Pose com model_complexity={complexity} indisponível: {e}")
+
+
+def bench_models(stages, landmarks, n):
+    # Modelos treinados com DataFrame avisam sobre nomes de colunas a cada chamada
+    warnings.filterwarnings('ignore', category=UserWarning)
+    rows = [lm.reshape(1, -1) for lm in landmarks]
+    for model_path in sorted(glob.glob(os.path.join(BASE_DIR, 'modelos', '*.pkl'))):
+        name = os.path.splitext(os.path.basename(model_path))[0]
+        with open(model_path, 'rb') as f:
+            model = pickle.load(f)
+        stages[f'predict_proba_sklearn_{name}'] = summarize(measure(model.predict_proba, rows, n))
+        compiled = compile_classifier(model)
+        if compiled is not model:
+            out = np.empty(len(compiled.classes_))
+            stages[f'predict_proba_compilado_{name}'] = summarize(
+                measure(lambda lm: compiled.predict_proba_into(lm, out), list(landmarks), n))
+
+
+def bench_draw(stages, image_rgb, landmarks, n):
+    canvas = image_rgb.copy()
+
+    def draw(lm):
+        canvas[...] = image_rgb
+        draw_pose(canvas, lm)
+    stages['draw_pose'] = summarize(measure(draw, list(landmarks), n))
+
+    try:
+        import mediapipe as mp
+        from mediapipe.framework.formats import landmark_pb2
+    except ImportError as e:
+        print(f"AVISO: draw_landmarks indisponível: {e}")
+        return
+    protos = []
+    for lm in landmarks:
+        proto = landmark_pb2.NormalizedLandmarkList()
+        for x, y, z, v in lm:
+            proto.landmark.add(x=float(x), y=float(y), z=float(z), visibility=float(v))
+        protos.append(proto)
+
+    def draw_mp(proto):
+        canvas[...] = image_rgb
+        mp.solutions.drawing_utils.draw_landmarks(canvas, proto, mp.solutions.pose.POSE_CONNECTIONS)
+    stages['draw_landmarks_mediapipe'] = summarize(measure(draw_mp, protos, n))
+
+
+def bench_photoimage(stages, frames_rgb, n):
+    try:
+        import tkinter as tk
+        from PIL import ImageTk
+        root = tk.Tk()
+        root.withdraw()
+    except Exception as e:
+        print(f"AVISO: Tk indisponível ({e}); etapas da PhotoImage não medidas.")
+        return
+    photo = ImageTk.PhotoImage('RGB', FRAME_SIZE)
+    stages['photoimage_nova'] = summarize(
+        measure(lambda f: ImageTk.PhotoImage(image=Image.fromarray(f)), frames_rgb, n))
+    stages['photoimage_paste'] = summarize(
+        measure(lambda f: photo.paste(Image.fromarray(f)), frames_rgb, n))
+    root.destroy()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Tempo de cada etapa do caminho pose -> feedback")
+    parser.add_argument('--video', help="vídeo gravado (senão, frames sintéticos)")
+    parser.add_argument('--frames', type=int, default=200, help="medições por etapa")
+    parser.add_argument('--entrada', default='1280x720', help="resolução da câmera simulada (LxA)")
+    parser.add_argument('--sem-pose', action='store_true', help="pula as etapas do Pose.process (mais lentas)")
+    parser.add_argument('--saida', default='bench_etapas.json', help="arquivo JSON com os resultados")
+    args = parser.parse_args()
+
+    camera_size = tuple(int(v) for v in args.entrada.lower().split('x'))
+    camera_frames, synthetic = load_camera_frames(args.video, args.frames, camera_size)
+    w, h = FRAME_SIZE
+    resized = np.empty((h, w, 3), dtype=np.uint8)
+    rgb = np.empty((h, w, 3), dtype=np.uint8)
+    frames_rgb = [cv2.cvtColor(cv2.resize(f, FRAME_SIZE), cv2.COLOR_BGR2RGB) for f in camera_frames]
+    landmarks = load_recorded_landmarks(args.frames)
+    n = args.frames
+    stages = {}
+
+    stages['resize'] = summarize(measure(lambda f: cv2.resize(f, FRAME_SIZE, dst=resized), camera_frames, n))
+    stages['cvtcolor_bgr2rgb'] = summarize(
+        measure(lambda f: cv2.cvtColor(f, cv2.COLOR_BGR2RGB, dst=rgb), frames_rgb, n))
+    if not args.sem_pose:
+        bench_pose(stages, frames_rgb, n)
+    buffer = new_landmark_buffer()
+    results = [fake_result(lm) for lm in landmarks]
+    stages['landmarks_to_array'] = summarize(measure(lambda r: landmarks_to_array(r, buffer), results, n))
+    bench_models(stages, landmarks, n)
+    bench_draw(stages, frames_rgb[0], landmarks, n)
+    bench_photoimage(stages, frames_rgb, n)
+
+    report = {
+        'maquina': {'plataforma': platform.platform(), 'processador': platform.processor() or platform.machine(),
+                    'cpus': os.cpu_count(), 'python': platform.python_version(),
+                    'opencv': cv2.__version__, 'numpy': np.__version__},
+        'commit': git_commit(),
+        'data': time.strftime('%Y-%m-%dT%H:%M:%S'),
+        'entrada': {'camera': list(camera_size), 'quadro': list(FRAME_SIZE),
+                    'video': args.video, 'frames_sinteticos': synthetic},
+        'etapas': stages,
+    }
+    with open(args.saida, 'w', encoding='utf-8') as f:
+        json.dump(report, f, ensure_ascii=False, indent=2)
+
+    print(f"{'etapa':<44} {'p50 ms':>9} {'p95 ms':>9} {'p99 ms':>9}")
+    for name, s in stages.items():
+        print(f"{name:<44} {s['p50_ms']:9.3f} {s['p95_ms']:9.3f} {s['p99_ms']:9.3f}")
+    print(f"\nResultados salvos em {args.saida}")
+
+
+if __name__ == "__main__":
+    main()
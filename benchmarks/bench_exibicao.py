@@ -0,0 +1,102 @@
+# arquivo: bench_exibicao.py
+# Compara o custo por frame do caminho de exibição antigo da MissionFrame
+# (3 conversões de cor + PhotoImage nova a cada frame) com o caminho atual
+# (1 conversão para buffer pré-alocado + paste() na mesma PhotoImage).
+#
+# Uso: python benchmarks/bench_exibicao.py [--frames 300] [--entrada 1280x720]
+
+import argparse
+import os
+import sys
+import time
+
+import cv2
+import numpy as np
+from PIL import Image, ImageTk
+
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+from utils.inferencia import draw_pose
+
+FRAME_SIZE = (640, 480)
+
+
+def fake_landmarks():
+    """Pose sintética fixa, só para o desenho ter o custo realista."""
+    rng = np.random.default_rng(0)
+    landmarks = rng.uniform(0.2, 0.8, size=(33, 4)).astype(np.float32)
+    landmarks[:, 3] = 1.0
+    return landmarks
+
+
+def caminho_antigo(frame, landmarks, use_tk):
+    frame = cv2.resize(frame, FRAME_SIZE)
+    image_rgb = cv2.cvtColor(frame, cv2.COLOR_BGR2RGB)
+    # (aqui rodava o pose_processor.process)
+    image_bgr = cv2.cvtColor(image_rgb, cv2.COLOR_RGB2BGR)
+    draw_pose(image_bgr, landmarks, point_color=(0, 0, 255))
+    image = Image.fromarray(cv2.cvtColor(image_bgr, cv2.COLOR_BGR2RGB))
+    if use_tk:
+        return ImageTk.PhotoImage(image=image)
+    return image
+
+
+def criar_caminho_novo(use_tk):
+    w, h = FRAME_SIZE
+    resized = np.empty((h, w, 3), dtype=np.uint8)
+    image_rgb = np.empty((h, w, 3), dtype=np.uint8)
+    photo = ImageTk.PhotoImage('RGB', FRAME_SIZE) if use_tk else None
+
+    def caminho_novo(frame, landmarks, _use_tk):
+        cv2.resize(frame, FRAME_SIZE, dst=resized)
+        cv2.cvtColor(resized, cv2.COLOR_BGR2RGB, dst=image_rgb)
+        # (aqui roda o pose_processor.process, direto no buffer RGB)
+        draw_pose(image_rgb, landmarks)
+        image = Image.fromarray(image_rgb)
+        if photo is not None:
+            photo.paste(image)
+        return image
+
+    return caminho_novo
+
+
+def medir(fn, frame, landmarks, use_tk, n):
+    for _ in range(10):
+        fn(frame, landmarks, use_tk)
+    tempos = np.empty(n)
+    for i in range(n):
+        t0 = time.perf_counter()
+        fn(frame, landmarks, use_tk)
+        tempos[i] = time.perf_counter() - t0
+    return tempos * 1000
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Tempo por frame do caminho de exibição: antes x depois")
+    parser.add_argument('--frames', type=int, default=300)
+    parser.add_argument('--entrada', default='1280x720', help="resolução do frame da câmera simulada (LxA)")
+    args = parser.parse_args()
+
+    w, h = (int(v) for v in args.entrada.lower().split('x'))
+    frame = np.random.default_rng(1).integers(0, 255, size=(h, w, 3), dtype=np.uint8)
+    landmarks = fake_landmarks()
+
+    use_tk = True
+    try:
+        import tkinter as tk
+        root = tk.Tk()
+        root.withdraw()
+    except Exception as e:
+        print(f"AVISO: Tk indisponível ({e}); medindo sem a etapa da PhotoImage.")
+        use_tk = False
+
+    antes = medir(caminho_antigo, frame, landmarks, use_tk, args.frames)
+    depois = medir(criar_caminho_novo(use_tk), frame, landmarks, use_tk, args.frames)
+
+    print(f"Entrada {w}x{h} -> {FRAME_SIZE[0]}x{FRAME_SIZE[1]}, {args.frames} frames")
+    for nome, tempos in (("antes", antes), ("depois", depois)):
+        print(f"  {nome:>6}: média {tempos.mean():.2f} ms | p50 {np.percentile(tempos, 50):.2f} ms | p95 {np.percentile(tempos, 95):.2f} ms")
+    print(f"  ganho: {(1 - depois.mean() / antes.mean()) * 100:.1f}% por frame")
+
+
+if __name__ == "__main__":
+    main()
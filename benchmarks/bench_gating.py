@@ -0,0 +1,103 @@
+# arquivo: bench_gating.py
+# Reproduz um vídeo gravado de uma sessão duas vezes: com inferência em todo
+# frame e com o GatedBackend (--gating), e compara tempo de CPU e as classes
+# vistas pela lógica de repetições.
+#
+# Uso: python benchmarks/bench_gating.py videos/asas_de_super_heroi.mp4 --exercicio asas
+
+import argparse
+import os
+import pickle
+import sys
+import time
+
+import cv2
+import numpy as np
+
+BASE_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..')
+sys.path.append(BASE_DIR)
+import mediapipe as mp
+from utils.exercicios import EXERCISES, POSE_SETTINGS
+from utils.inferencia import LocalPoseBackend
+from utils.gate_movimento import GatedBackend
+
+mp_pose = mp.solutions.pose
+
+FRAME_SIZE = (640, 480)
+
+
+def load_frames(video_path, max_frames):
+    """Decodifica o vídeo uma vez (fora da medição), já em RGB 640x480."""
+    cap = cv2.VideoCapture(video_path)
+    frames = []
+    while len(frames) < max_frames:
+        ret, frame = cap.read()
+        if not ret:
+            break
+        frames.append(cv2.cvtColor(cv2.resize(frame, FRAME_SIZE), cv2.COLOR_BGR2RGB))
+    cap.release()
+    return frames
+
+
+def transitions(classes):
+    """Sequência de classes com repetições consecutivas colapsadas."""
+    seq = []
+    for c in classes:
+        if c is not None and (not seq or seq[-1] != c):
+            seq.append(c)
+    return seq
+
+
+def replay(backend, frames):
+    classes = []
+    cpu0, wall0 = time.process_time(), time.perf_counter()
+    for frame in frames:
+        output = backend.infer(frame)
+        if output.probabilities is None:
+            classes.append(None)
+        else:
+            classes.append(backend.classes_[int(np.argmax(output.probabilities))])
+    return classes, time.process_time() - cpu0, time.perf_counter() - wall0
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Economia de CPU da inferência espaçada em sessões gravadas")
+    parser.add_argument('videos', nargs='+', help="vídeos gravados das sessões")
+    parser.add_argument('--exercicio', choices=sorted(EXERCISES), required=True)
+    parser.add_argument('--max-frames', type=int, default=3000)
+    args = parser.parse_args()
+
+    exercise = EXERCISES[args.exercicio]
+    with open(os.path.join(BASE_DIR, exercise['model_path']), 'rb') as f:
+        model = pickle.load(f)
+    gating = exercise.get('gating', {})
+
+    for video_path in args.videos:
+        frames = load_frames(video_path, args.max_frames)
+        if not frames:
+            print(f"ERRO: nenhum frame lido de {video_path}")
+            continue
+
+        # Um Pose novo por modo, para o rastreamento começar do zero nos dois
+        with mp_pose.Pose(**POSE_SETTINGS) as pose:
+            full = LocalPoseBackend(pose)
+            full.set_model(model)
+            classes_full, cpu_full, wall_full = replay(full, frames)
+        with mp_pose.Pose(**POSE_SETTINGS) as pose:
+            gated = GatedBackend(LocalPoseBackend(pose), **gating)
+            gated.set_model(model)
+            classes_gated, cpu_gated, wall_gated = replay(gated, frames)
+
+        agree = np.mean([a == b for a, b in zip(classes_full, classes_gated)])
+        seq_full, seq_gated = transitions(classes_full), transitions(classes_gated)
+        print(f"\n{os.path.basename(video_path)} ({len(frames)} frames, gating={gating})")
+        print(f"  todo frame : CPU {cpu_full:.2f} s | parede {wall_full:.2f} s")
+        print(f"  com gating : CPU {cpu_gated:.2f} s | parede {wall_gated:.2f} s | {gated}")
+        print(f"  economia de CPU: {(1 - cpu_gated / cpu_full) * 100:.1f}%")
+        print(f"  classes iguais em {agree * 100:.1f}% dos frames")
+        print(f"  transições: {len(seq_full)} (todo frame) x {len(seq_gated)} (gating)"
+              f"{' - mesma sequência' if seq_full == seq_gated else ' - SEQUÊNCIAS DIFERENTES'}")
+
+
+if __name__ == "__main__":
+    main()
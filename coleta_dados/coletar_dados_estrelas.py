@@ -1,10 +1,12 @@
 # arquivo: coletar_dados.py
 
 import cv2
-import mediapipe as mp
-import numpy as np
-import csv
 import os
+import sys
+
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+from utils.coleta import CollectionSession
+from utils.inferencia import draw_pose
 
 # --- CONFIGURAÇÕES ---
 # AVISO: Para cada vídeo de treino que você processar, você deve:
@@ -12,45 +14,22 @@ import os
 # 2. Assegurar que o OUTPUT_CSV_PATH seja o MESMO para acumular os dados.
 VIDEO_PATH = 'videos/alcancar_as_estrelas.mp4'  # <<< COLOQUE O CAMINHO DO SEU VÍDEO AQUI
 OUTPUT_CSV_PATH = 'coord_videos/alcancar_as_estrelas.csv' # Caminho para o arquivo de dados acumulados
+# Conjunto de dados em dados/ (utils/base_dados.py); o CSV acima só é importado na primeira vez
+OUTPUT_DATASET = 'alcancar_as_estrelas'
 # ---------------------
 
-mp_drawing = mp.solutions.drawing_utils
-mp_pose = mp.solutions.pose
-
-def setup_csv():
-    num_coords = 33
-    landmarks_header = ['class']
-    for val in range(1, num_coords + 1):
-        landmarks_header += [f'x{val}', f'y{val}', f'z{val}', f'v{val}']
-    
-    if not os.path.exists(OUTPUT_CSV_PATH):
-        with open(OUTPUT_CSV_PATH, mode='w', newline='') as f:
-            csv_writer = csv.writer(f, delimiter=',', quotechar='"', quoting=csv.QUOTE_MINIMAL)
-            csv_writer.writerow(landmarks_header)
-
-def save_frame_data(pose_class, results):
-    try:
-        landmarks = results.pose_landmarks.landmark
-        
-        row = list(np.array([[lm.x, lm.y, lm.z, lm.visibility] for lm in landmarks]).flatten())
-        row.insert(0, pose_class)
-        
-        with open(OUTPUT_CSV_PATH, mode='a', newline='') as f:
-            csv_writer = csv.writer(f, delimiter=',', quotechar='"', quoting=csv.QUOTE_MINIMAL)
-            csv_writer.writerow(row)
-        print(f"Frame salvo para a classe: '{pose_class}'")
-            
-    except Exception as e:
-        print(f"Nenhuma pose detectada para salvar. Erro: {e}")
-
-setup_csv()
-cap = cv2.VideoCapture(VIDEO_PATH)
+# Fonte opcional na linha de comando: outro vídeo, uma pasta de imagens ou a webcam (ex.: 0)
+source = sys.argv[1] if len(sys.argv) > 1 else VIDEO_PATH
+# Conjunto de dados, cache de landmarks e faixas rotuladas do vídeo (utils/coleta.py)
+SESSION = CollectionSession(source, OUTPUT_DATASET, OUTPUT_CSV_PATH)
+cap = SESSION.cap
 
 if not cap.isOpened():
-    print(f"Erro ao abrir o vídeo: {VIDEO_PATH}")
+    print(f"Erro ao abrir o vídeo: {source}")
     exit()
 
 ret, frame = cap.read()
+frame_index = 0
 if not ret:
     print("Não foi possível ler o primeiro frame. Verifique o arquivo de vídeo.")
     exit()
@@ -58,30 +37,36 @@ if not ret:
 paused = True
 current_class = 'down'
 
-with mp_pose.Pose(min_detection_confidence=0.5, min_tracking_confidence=0.5) as pose:
+with SESSION.pose() as pose:
     while cap.isOpened():
         if not paused:
             ret, frame = cap.read()
             if not ret:
                 print("Fim do vídeo. Pausando.")
+                SESSION.video_finished = True
                 break
+            frame_index += 1
 
         image = cv2.cvtColor(frame, cv2.COLOR_BGR2RGB)
-        results = pose.process(image)
+        landmarks = SESSION.landmarks(pose, image, frame_index)
+        if landmarks is not None:
+            draw_pose(image, landmarks)
         
         image_bgr = cv2.cvtColor(image, cv2.COLOR_RGB2BGR)
-        mp_drawing.draw_landmarks(image_bgr, results.pose_landmarks, mp_pose.POSE_CONNECTIONS)
         
         status_text = "PAUSADO" if paused else "RODANDO"
         cv2.putText(image_bgr, f"Status: {status_text}", (15, 30), cv2.FONT_HERSHEY_SIMPLEX, 1, (0, 128, 255), 2)
         cv2.putText(image_bgr, f"CLASSE ATUAL: {current_class.upper()}", (15, 70), cv2.FONT_HERSHEY_SIMPLEX, 1, (0, 0, 255), 2)
         cv2.putText(image_bgr, "SALVAR (s) | UP (u) | DOWN (d) | PLAY/PAUSE (espaco)", (15, image_bgr.shape[0] - 20), cv2.FONT_HERSHEY_SIMPLEX, 0.7, (255, 255, 255), 2)
 
+        SESSION.draw_ranges(image_bgr)
+
         cv2.imshow('Coleta de Dados', image_bgr)
         
         key = cv2.waitKey(30) & 0xFF
         if key == ord('q'):
             break
+        SESSION.edit_range(key, frame_index, current_class)
         if key == 32:
             paused = not paused
         if paused:
@@ -90,7 +75,7 @@ with mp_pose.Pose(min_detection_confidence=0.5, min_tracking_confidence=0.5) as
             if key == ord('u'):
                 current_class = 'up'
             if key == ord('s'):
-                save_frame_data(current_class, results)
+                SESSION.save_frame(current_class, landmarks, frame_index)
 
-cap.release()
+SESSION.close()
 cv2.destroyAllWindows()
\ No newline at end of file
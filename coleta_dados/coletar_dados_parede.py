@@ -1,60 +1,35 @@
 # arquivo: coletar_dados_parede.py (Ajustado para o novo vídeo)
 
 import cv2
-import mediapipe as mp
-import numpy as np
-import csv
 import os
+import sys
+
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+from utils.coleta import CollectionSession
+from utils.inferencia import draw_pose
 
 # --- CONFIGURAÇÕES ---
 # (# <<< MUDANÇA 1: ATUALIZA OS NOMES DOS ARQUIVOS >>>)
 VIDEO_PATH = '../videos/empurrar_parede_invisivel.mp4'
 OUTPUT_CSV_PATH = '../coord_videos/empurrar_parede.csv'
+# Conjunto de dados em dados/ (utils/base_dados.py); o CSV acima só é importado na primeira vez
+OUTPUT_DATASET = 'empurrar_parede'
 # ---------------------
 
-mp_drawing = mp.solutions.drawing_utils
-mp_pose = mp.solutions.pose
-
-def setup_csv():
-    """Prepara o arquivo CSV com o cabeçalho correto, se ele não existir."""
-    output_dir = os.path.dirname(OUTPUT_CSV_PATH)
-    os.makedirs(output_dir, exist_ok=True)
-    
-    num_coords = 33
-    landmarks_header = ['class']
-    for val in range(1, num_coords + 1):
-        landmarks_header += [f'x{val}', f'y{val}', f'z{val}', f'v{val}']
-    
-    if not os.path.exists(OUTPUT_CSV_PATH):
-        with open(OUTPUT_CSV_PATH, mode='w', newline='') as f:
-            csv_writer = csv.writer(f, delimiter=',', quotechar='"', quoting=csv.QUOTE_MINIMAL)
-            csv_writer.writerow(landmarks_header)
-
-def save_frame_data(pose_class, results):
-    """Salva os landmarks do frame atual no arquivo CSV com a classe fornecida."""
-    try:
-        landmarks = results.pose_landmarks.landmark
-        
-        row = list(np.array([[lm.x, lm.y, lm.z, lm.visibility] for lm in landmarks]).flatten())
-        row.insert(0, pose_class)
-        
-        with open(OUTPUT_CSV_PATH, mode='a', newline='') as f:
-            csv_writer = csv.writer(f, delimiter=',', quotechar='"', quoting=csv.QUOTE_MINIMAL)
-            csv_writer.writerow(row)
-        print(f"Frame salvo para a classe: '{pose_class}'")
-            
-    except Exception as e:
-        print(f"Nenhuma pose detectada para salvar.")
-
 # --- INÍCIO DA LÓGICA PRINCIPAL ---
-setup_csv()
 
-cap = cv2.VideoCapture(VIDEO_PATH)
+# Fonte opcional na linha de comando: outro vídeo, uma pasta de imagens ou a webcam (ex.: 0)
+source = sys.argv[1] if len(sys.argv) > 1 else VIDEO_PATH
+# Conjunto de dados, cache de landmarks e faixas rotuladas do vídeo (utils/coleta.py)
+SESSION = CollectionSession(source, OUTPUT_DATASET, OUTPUT_CSV_PATH)
+cap = SESSION.cap
+
 if not cap.isOpened():
-    print(f"Erro ao abrir o vídeo: {VIDEO_PATH}")
+    print(f"Erro ao abrir o vídeo: {source}")
     exit()
 
 ret, frame = cap.read()
+frame_index = 0
 if not ret:
     print("Não foi possível ler o primeiro frame.")
     exit()
@@ -64,19 +39,22 @@ paused = True
 # As classes agora são 'down' (braços abaixados) e 'push' (braços estendidos)
 current_class = 'down'
 
-with mp_pose.Pose(min_detection_confidence=0.5, min_tracking_confidence=0.5) as pose:
+with SESSION.pose() as pose:
     while cap.isOpened():
         if not paused:
             ret, frame = cap.read()
             if not ret:
                 print("Fim do vídeo. Pausando.")
+                SESSION.video_finished = True
                 break
+            frame_index += 1
 
         image = cv2.cvtColor(frame, cv2.COLOR_BGR2RGB)
-        results = pose.process(image)
+        landmarks = SESSION.landmarks(pose, image, frame_index)
+        if landmarks is not None:
+            draw_pose(image, landmarks)
         
         image_bgr = cv2.cvtColor(image, cv2.COLOR_RGB2BGR)
-        mp_drawing.draw_landmarks(image_bgr, results.pose_landmarks, mp_pose.POSE_CONNECTIONS)
         
         status_text = "PAUSADO" if paused else "RODANDO"
         cv2.putText(image_bgr, f"Status: {status_text}", (15, 30), cv2.FONT_HERSHEY_SIMPLEX, 1, (0, 128, 255), 2)
@@ -86,11 +64,14 @@ with mp_pose.Pose(min_detection_confidence=0.5, min_tracking_confidence=0.5) as
         help_text = "SALVAR (s) | PUSH (p) | DOWN (d) | PLAY/PAUSE (espaco)"
         cv2.putText(image_bgr, help_text, (15, image_bgr.shape[0] - 20), cv2.FONT_HERSHEY_SIMPLEX, 0.7, (255, 255, 255), 2)
 
+        SESSION.draw_ranges(image_bgr)
+
         cv2.imshow('Coleta de Dados Interativa', image_bgr)
         
         key = cv2.waitKey(30) & 0xFF
         if key == ord('q'):
             break
+        SESSION.edit_range(key, frame_index, current_class)
         if key == 32: # Tecla de espaço
             paused = not paused
         
@@ -103,7 +84,7 @@ with mp_pose.Pose(min_detection_confidence=0.5, min_tracking_confidence=0.5) as
                 current_class = 'push'
                 print("Classe alterada para 'push'")
             if key == ord('s'):
-                save_frame_data(current_class, results)
+                SESSION.save_frame(current_class, landmarks, frame_index)
 
-cap.release()
+SESSION.close()
 cv2.destroyAllWindows()
\ No newline at end of file
@@ -0,0 +1,54 @@
+# arquivo: extrair_landmarks.py
+# Extrai os landmarks de TODOS os frames de vídeos inteiros (ou de pastas de
+# vídeos) usando todos os núcleos: cada vídeo é dividido em segmentos que rodam
+# num pool de processos, cada um com o seu próprio mp_pose.Pose (ver
+# utils/extracao.py). Para cada vídeo sai uma pasta em extracoes/ com o índice
+# do frame, o timestamp e os landmarks (NaN = sem pose), que abre com
+# utils.gravacao.load_recording e pode ir direto para o replay_missao.py.
+# Vídeos já extraídos com as mesmas configurações vêm do cache em
+# .cache_extracao/ (utils/cache_extracao.py), que a coleta também usa.
+#
+# Uso:
+#   python extrair_landmarks.py videos/
+#   python extrair_landmarks.py videos/asas_de_super_heroi.mp4 --workers 4 --segmento 600
+#   python extrair_landmarks.py videos/ --sem-cache
+
+import argparse
+import json
+import os
+
+from utils.cache_extracao import MAX_BYTES, ExtractionCache
+from utils.extracao import EXTRACTION_DIR, POSE_KWARGS, SEGMENT_FRAMES, extract_videos, find_videos
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Extrai os landmarks de vídeos inteiros em paralelo")
+    parser.add_argument('caminhos', nargs='*', default=['videos'], help="vídeos ou pastas de vídeos (padrão: videos/)")
+    parser.add_argument('--saida', default=EXTRACTION_DIR, help="pasta das extrações")
+    parser.add_argument('--workers', type=int, default=os.cpu_count(), help="processos (padrão: todos os núcleos)")
+    parser.add_argument('--segmento', type=int, default=SEGMENT_FRAMES, metavar='FRAMES',
+                        help="frames por segmento (a unidade de trabalho do pool)")
+    parser.add_argument('--complexidade', type=int, choices=(0, 1, 2), default=POSE_KWARGS['model_complexity'],
+                        help="model_complexity do MediaPipe Pose")
+    parser.add_argument('--sem-cache', action='store_true', help="sempre roda o MediaPipe e não guarda no cache")
+    parser.add_argument('--cache-max', type=float, default=MAX_BYTES / 1e6, metavar='MB',
+                        help="tamanho máximo do cache de extrações")
+    parser.add_argument('--json', metavar='ARQUIVO', help="salva o resumo em JSON")
+    args = parser.parse_args()
+
+    videos = find_videos(args.caminhos)
+    if not videos:
+        parser.error("nenhum vídeo encontrado")
+    print(f"{len(videos)} vídeo(s), {args.workers} processo(s), segmentos de {args.segmento} frames")
+    cache = None if args.sem_cache else ExtractionCache(max_bytes=int(args.cache_max * 1e6))
+    summaries = extract_videos(videos, args.saida, args.workers, args.segmento,
+                               dict(POSE_KWARGS, model_complexity=args.complexidade), cache=cache)
+    total = sum(s['frames'] for s in summaries.values())
+    print(f"\n{len(summaries)} de {len(videos)} vídeo(s) extraídos, {total} frames")
+    if args.json:
+        with open(args.json, 'w', encoding='utf-8') as f:
+            json.dump(summaries, f, ensure_ascii=False, indent=2)
+
+
+if __name__ == "__main__":
+    main()
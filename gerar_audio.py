@@ -1,5 +1,13 @@
+import argparse
+import hashlib
+import io
+import json
+import math
 import os
-from gtts import gTTS
+import struct
+import tempfile
+import wave
+from concurrent.futures import ProcessPoolExecutor, as_completed
 
 # 1. Defina o texto e o nome do arquivo para cada som
 AUDIO_TEXTS = {
@@ -12,29 +20,238 @@ AUDIO_TEXTS = {
 
 # 2. Configure o diretório de saída
 OUTPUT_DIR = "assets/audio"
+# Pasta lida pelo jogo (testar_modelo.sound_path), seja qual for o diretório atual
+GAME_AUDIO_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'assets', 'audio')
+# Os bipes do backend 'tom' ficam fora dela, para não substituírem as vozes do jogo
+TONE_OUTPUT_DIR = os.path.join(tempfile.gettempdir(), 'projeto_ia2_audio_tom')
+LANGUAGE = 'pt'
+# Hash de conteúdo de cada áudio já gerado: só o que mudou é refeito
+MANIFEST_NAME = 'manifesto_audio.json'
 
-# Crie o diretório de saída se ele não existir
-if not os.path.exists(OUTPUT_DIR):
-    os.makedirs(OUTPUT_DIR)
-    print(f"Diretório criado: {OUTPUT_DIR}")
+# Formato do WAV pré-decodificado: o mesmo do mixer do jogo (pygame.mixer.init padrão),
+# para o pygame só copiar as amostras na abertura
+SAMPLE_RATE = 44100
+CHANNELS = 2
+SAMPLE_WIDTH = 2  # bytes (16 bits)
 
-# 3. Itere e gere os arquivos MP3
-print("\nIniciando geração de áudios...")
 
-for filename, text in AUDIO_TEXTS.items():
-    # Nome do arquivo de saída
-    output_path = os.path.join(OUTPUT_DIR, f"{filename}.mp3")
-    
+# --- Backends de síntese -----------------------------------------------------
+# Cada backend tem `name`, `voice`, `output_dir` (pasta padrão), `game_audio`
+# (se pode gravar na pasta do jogo) e `synthesize(texto, caminho_sem_extensão)`,
+# que grava o áudio e devolve a lista de arquivos criados.
+
+class GTTSBackend:
+    """Google Text-to-Speech (precisa de internet); grava MP3 e o WAV decodificado."""
+
+    name = 'gtts'
+    output_dir = OUTPUT_DIR
+    game_audio = True
+
+    def __init__(self, lang=LANGUAGE, tld='com'):
+        self.lang = lang
+        self.voice = tld
+
+    def synthesize(self, text, base_path):
+        from gtts import gTTS
+        mp3_path = base_path + '.mp3'
+        tts = gTTS(text=text, lang=self.lang, tld=self.voice, slow=False)
+        _atomic_write(mp3_path, lambda f: tts.write_to_fp(f))
+        wav_path = base_path + '.wav'
+        decode_to_wav(mp3_path, wav_path)
+        return [mp3_path, wav_path]
+
+
+class ToneBackend:
+    """Backend local e offline: uma melodia curta e determinística derivada do texto.
+
+    Não fala, mas gera um WAV válido no formato do jogo sem rede nem
+    dependências; serve para testes e máquinas sem internet. Por isso grava
+    em TONE_OUTPUT_DIR e nunca em assets/audio, onde o WAV mais novo
+    passaria na frente do MP3 com a voz.
+    """
+
+    name = 'tom'
+    output_dir = TONE_OUTPUT_DIR
+    game_audio = False
+
+    def __init__(self, lang=LANGUAGE, voice='seno'):
+        self.lang = lang
+        self.voice = voice
+
+    def synthesize(self, text, base_path):
+        digest = hashlib.sha256(text.encode('utf-8')).digest()
+        # Uma nota por palavra (até 6), com altura vinda do hash do texto
+        notes = [261.63 * 2 ** ((digest[i] % 12) / 12) for i in range(min(len(text.split()), 6) or 1)]
+        note_frames = int(0.12 * SAMPLE_RATE)
+        samples = bytearray()
+        for freq in notes:
+            for n in range(note_frames):
+                envelope = min(1.0, n / 400, (note_frames - n) / 400)
+                value = int(12000 * envelope * math.sin(2 * math.pi * freq * n / SAMPLE_RATE))
+                samples += struct.pack('<h', value) * CHANNELS
+        wav_path = base_path + '.wav'
+        _write_wav(wav_path, bytes(samples))
+        return [wav_path]
+
+
+BACKENDS = {backend.name: backend for backend in (GTTSBackend, ToneBackend)}
+
+
+def register_backend(backend_class):
+    """Adiciona um backend novo (ex.: um TTS local) às opções de --backend."""
+    BACKENDS[backend_class.name] = backend_class
+    return backend_class
+
+
+# --- Arquivos ----------------------------------------------------------------
+
+def _atomic_write(path, write):
+    tmp = f"{path}.{os.getpid()}.tmp"
+    with open(tmp, 'wb') as f:
+        write(f)
+    os.replace(tmp, path)
+
+
+def _write_wav(path, frames, rate=SAMPLE_RATE, channels=CHANNELS, width=SAMPLE_WIDTH):
+    buffer = io.BytesIO()
+    with wave.open(buffer, 'wb') as w:
+        w.setnchannels(channels)
+        w.setsampwidth(width)
+        w.setframerate(rate)
+        w.writeframes(frames)
+    _atomic_write(path, lambda f: f.write(buffer.getvalue()))
+
+
+def decode_to_wav(mp3_path, wav_path):
+    """Decodifica o MP3 uma vez (pygame, sem placa de som) e grava o PCM em WAV."""
+    os.environ.setdefault('SDL_AUDIODRIVER', 'dummy')
+    import pygame
+    if not pygame.mixer.get_init():
+        pygame.mixer.init(frequency=SAMPLE_RATE, size=-8 * SAMPLE_WIDTH, channels=CHANNELS)
+    rate, size, channels = pygame.mixer.get_init()
+    raw = pygame.mixer.Sound(mp3_path).get_raw()
+    _write_wav(wav_path, raw, rate, channels, abs(size) // 8)
+
+
+def content_hash(text, backend):
+    """Hash de tudo que muda o áudio gerado: texto, idioma, voz e backend."""
+    key = json.dumps({'text': text, 'lang': backend.lang, 'voice': backend.voice,
+                      'backend': backend.name, 'wav': [SAMPLE_RATE, CHANNELS, SAMPLE_WIDTH]},
+                     sort_keys=True, ensure_ascii=False)
+    return hashlib.sha256(key.encode('utf-8')).hexdigest()
+
+
+def load_manifest(output_dir):
     try:
-        # Crie o objeto gTTS
-        tts = gTTS(text=text, lang='pt', tld='com', slow=False)
-        
-        # Salve o arquivo MP3
-        tts.save(output_path)
-        print(f"Arquivo gerado: {output_path}")
-        
-    except Exception as e:
-        print(f"ERRO ao gerar o áudio {filename}: {e}")
-        print("Verifique sua conexão com a internet, pois gTTS precisa dela.")
-
-print("\nGeração de áudios concluída.")
\ No newline at end of file
+        with open(os.path.join(output_dir, MANIFEST_NAME), encoding='utf-8') as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {}
+
+
+def save_manifest(output_dir, manifest):
+    path = os.path.join(output_dir, MANIFEST_NAME)
+    data = json.dumps(manifest, ensure_ascii=False, indent=2, sort_keys=True).encode('utf-8')
+    _atomic_write(path, lambda f: f.write(data))
+
+
+def is_up_to_date(entry, digest, output_dir):
+    return (entry is not None and entry.get('hash') == digest
+            and all(os.path.exists(os.path.join(output_dir, name)) for name in entry.get('files', [])))
+
+
+def build_clip(backend, name, text, output_dir):
+    """Roda em um processo do pool: gera um áudio e devolve a sua entrada do manifesto."""
+    files = backend.synthesize(text, os.path.join(output_dir, name))
+    return {'hash': content_hash(text, backend), 'text': text, 'lang': backend.lang,
+            'voice': backend.voice, 'backend': backend.name,
+            'files': [os.path.basename(path) for path in files]}
+
+
+def is_game_audio_dir(path):
+    return os.path.realpath(path) == os.path.realpath(GAME_AUDIO_DIR)
+
+
+def build(output_dir=None, backend=None, texts=AUDIO_TEXTS, workers=4, force=False):
+    """Gera só os áudios novos ou alterados; devolve (gerados, em dia, com erro).
+
+    Sem `output_dir`, usa a pasta padrão do backend. ValueError se um backend
+    de teste (`game_audio = False`) for apontado para a pasta do jogo.
+    """
+    backend = backend or GTTSBackend()
+    output_dir = output_dir or backend.output_dir
+    if not getattr(backend, 'game_audio', True) and is_game_audio_dir(output_dir):
+        raise ValueError(f"o backend '{backend.name}' não grava em '{output_dir}' "
+                         f"(os bipes substituiriam as vozes do jogo)")
+    os.makedirs(output_dir, exist_ok=True)
+    manifest = load_manifest(output_dir)
+
+    pending = {name: text for name, text in texts.items()
+               if force or not is_up_to_date(manifest.get(name), content_hash(text, backend), output_dir)}
+    for name in texts.keys() - pending.keys():
+        print(f"Em dia: {name}")
+
+    built, failed = [], []
+    if pending:
+        with ProcessPoolExecutor(max_workers=max(1, min(workers, len(pending)))) as pool:
+            futures = {pool.submit(build_clip, backend, name, text, output_dir): name
+                       for name, text in pending.items()}
+            for future in as_completed(futures):
+                name = futures[future]
+                try:
+                    manifest[name] = future.result()
+                    built.append(name)
+                    print(f"Arquivo gerado: {', '.join(manifest[name]['files'])}")
+                except Exception as e:
+                    failed.append(name)
+                    print(f"ERRO ao gerar o áudio {name}: {e}")
+                    if backend.name == 'gtts':
+                        print("Verifique sua conexão com a internet, pois gTTS precisa dela.")
+        save_manifest(output_dir, manifest)
+    return built, len(texts) - len(pending), failed
+
+
+def decode_existing(output_dir=OUTPUT_DIR, names=AUDIO_TEXTS):
+    """Só gera os WAVs dos MP3s já existentes que ainda não têm um WAV em dia (sem sintetizar)."""
+    decoded = []
+    for name in names:
+        mp3_path = os.path.join(output_dir, f"{name}.mp3")
+        wav_path = os.path.join(output_dir, f"{name}.wav")
+        if not os.path.exists(mp3_path):
+            continue
+        if os.path.exists(wav_path) and os.path.getmtime(wav_path) >= os.path.getmtime(mp3_path):
+            continue
+        decode_to_wav(mp3_path, wav_path)
+        decoded.append(name)
+        print(f"Arquivo gerado: {wav_path}")
+    return decoded
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Gera (só o que mudou) os áudios do jogo")
+    parser.add_argument('--backend', choices=sorted(BACKENDS), default='gtts',
+                        help="gtts (voz, precisa de internet) ou tom (offline, para testes)")
+    parser.add_argument('--saida', help=f"diretório dos áudios (padrão: {OUTPUT_DIR}; "
+                                         f"com --backend tom, {TONE_OUTPUT_DIR})")
+    parser.add_argument('--workers', type=int, default=4, help="processos em paralelo")
+    parser.add_argument('--forcar', action='store_true', help="refaz todos os áudios")
+    parser.add_argument('--decodificar', action='store_true',
+                        help="só gera os WAVs dos MP3s existentes (offline, sem sintetizar)")
+    args = parser.parse_args()
+
+    if args.decodificar:
+        decoded = decode_existing(args.saida or OUTPUT_DIR)
+        print(f"\n{len(decoded)} WAVs gerados.")
+        return
+
+    backend = BACKENDS[args.backend]()
+    print(f"\nIniciando geração de áudios em {args.saida or backend.output_dir}...")
+    try:
+        built, current, failed = build(args.saida, backend, workers=args.workers, force=args.forcar)
+    except ValueError as e:
+        parser.error(str(e))
+    print(f"\nGeração de áudios concluída: {len(built)} gerados, {current} já em dia, {len(failed)} com erro.")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,192 @@
+# arquivo: replay_missao.py
+# Reproduz missões sem interface: vídeos gravados ou sequências de landmarks já
+# extraídas passam pelo mesmo caminho do jogo (pose -> classificador ->
+# MissionEngine) o mais rápido possível, e o script imprime as transições, as
+# repetições contadas e os frames/s de cada arquivo. Serve para testes de
+# regressão em lote da lógica de contagem e dos modelos.
+#
+# Entradas aceitas:
+#   - vídeos (.mp4, .avi, ...): rodam o MediaPipe Pose, como na webcam;
+#   - .npy com forma (N, 33, 4) ou (N, 132): landmarks [x, y, z, visibilidade]
+#     por frame (linhas com NaN = nenhuma pose);
+#   - .csv com as colunas x1, y1, z1, v1 ... v33 (ex.: coord_videos/*.csv);
+#   - pastas gravadas pelo jogo com --gravar (gravacoes/missao_*).
+#
+# Uso:
+#   python replay_missao.py videos/asas_de_super_heroi.mp4 --exercicio asas
+#   python replay_missao.py coord_videos/*.csv --exercicio auto --quiet --json resultado.json
+
+import argparse
+import json
+import os
+import time
+
+import numpy as np
+
+from utils.exercicios import EXERCISES, POSE_SETTINGS
+from utils.contador import MissionEngine, TRANSITION, REP, DETECTED
+from utils.detector_exercicio import ExerciseDetector
+from utils.classificador_rapido import n_classes
+from utils.inferencia import LocalPoseBackend, ProbabilityBuffers, classify_landmarks, smoothing_engine
+from utils.gravacao import is_recording, load_recording
+from utils.landmarks import NUM_LANDMARKS
+from utils.registro_modelos import ModelRegistry
+
+FRAME_SIZE = (640, 480)
+VIDEO_EXTENSIONS = ('.mp4', '.avi', '.mov', '.mkv', '.webm')
+AUTO = 'auto'
+
+
+def load_model(exercise_key):
+    """Modelo compilado do exercício, ou todos empilhados no modo automático."""
+    registry = ModelRegistry(EXERCISES)
+    if exercise_key == AUTO:
+        model = registry.multi()
+        if model is None:
+            raise ValueError("os modelos não puderam ser empilhados")
+        return model
+    return registry.compiled(exercise_key)
+
+
+def new_engine(model, exercise_key, smoothing_window):
+    if exercise_key == AUTO:
+        logic_by_key = {key: data['logic'] for key, data in EXERCISES.items()}
+        detector = ExerciseDetector(logic_by_key, model.classes_by_key)
+        return MissionEngine(model, logic_by_key=logic_by_key, detector=detector,
+                             smoothing_window=smoothing_window)
+    return MissionEngine(model, logic=EXERCISES[exercise_key]['logic'],
+                         smoothing_window=smoothing_window)
+
+
+def load_landmark_stream(path):
+    """Sequência (N, 33, 4) float32 de um .npy, .csv ou gravação; linhas com NaN = sem pose."""
+    if is_recording(path):
+        data = load_recording(path)['landmarks']
+    elif path.endswith('.npy'):
+        data = np.load(path)
+    else:
+        import pandas as pd
+        columns = [f"{c}{i}" for i in range(1, NUM_LANDMARKS + 1) for c in ('x', 'y', 'z', 'v')]
+        data = pd.read_csv(path, usecols=columns)[columns].to_numpy()
+    return np.asarray(data, dtype=np.float32).reshape(-1, NUM_LANDMARKS, 4)
+
+
+def stream_outputs(path, model, smoothing_window):
+    """PoseOutput de cada linha de uma sequência gravada de landmarks."""
+    engine = smoothing_engine(smoothing_window)
+    buffers = ProbabilityBuffers()
+    for landmarks in load_landmark_stream(path):
+        if np.isnan(landmarks).any():
+            landmarks = None
+        yield classify_landmarks(model, landmarks, engine, buffers.next(n_classes(model)))
+
+
+def video_outputs(path, model, smoothing_window, gating, exercise_key):
+    """PoseOutput de cada frame de um vídeo, com o mesmo backend do jogo."""
+    import cv2
+    import mediapipe as mp
+    from utils.gate_movimento import GatedBackend
+
+    cap = cv2.VideoCapture(path)
+    raw = None
+    frame_rgb = np.empty((FRAME_SIZE[1], FRAME_SIZE[0], 3), dtype=np.uint8)
+    small = np.empty_like(frame_rgb)
+    # Um Pose novo por vídeo, para o rastreamento começar do zero
+    with mp.solutions.pose.Pose(**POSE_SETTINGS) as pose:
+        backend = LocalPoseBackend(pose)
+        backend.set_model(model)
+        backend.set_smoothing(smoothing_window)
+        if gating:
+            params = {} if exercise_key == AUTO else EXERCISES[exercise_key].get('gating', {})
+            backend = GatedBackend(backend, **params)
+        try:
+            while True:
+                ret, raw = cap.read(raw)
+                if not ret:
+                    break
+                cv2.resize(raw, FRAME_SIZE, dst=small)
+                cv2.cvtColor(small, cv2.COLOR_BGR2RGB, dst=frame_rgb)
+                yield backend.infer(frame_rgb)
+        finally:
+            cap.release()
+
+
+def replay(path, model, exercise_key, smoothing_window=1, gating=False, quiet=False):
+    """Reproduz um arquivo e devolve um resumo (repetições, transições, frames/s)."""
+    engine = new_engine(model, exercise_key, smoothing_window)
+    if path.lower().endswith(VIDEO_EXTENSIONS):
+        outputs = video_outputs(path, model, smoothing_window, gating, exercise_key)
+    else:
+        outputs = stream_outputs(path, model, smoothing_window)
+
+    frames = poses = transitions = 0
+    rep_frames, detections = [], []
+    start = time.perf_counter()
+    for frame_index, output in enumerate(outputs):
+        frames += 1
+        poses += output.landmarks is not None
+        event = engine.process(output)
+        if event is None:
+            continue
+        if event.kind == DETECTED:
+            detections.append((frame_index, event.exercise))
+            if not quiet:
+                print(f"  [{frame_index:6d}] exercício detectado: {event.exercise}")
+        elif event.kind in (TRANSITION, REP):
+            transitions += 1
+            if not quiet:
+                print(f"  [{frame_index:6d}] {event.pose_class} ({event.confidence:.2f})"
+                      f"{f' -> repetição {event.reps}' if event.kind == REP else ''}")
+            if event.kind == REP:
+                rep_frames.append(frame_index)
+    elapsed = time.perf_counter() - start
+
+    return {
+        'arquivo': path,
+        'exercicio': exercise_key,
+        'frames': frames,
+        'frames_com_pose': poses,
+        'transicoes': transitions,
+        'repeticoes': engine.reps,
+        'frames_das_repeticoes': rep_frames,
+        'deteccoes': detections,
+        'segundos': elapsed,
+        'fps': frames / elapsed if elapsed > 0 else 0.0,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Reproduz missões sem interface e conta as repetições")
+    parser.add_argument('arquivos', nargs='+', help="vídeos, sequências de landmarks (.npy/.csv) ou gravações (gravacoes/...)")
+    parser.add_argument('--exercicio', choices=sorted(EXERCISES) + [AUTO], required=True,
+                        help="exercício da missão, ou 'auto' para detectar pelos movimentos")
+    parser.add_argument('--janela', type=int, default=1, metavar='N',
+                        help="média dos últimos N frames (landmarks e probabilidades); 1 desliga")
+    parser.add_argument('--gating', action='store_true',
+                        help="inferência espaçada e disparada por movimento (só para vídeos)")
+    parser.add_argument('--quiet', action='store_true', help="não imprime cada transição")
+    parser.add_argument('--json', metavar='ARQUIVO', help="salva os resumos em JSON")
+    args = parser.parse_args()
+
+    model = load_model(args.exercicio)
+    results = []
+    for path in args.arquivos:
+        print(f"\n{os.path.basename(path)}")
+        result = replay(path, model, args.exercicio, args.janela, args.gating, args.quiet)
+        results.append(result)
+        print(f"  {result['repeticoes']} repetições, {result['transicoes']} transições | "
+              f"{result['frames']} frames ({result['frames_com_pose']} com pose) | "
+              f"{result['fps']:.0f} frames/s")
+
+    total_frames = sum(r['frames'] for r in results)
+    total_time = sum(r['segundos'] for r in results)
+    print(f"\nTotal: {sum(r['repeticoes'] for r in results)} repetições em {len(results)} arquivo(s), "
+          f"{total_frames / total_time if total_time > 0 else 0.0:.0f} frames/s")
+
+    if args.json:
+        with open(args.json, 'w', encoding='utf-8') as f:
+            json.dump(results, f, ensure_ascii=False, indent=2)
+
+
+if __name__ == "__main__":
+    main()
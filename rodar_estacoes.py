@@ -0,0 +1,223 @@
+# arquivo: rodar_estacoes.py
+# Várias crianças ao mesmo tempo num só processo: cada estação tem a sua câmera
+# (ou vídeo) e a sua missão, e todas dividem um pool fixo de workers de pose
+# (ver utils/estacoes.py). A janela mostra as estações lado a lado com as
+# repetições, o feedback e o FPS de cada uma; sem interface, o script imprime
+# o FPS por estação e a ocupação dos workers, para dimensionar o hardware.
+#
+# Cada --estacao é EXERCICIO@FONTE (exercício do manifesto ou 'auto'; fonte
+# como no --fonte do jogo: índice da webcam, vídeo, pasta ou 'sintetico').
+# Só a FONTE também vale e usa a missão automática.
+#
+# Uso:
+#   python rodar_estacoes.py --estacao estrelas@0 --estacao asas@1 --workers 2
+#   python rodar_estacoes.py --estacao auto@videos/levantar_abaixar.mp4 --estacao sintetico \
+#       --sem-interface --duracao 30 --json estacoes.json
+
+import argparse
+import copy
+import json
+import math
+import os
+import time
+
+import numpy as np
+
+from utils.captura import open_source
+from utils.contador import TRANSITION, REP, WRONG_POSE, LOW_CONFIDENCE, DETECTED
+from utils.detector_exercicio import ExerciseDetector
+from utils.estacoes import FRAME_SIZE, PosePool, Station
+from utils.exercicios import EXERCISES, POSE_SETTINGS
+from utils.gravacao import DEFAULT_RECORD_FPS, SessionRecorder
+from utils.inferencia import draw_pose
+from utils.registro_modelos import ModelRegistry
+
+AUTO = 'auto'
+REPORT_INTERVAL = 2.0
+RECORDING_DIR = 'gravacoes'
+
+
+def parse_station(spec):
+    """'exercicio@fonte' -> (exercicio, fonte); só a fonte -> missão automática."""
+    exercise, sep, source = spec.partition('@')
+    if not sep:
+        return AUTO, spec
+    if exercise != AUTO and exercise not in EXERCISES:
+        raise argparse.ArgumentTypeError(
+            f"exercício desconhecido '{exercise}' (use {', '.join(sorted(EXERCISES))} ou {AUTO})")
+    return exercise, source
+
+
+def build_station(name, exercise, source, registry, smoothing_window):
+    cap = open_source(source, size=FRAME_SIZE, realtime=True, loop=True)
+    if not cap.isOpened():
+        raise RuntimeError(f"não foi possível abrir a fonte de vídeo '{source}'")
+    # O registro devolve a mesma instância para todas as estações, e os
+    # classificadores compilados têm buffers de trabalho próprios: workers do
+    # pool atendendo estações diferentes não podem dividir esses buffers.
+    if exercise == AUTO:
+        model = copy.deepcopy(registry.multi())
+        if model is None:
+            raise ValueError("os modelos não puderam ser empilhados")
+        logic_by_key = {key: data['logic'] for key, data in EXERCISES.items()}
+        return Station(name, cap, model, logic_by_key=logic_by_key,
+                       detector=ExerciseDetector(logic_by_key, model.classes_by_key),
+                       smoothing_window=smoothing_window)
+    return Station(name, cap, copy.deepcopy(registry.compiled(exercise)), logic=EXERCISES[exercise]['logic'],
+                   smoothing_window=smoothing_window)
+
+
+def pool_pose_factory():
+    """Pose de um worker do pool: sem rastreamento, pois atende frames de várias estações."""
+    import mediapipe as mp
+    return mp.solutions.pose.Pose(**dict(POSE_SETTINGS, static_image_mode=True))
+
+
+def feedback_text(event):
+    if event.kind == DETECTED:
+        if event.exercise:
+            return f"Exercício detectado: {EXERCISES[event.exercise]['name']}"
+        return "Comece o exercício para que eu descubra qual é!"
+    if event.kind in (TRANSITION, REP):
+        return f"Correto! Próximo passo: {event.next_stage.upper()}"
+    if event.kind == WRONG_POSE:
+        return f"Mantenha a postura! Esperado: {event.expected.upper()}"
+    if event.kind == LOW_CONFIDENCE:
+        return "Ajuste a posição! Confiança baixa."
+    return ""
+
+
+def format_report(report):
+    lines = [f"workers: ocupação {' / '.join(f'{u * 100:.0f}%' for u in report['ocupacao_workers'])}"]
+    for name, r in report['estacoes'].items():
+        lines.append(f"  {name:<22} inferência {r['fps_inferencia']:5.1f} fps | exibição {r['fps_exibicao']:5.1f} fps"
+                     f" | descartados {r['descartados_na_fila']} | {r['repeticoes']} repetições")
+    return "\n".join(lines)
+
+
+def run_headless(pool, duration):
+    """Consome os resultados sem janela e imprime o FPS de cada estação periodicamente."""
+    start = time.perf_counter()
+    next_report = start + REPORT_INTERVAL
+    while duration is None or time.perf_counter() - start < duration:
+        shown = False
+        for station in pool.stations.values():
+            item = station.poll()
+            if item is not None:
+                station.release(item[0])
+                shown = True
+        if not shown:
+            time.sleep(0.002)
+        if time.perf_counter() >= next_report:
+            next_report += REPORT_INTERVAL
+            print(format_report(pool.report()))
+
+
+def run_window(pool):
+    """Estações lado a lado numa janela Tk, atualizadas por um único laço `after`."""
+    import tkinter as tk
+    import cv2
+    from PIL import Image, ImageTk
+
+    stations = list(pool.stations.values())
+    columns = math.ceil(math.sqrt(len(stations)))
+    display = (FRAME_SIZE[0] // 2, FRAME_SIZE[1] // 2) if columns > 2 else FRAME_SIZE
+    root = tk.Tk()
+    root.title("Missões do Herói IA - estações")
+    root.configure(bg='#2c3e50')
+
+    panels = {}
+    for i, station in enumerate(stations):
+        frame = tk.Frame(root, bg='#2c3e50')
+        frame.grid(row=i // columns, column=i % columns, padx=8, pady=8)
+        tk.Label(frame, text=station.name, font=('Arial', 14, 'bold'), bg='#2c3e50', fg='white').pack()
+        image = ImageTk.PhotoImage('RGB', display)
+        tk.Label(frame, image=image, bg='black').pack()
+        info = tk.Label(frame, text="", font=('Arial', 12), bg='#2c3e50', fg='#ecf0f1', justify='left')
+        info.pack(fill='x')
+        panels[station.name] = {'image': image, 'info': info, 'feedback': "",
+                                'buffer': np.empty((display[1], display[0], 3), dtype=np.uint8)}
+
+    next_info = [0.0]
+
+    def tick():
+        now = time.perf_counter()
+        for station in stations:
+            panel = panels[station.name]
+            item = station.poll()
+            if item is not None:
+                packet, output, event = item
+                image = packet.image
+                if output.landmarks is not None:
+                    draw_pose(image, output.landmarks)
+                if display != FRAME_SIZE:
+                    image = cv2.resize(image, display, dst=panel['buffer'], interpolation=cv2.INTER_AREA)
+                panel['image'].paste(Image.fromarray(image))
+                station.release(packet)
+                if event is not None:
+                    panel['feedback'] = feedback_text(event)
+        if now >= next_info[0]:
+            next_info[0] = now + 0.5
+            for station in stations:
+                r = station.report()
+                panels[station.name]['info'].config(
+                    text=f"Repetições: {r['repeticoes']} | {r['fps_exibicao']:.0f} fps "
+                         f"(inferência {r['fps_inferencia']:.0f})\n{panels[station.name]['feedback']}")
+        root.after(10, tick)
+
+    root.protocol("WM_DELETE_WINDOW", root.destroy)
+    root.after(10, tick)
+    root.mainloop()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Várias estações (câmera + missão) com um pool de pose compartilhado")
+    parser.add_argument('--estacao', action='append', type=parse_station, required=True, metavar='EXERCICIO@FONTE',
+                        help="uma por criança; ex.: estrelas@0, auto@videos/x.mp4, sintetico")
+    parser.add_argument('--workers', type=int, default=2, help="workers de pose compartilhados (um Pose cada)")
+    parser.add_argument('--janela', type=int, default=1, metavar='N',
+                        help="média dos últimos N frames (landmarks e probabilidades); 1 desliga")
+    parser.add_argument('--sem-interface', action='store_true', help="sem janela: só imprime o FPS das estações")
+    parser.add_argument('--duracao', type=float, help="segundos até encerrar (sem interface)")
+    parser.add_argument('--gravar', nargs='?', type=float, const=DEFAULT_RECORD_FPS, default=None, metavar='FPS',
+                        help=f"grava landmarks, probabilidades e eventos de cada estação em gravacoes/ a até "
+                             f"{DEFAULT_RECORD_FPS:g} fps, mais os frames com evento; 0 grava todos os frames")
+    parser.add_argument('--json', metavar='ARQUIVO', help="salva o relatório final em JSON")
+    args = parser.parse_args()
+
+    registry = ModelRegistry(EXERCISES).preload()
+    pool = PosePool(pool_pose_factory, workers=args.workers)
+    for i, (exercise, source) in enumerate(args.estacao, start=1):
+        station = pool.add(build_station(f"{i}: {exercise} ({source})", exercise, source, registry, args.janela))
+        print(f"Estação {station.name}: {station.cap.describe()}")
+        if args.gravar is not None:
+            path = os.path.join(RECORDING_DIR, time.strftime(f'estacao{i}_{exercise}_%Y%m%d_%H%M%S'))
+            station.recorder = SessionRecorder(path, station.model.classes_, exercises=list(EXERCISES),
+                                               max_fps=args.gravar or None,
+                                               metadata={'exercicio': exercise, 'fonte': source})
+
+    try:
+        pool.start()
+    except RuntimeError as e:
+        raise SystemExit(f"ERRO: {e}")
+    try:
+        if args.sem_interface:
+            run_headless(pool, args.duracao)
+        else:
+            run_window(pool)
+    except KeyboardInterrupt:
+        pass
+    finally:
+        report = pool.report()
+        pool.stop()
+    print(format_report(report))
+    for station in pool.stations.values():
+        if station.recorder:
+            print(f"Gravação em {station.recorder.path}: {station.recorder}")
+    if args.json:
+        with open(args.json, 'w', encoding='utf-8') as f:
+            json.dump(report, f, ensure_ascii=False, indent=2)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,58 @@
+# arquivo: rotular_intervalos.py
+# Transforma faixas de tempo rotuladas ("0:03-0:05 up") em amostras de treino,
+# em vez de apertar `s` frame a frame na coleta. Para cada vídeo: os landmarks
+# de todos os frames vêm da extração em paralelo (do cache, se o vídeo já foi
+# extraído; ver extrair_landmarks.py), as faixas de rotulos/<vídeo>.txt são
+# cruzadas com os timestamps de uma vez (utils/rotulos.py) e as amostras
+# substituem as anteriores do mesmo vídeo no conjunto em dados/.
+#
+# As faixas podem ser escritas à mão ou marcadas nos scripts de coleta_dados/
+# (teclas i/f/z).
+#
+# Uso:
+#   python rotular_intervalos.py videos/asas_de_super_heroi.mp4 --conjunto asas_de_super_heroi
+#   python rotular_intervalos.py videos/a.mp4 videos/b.mp4 --conjunto sentar_e_levantar --workers 4
+
+import argparse
+import os
+
+from utils.base_dados import dataset_path, open_dataset
+from utils.cache_extracao import ExtractionCache
+from utils.extracao import EXTRACTION_DIR, POSE_KWARGS, extract_videos
+from utils.rotulos import annotation_path, label_video, load_intervals
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Rotula vídeos por faixas de tempo e gera as amostras de treino")
+    parser.add_argument('videos', nargs='+')
+    parser.add_argument('--conjunto', required=True, help="conjunto de dados em dados/ (ex.: asas_de_super_heroi)")
+    parser.add_argument('--rotulos', metavar='ARQUIVO',
+                        help="arquivo de faixas (só com um vídeo; padrão: rotulos/<vídeo>.txt)")
+    parser.add_argument('--workers', type=int, default=os.cpu_count(), help="processos da extração")
+    args = parser.parse_args()
+    if args.rotulos and len(args.videos) > 1:
+        parser.error("--rotulos só vale com um vídeo")
+
+    annotations = {}
+    for video in args.videos:
+        path = args.rotulos or annotation_path(video)
+        try:
+            annotations[video] = load_intervals(path)
+        except (OSError, ValueError) as e:
+            print(f"ERRO: {video}: {e}")
+    if not annotations:
+        return
+
+    summaries = extract_videos(list(annotations), EXTRACTION_DIR, args.workers, pose_kwargs=POSE_KWARGS,
+                               cache=ExtractionCache())
+    target = dataset_path(args.conjunto)
+    for video, intervals in annotations.items():
+        if video not in summaries:
+            continue
+        counts = label_video(video, intervals, target, summaries[video]['saida'])
+        print(f"{os.path.basename(video)}: {len(intervals)} faixas -> {sum(counts.values())} amostras {counts}")
+    print(open_dataset(target))
+
+
+if __name__ == "__main__":
+    main()
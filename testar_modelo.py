@@ -1,71 +1,91 @@
+import time
+STARTED = time.perf_counter()  # origem do relatório de inicialização
 import tkinter as tk # Para tk.Tk e tk.Frame
 from tkinter import ttk
 import tkinter.font as font # Para a classe font.Font
-import cv2
-import mediapipe as mp
-import pickle
 import numpy as np
 from PIL import Image, ImageTk
 import os
 import random
-import pygame 
-
-EXERCISES = {
-    "estrelas": {
-        "name": "Alcançar as Estrelas",
-        "model_path": "modelos/alcancar_as_estrelas.pkl",
-        "logic": ['down', 'up']
-    },
-    "asas": {
-        "name": "Asas de Super-Herói",
-        "model_path": "modelos/asas_de_super_heroi.pkl",
-        "logic": ['middle', 'up', 'middle']
-    },
-    "parede": {
-        "name": "Empurrar Parede",
-        "model_path": "modelos/empurrar_parede.pkl",
-        "logic": ['down', 'push']
-    },
-    "sentar": {
-        "name": "Sentar e Levantar (Cadeira)",
-        "model_path": "modelos/levantar_sentar.pkl",
-        "logic": ['em_pe', 'sentado']
-    }
-}
-
-mp_pose = mp.solutions.pose
-mp_drawing = mp.solutions.drawing_utils
+import argparse
+# cv2, mediapipe, pygame e sklearn (pelos modelos) são importados sob demanda ou
+# no aquecimento em segundo plano, depois que o menu já está na tela
+from utils.pipeline import FramePipeline
+from utils.inferencia import LocalPoseBackend, ProcessPoseBackend, draw_pose
+from utils.agendador import FrameScheduler, camera_fps
+from utils.gate_movimento import GatedBackend
+from utils.detector_exercicio import ExerciseDetector
+from utils.contador import MissionEngine, TRANSITION, REP, WRONG_POSE, LOW_CONFIDENCE, DETECTED
+from utils.exercicios import EXERCISES, AUTO_MISSION, INFERENCE_BACKENDS, POSE_SETTINGS
+from utils.rastreamento import Tracer
+from utils.cache_assets import AssetCache
+from utils.inicializacao import StartupTimer, Warmup
+from utils.registro_modelos import ModelRegistry
+from utils.captura import open_source
+from utils.qualidade import AdaptivePoseBackend, QualityController, level_label
+from utils.gravacao import DEFAULT_RECORD_FPS, SessionRecorder
 
 BASE_DIR = os.path.dirname(os.path.abspath(__file__))
-pygame.mixer_available = False
+# Sprites e ícones já redimensionados, para não reamostrar os PNGs a cada abertura
+ASSETS = AssetCache(os.path.join(BASE_DIR, '.cache_assets'))
+mixer_available = False
 SOUNDS = {}
 
-try:
-    pygame.mixer.init()
-    pygame.mixer_available = True
-except pygame.error as e:
-    print(f"ERRO ao inicializar o mixer de áudio: {e}")
+def sound_path(name):
+    """WAV pré-decodificado pelo gerar_audio.py, se existir e estiver em dia; senão o MP3."""
+    base = os.path.join(BASE_DIR, 'assets', 'audio', name)
+    mp3, wav = base + '.mp3', base + '.wav'
+    if os.path.exists(wav) and (not os.path.exists(mp3) or os.path.getmtime(wav) >= os.path.getmtime(mp3)):
+        return wav
+    return mp3
 
-if pygame.mixer_available:
+SOUND_NAMES = ('success', 'transition', 'start', 'complete')
+
+def init_sounds():
+    """Inicializa o mixer e decodifica os sons (roda no aquecimento, fora da thread do Tk).
+
+    `mixer_available` só fica True se o mixer abriu e pelo menos um som carregou.
+    """
+    global mixer_available, SOUNDS
+    import pygame
     try:
-        SOUNDS = {
-            'success': pygame.mixer.Sound(os.path.join(BASE_DIR, 'assets', 'audio', 'success.mp3')),  
-            'transition': pygame.mixer.Sound(os.path.join(BASE_DIR, 'assets', 'audio', 'transition.mp3')), 
-            'start': pygame.mixer.Sound(os.path.join(BASE_DIR, 'assets', 'audio', 'start.mp3')), 
-            'complete': pygame.mixer.Sound(os.path.join(BASE_DIR, 'assets', 'audio', 'complete.mp3'))
-        }
+        pygame.mixer.init()
     except pygame.error as e:
-        print(f"AVISO: Falha ao carregar um dos arquivos de áudio. Verifique se estão na pasta assets/audio/: {e}")
-        SOUNDS = {}
+        print(f"ERRO ao inicializar o mixer de áudio: {e}")
+        return SOUNDS
+    sounds = {}
+    for name in SOUND_NAMES:
+        try:
+            sounds[name] = pygame.mixer.Sound(sound_path(name))
+        except (pygame.error, FileNotFoundError) as e:
+            print(f"AVISO: Falha ao carregar o áudio '{name}'. Verifique se ele está na pasta assets/audio/: {e}")
+    SOUNDS = sounds
+    mixer_available = bool(sounds)
+    return SOUNDS
     
-def play_sound(sound_key):
+def play_sound(sound_key, tracer=None):
     """Toca o som se o mixer estiver disponível e o som tiver sido carregado."""
-    if pygame.mixer_available and sound_key in SOUNDS:
+    if mixer_available and sound_key in SOUNDS:
+        t0 = time.perf_counter()
         SOUNDS[sound_key].play()
+        if tracer:
+            tracer.add('audio', t0)
 
 class PoseApp(tk.Tk):
-    def __init__(self, *args, **kwargs):
+    def __init__(self, *args, inference_backend='local', gating=False, smoothing_window=1, trace=False,
+                 timer=None, source='0', target_fps=None, record_fps=None, **kwargs):
         super().__init__(*args, **kwargs)
+        self.inference_backend = inference_backend
+        self.source = source
+        self.target_fps = target_fps
+        # --gravar: FPS máximo da gravação (0 = todos os frames); None não grava
+        self.record_fps = record_fps
+        self.gating = gating
+        self.smoothing_window = smoothing_window
+        self.trace = trace
+        self.timer = timer or StartupTimer()
+        # Modelos do manifesto, carregados uma vez e mantidos em memória
+        self.registry = ModelRegistry(EXERCISES)
         self.title("Missões do Herói IA")
         self.geometry("1280x800")
         container = tk.Frame(self)
@@ -79,6 +99,31 @@ class PoseApp(tk.Tk):
             self.frames[F] = frame
             frame.grid(row=0, column=0, sticky="nsew")
         self.show_frame(LevelSelectionFrame)
+        self.protocol("WM_DELETE_WINDOW", self.on_close)
+        # Sons, Pose e modelos aquecem enquanto a criança escolhe a missão; os sons vêm
+        # primeiro porque são rápidos e o 'start' toca assim que a missão começa
+        mission = self.frames[MissionFrame]
+        self.warmup = Warmup([('sons', init_sounds),
+                              ('pose', mission.warm_up_backend),
+                              ('modelos', mission.preload_models)], self.timer)
+        self.after(1, self.on_first_window)
+
+    def on_first_window(self):
+        self.update_idletasks()
+        self.timer.mark('primeira janela')
+        self.warmup.start()
+
+    def wait_warmup(self, name):
+        """Espera uma tarefa do aquecimento; se ela falhou, quem chamou faz o trabalho de novo."""
+        try:
+            return self.warmup.get(name)
+        except Exception:
+            return None
+
+    def on_close(self):
+        for frame in self.frames.values():
+            if hasattr(frame, 'shutdown'): frame.shutdown()
+        self.destroy()
 
     def show_frame(self, cont, data=None):
         frame = self.frames[cont]
@@ -104,10 +149,17 @@ class LevelSelectionFrame(tk.Frame):
                             font=button_font, bg='#f1c40f', fg='#2c3e50',
                             command=lambda data=exercise_data: controller.show_frame(MissionFrame, data=data))
             btn.pack(pady=15, padx=20, ipadx=10, ipady=10)
+        tk.Button(self, text=AUTO_MISSION['name'], font=button_font, bg='#3498db', fg='white',
+                  command=lambda: controller.show_frame(MissionFrame, data=AUTO_MISSION)).pack(pady=15, padx=20, ipadx=10, ipady=10)
 
 class MissionFrame(tk.Frame):
     MISSION_GOAL = 5
     STAR_THRESHOLDS = (1, 3, 5)
+    FRAME_SIZE = (640, 480)
+    HERO_FRAME_INTERVAL = 0.15  # segundos entre quadros da animação do herói
+    OVERLAY_INTERVAL = 0.5  # segundos entre atualizações do painel de desempenho
+    TRACE_DIR = 'rastros'
+    RECORDING_DIR = 'gravacoes'
 
     def __init__(self, parent, controller):
         super().__init__(parent, bg='#2c3e50')
@@ -115,8 +167,7 @@ class MissionFrame(tk.Frame):
         
         self.model = None
         self.exercise_logic = []
-        self.logic_index = 0 
-        self.stage = ""
+        self.engine = None
         
         self.idle_frames = self.load_animation_frames('assets/idle')
         self.action_frames = self.load_animation_frames('assets/action')
@@ -124,16 +175,46 @@ class MissionFrame(tk.Frame):
         self.star_filled_img = self.load_ui_image('assets/ui/star_filled.png', (64, 64))
         
         self.is_mission_running = False
+        self.cap = None
+        self.pipeline = None
+        self.scheduler = None
         # Modelo de complexidade 0 é o mais leve e rápido
-        self.pose_processor = mp_pose.Pose(min_detection_confidence=0.4, min_tracking_confidence=0.4, model_complexity=0)
+        self.backend_name = getattr(controller, 'inference_backend', 'local')
+        self.pose_processor = None
+        self.backend = None
+        self.mission_started = None
+        self.inference = None
+        self.detector = None
+        self.gating = getattr(controller, 'gating', False)
+        # Janela (frames) das features temporais: média de landmarks para o modelo
+        # e média de probabilidades para a lógica de repetições
+        self.smoothing_window = getattr(controller, 'smoothing_window', 1)
+        # Rastreamento (--rastrear): spans por frame, painel de desempenho e trace no fim da missão
+        self.trace = getattr(controller, 'trace', False)
+        # Fonte dos frames (--fonte): webcam, vídeo, pasta de imagens ou "sintetico"
+        self.source = getattr(controller, 'source', '0')
+        # FPS alvo (--fps-alvo): complexidade e resolução da pose ajustadas à máquina
+        self.target_fps = getattr(controller, 'target_fps', None)
+        # Gravação (--gravar): landmarks, probabilidades e eventos dos frames exibidos (até record_fps)
+        self.record_fps = getattr(controller, 'record_fps', None)
+        self.recorder = None
+        self.mission_name = None
+        self.tracer = None
+        self.next_overlay = 0.0
 
         # --- Layout ---
         main_panel = tk.Frame(self, bg='#2c3e50')
         main_panel.pack(fill="both", expand=True, padx=20, pady=20)
         video_panel = tk.Frame(main_panel, bg='#2c3e50')
         video_panel.pack(side="left", fill="both", expand=True)
-        self.video_label = tk.Label(video_panel, bg='black')
+        # Uma única PhotoImage de vida longa, atualizada com paste() a cada frame
+        self.video_image = ImageTk.PhotoImage('RGB', self.FRAME_SIZE)
+        self.video_label = tk.Label(video_panel, bg='black', image=self.video_image)
         self.video_label.pack(padx=10, pady=10, fill="both", expand=True)
+        self.overlay_label = tk.Label(video_panel, text="", font=('Consolas', 11, 'bold'),
+                                      bg='black', fg='#2ecc71', justify='left')
+        if self.trace:
+            self.overlay_label.place(x=20, y=20)
         game_panel = tk.Frame(main_panel, bg='#34495e', width=400)
         game_panel.pack(side="right", fill="y", padx=10)
         game_panel.pack_propagate(False)
@@ -170,9 +251,21 @@ class MissionFrame(tk.Frame):
         self.speech_bubble = tk.Label(game_panel, text="", bg='white', fg='black', font=('Nunito', 12, 'bold'), wraplength=300)
 
     def configure_mission(self, exercise_data):
+        self.detector = None
+        self.mission_name = exercise_data.get('key', 'auto')
+        if exercise_data.get('auto'):
+            self.configure_auto_mission()
+            return
         try:
-            with open(exercise_data['model_path'], "rb") as f:
-                self.model = pickle.load(f)
+            # Vem do registro: sem leitura de disco nem unpickle ao trocar de missão
+            self.controller.wait_warmup('modelos')
+            self.model = self.controller.registry.compiled(exercise_data['key'])
+            backend = self.get_backend()
+            backend.set_model(self.model, exercise_data['model_path'])
+            backend.set_smoothing(self.smoothing_window)
+            self.inference = backend
+            if self.gating:
+                self.inference = GatedBackend(backend, **exercise_data.get('gating', {}))
             self.exercise_logic = exercise_data['logic']
         except Exception as e:
             self.model = None
@@ -180,17 +273,112 @@ class MissionFrame(tk.Frame):
             print(f"ERRO ao carregar o modelo: {e}")
             self.feedback_label.config(text=f"Erro ao carregar o modelo!")
 
+    def configure_auto_mission(self):
+        """Empilha os modelos de todos os exercícios e liga o detector de exercício."""
+        try:
+            self.controller.wait_warmup('modelos')
+            self.model = self.controller.registry.multi()
+            if self.model is None:
+                raise ValueError("os modelos não puderam ser empilhados")
+            backend = self.get_backend()
+            backend.set_model(self.model, self.controller.registry.paths())
+            backend.set_smoothing(self.smoothing_window)
+            self.inference = GatedBackend(backend) if self.gating else backend
+            self.detector = ExerciseDetector({key: data['logic'] for key, data in EXERCISES.items()},
+                                             self.model.classes_by_key)
+            self.exercise_logic = []
+        except Exception as e:
+            self.model = None
+            self.exercise_logic = []
+            print(f"ERRO ao carregar os modelos: {e}")
+            self.feedback_label.config(text=f"Erro ao carregar os modelos!")
+
+    def on_exercise_detected(self, key):
+        """Avisa a criança quando o detector muda de exercício."""
+        self.exercise_logic = EXERCISES[key]['logic'] if key else []
+        if key:
+            self.update_feedback_text(f"Exercício detectado: **{EXERCISES[key]['name']}**")
+        else:
+            self.update_feedback_text("Comece o exercício para que eu descubra qual é!")
+
+    def preload_models(self):
+        """Aquecimento: carrega e compila todos os modelos (e importa o sklearn) antes da primeira missão."""
+        registry = self.controller.registry.preload()
+        if isinstance(self.backend, ProcessPoseBackend):
+            # O processo filho tem o seu próprio cache de modelos
+            paths = registry.paths()
+            self.backend.preload(list(paths.values()) + [paths])
+        return registry
+
+    def get_backend(self):
+        """Cria o backend de inferência na primeira missão e o reaproveita depois."""
+        self.controller.wait_warmup('pose')
+        if self.backend is None:
+            self.backend = self.create_backend()
+        return self.backend
+
+    def create_backend(self):
+        if self.backend_name == 'processo':
+            # O processo filho importa o mediapipe e aquece o próprio grafo
+            if self.target_fps:
+                print("AVISO: --fps-alvo só vale para o backend local; usando as configurações fixas.")
+            return ProcessPoseBackend(POSE_SETTINGS)
+        import mediapipe as mp
+        if self.target_fps:
+            # Um Pose por complexidade, trocados pelo controlador conforme a latência medida
+            quality = QualityController(target_fps=self.target_fps)
+            return AdaptivePoseBackend(
+                lambda complexity: mp.solutions.pose.Pose(**dict(POSE_SETTINGS, model_complexity=complexity)),
+                quality)
+        self.pose_processor = mp.solutions.pose.Pose(**POSE_SETTINGS)
+        return LocalPoseBackend(self.pose_processor)
+
+    def warm_up_backend(self):
+        """Aquecimento: cria o Pose e roda um frame vazio (a primeira chamada é a mais lenta)."""
+        self.backend = self.create_backend()
+        if isinstance(self.backend, AdaptivePoseBackend):
+            self.backend.warm_up()
+        elif self.pose_processor is not None:
+            w, h = self.FRAME_SIZE
+            self.pose_processor.process(np.zeros((h, w, 3), dtype=np.uint8))
+        return self.backend
+
+    def shutdown(self):
+        self.stop_mission()
+        if self.backend:
+            self.backend.close()
+            self.backend = None
+
     def start_mission(self):
         if self.is_mission_running or self.model is None: return
         self.is_mission_running = True
         self.counter = 0
-        self.logic_index = 0 
-        self.stage = "" 
-        self.cap = cv2.VideoCapture(0)
+        self.tracer = Tracer() if self.trace else None
+        self.inference.set_tracer(self.tracer)
+        # Contagem de repetições fora da interface (a mesma usada pelo replay_missao.py)
+        self.engine = MissionEngine(self.model, logic=self.exercise_logic,
+                                    logic_by_key={key: data['logic'] for key, data in EXERCISES.items()},
+                                    detector=self.detector, smoothing_window=self.smoothing_window)
+        self.engine.reset()
+        self.mission_started = time.perf_counter()
+        if self.record_fps is not None:
+            self.start_recording()
+        # A câmera já entrega o tamanho do quadro (MJPG 640x480), sem reduzir 1080p em Python
+        self.cap = open_source(self.source, size=self.FRAME_SIZE, realtime=True, loop=True)
+        if not self.cap.isOpened():
+            print(f"ERRO: não foi possível abrir a fonte de vídeo '{self.source}'.")
+        else:
+            print(f"Fonte de vídeo: {self.cap.describe()}")
+        # Captura e inferência rodam fora da thread do Tk
+        self.pipeline = FramePipeline(self.cap, self.infer_frame, size=self.FRAME_SIZE, tracer=self.tracer)
+        self.pipeline.start()
         self.reset_ui()
-        play_sound('start') 
-        self.update_frame()
-        self.animate_hero()
+        self.controller.wait_warmup('sons')
+        play_sound('start', self.tracer)
+        # Vídeo e animação do herói no mesmo laço, no ritmo real da câmera
+        self.scheduler = FrameScheduler(self, camera_fps(self.cap), self.update_frame,
+                                        on_sprite=self.animate_hero, sprite_interval=self.HERO_FRAME_INTERVAL)
+        self.scheduler.start()
 
     # Adicione esta função FORA da classe MissionFrame, talvez logo abaixo do bloco de importações:
     def calculate_angle(a, b, c):
@@ -222,73 +410,112 @@ class MissionFrame(tk.Frame):
             
         return angle
 
+    def infer_frame(self, frame):
+        """Roda na thread de inferência: pose + classificador, sem tocar em widgets."""
+        return self.inference.infer(frame)
+
     def update_frame(self):
-        if not self.is_mission_running: return
-        ret, frame = self.cap.read()
-        if not ret:
-            self.after(10, self.update_frame)
+        """Chamado pelo FrameScheduler; retorna True se exibiu um frame novo."""
+        if not self.is_mission_running: return False
+        item = self.pipeline.latest()
+        if item is None:
+            # Nenhum resultado novo ainda: a inferência continua em paralelo
+            return False
+
+        packet, output = item
+        image_rgb = packet.image
+        # O buffer volta ao pool mesmo se algo abaixo falhar; senão a captura para quando o pool esvazia
+        try:
+            t0 = time.perf_counter()
+            if self.controller.timer.mark('primeira inferência'):
+                print(f"{self.controller.timer.report()} "
+                      f"(primeira inferência a {(t0 - self.mission_started) * 1000:.0f} ms do início da missão)")
+            event = self.engine.process(output)
+            if event is not None:
+                self.handle_event(event)
+            if self.recorder:
+                self.recorder.record(packet.timestamp, output, event, self.engine.reps)
+            t1 = time.perf_counter()
+
+            if output.landmarks is not None:
+                draw_pose(image_rgb, output.landmarks)
+
+            # Atualiza a mesma PhotoImage em vez de criar uma nova a cada frame
+            self.video_image.paste(Image.fromarray(image_rgb))
+        finally:
+            self.pipeline.release(packet)
+        if self.tracer:
+            self.tracer.add('logica', t0, t1, frame=packet.index)
+            self.tracer.add('exibicao', t1, frame=packet.index)
+            # Da câmera até a tela, numa trilha própria para não sobrepor os spans do Tk
+            self.tracer.add('latencia', packet.timestamp, frame=packet.index, track='latencia')
+            if t1 >= self.next_overlay:
+                self.next_overlay = t1 + self.OVERLAY_INTERVAL
+                self.update_overlay()
+        return True
+
+    def update_overlay(self):
+        """Painel sobre o vídeo: FPS exibido, latência câmera->tela e frames descartados."""
+        latency = self.tracer.durations('latencia')
+        if not len(latency):
             return
-            
-        frame = cv2.resize(frame, (640, 480))
-        image_rgb = cv2.cvtColor(frame, cv2.COLOR_BGR2RGB)
-        results = self.pose_processor.process(image_rgb)
-        image_bgr = cv2.cvtColor(image_rgb, cv2.COLOR_RGB2BGR)
-
-        if results.pose_landmarks:
-            landmarks = results.pose_landmarks.landmark
-            row = np.array([[lm.x, lm.y, lm.z, lm.visibility] for lm in landmarks]).flatten()
-            X = np.array(row).reshape(1, -1)
-            
-            # --- Predição com Probabilidade e Confiança ---
-            probabilities = self.model.predict_proba(X)[0]
-            pose_class_index = np.argmax(probabilities)
-            pose_class = self.model.classes_[pose_class_index]
-            confidence_score = probabilities[pose_class_index]
-            # ----------------------------------------------
-
-            # Exibe a pontuação de confiança na tela
-            #score_percent = int(confidence_score * 100)
-            #self.performance_label.config(text=f"Confiança: {score_percent}%")
-
-            # --- Lógica de Contagem e Feedback Acurado ---
-            expected_stage = self.exercise_logic[self.logic_index]
-            
-            MIN_CONFIDENCE = 0.8 # Limite de confiança para aceitar a pose
-            
-            if pose_class == expected_stage and confidence_score > MIN_CONFIDENCE:
-                # Pose correta e com boa confiança: avança.
-                self.stage = pose_class
-                self.logic_index += 1
-                
-                next_stage_name = self.exercise_logic[self.logic_index % len(self.exercise_logic)]
-                self.update_feedback_text(f"Correto! Próximo passo: **{next_stage_name.upper()}**")
-                
-                play_sound('transition')
-                
-                # Repetição Completa
-                if self.logic_index >= len(self.exercise_logic):
-                    self.logic_index = 0
-                    self.counter += 1
-                    self.on_rep_success()
-            
-            elif pose_class != expected_stage and confidence_score > MIN_CONFIDENCE:
-                # Pose errada, mas o modelo tem certeza: feedback de correção.
-                self.update_feedback_text(f"Mantenha a postura! O modelo espera **{expected_stage.upper()}** agora.")
-            
-            elif confidence_score <= MIN_CONFIDENCE:
-                 # Confiança baixa: feedback para melhorar a visibilidade/postura.
-                self.update_feedback_text("Ajuste a posição! Confiança baixa. Certifique-se de que todas as partes do corpo estejam visíveis.")
-            # ------------------------------------------------------------------
+        p50, p95 = np.percentile(latency, (50, 95))
+        dropped = sum(d for _, d in self.pipeline.stats.snapshot().values())
+        text = (f"FPS {self.tracer.rate('exibicao'):.0f} | latência p50 {p50:.0f} ms / p95 {p95:.0f} ms | "
+                f"descartados {dropped}")
+        if isinstance(self.backend, AdaptivePoseBackend):
+            text += f"\n{level_label(self.backend.controller.current)}"
+        self.overlay_label.config(text=text)
 
-            mp_drawing.draw_landmarks(image_bgr, results.pose_landmarks, mp_pose.POSE_CONNECTIONS)
-        
-        img_tk = ImageTk.PhotoImage(image=Image.fromarray(cv2.cvtColor(image_bgr, cv2.COLOR_BGR2RGB)))
-        self.video_label.config(image=img_tk)
-        self.video_label.image = img_tk
-        self.after(10, self.update_frame)
+    def export_trace(self):
+        """Salva o trace da missão (formato do Chrome) e imprime o resumo por estágio."""
+        os.makedirs(os.path.join(BASE_DIR, self.TRACE_DIR), exist_ok=True)
+        path = os.path.join(BASE_DIR, self.TRACE_DIR, time.strftime('missao_%Y%m%d_%H%M%S.json'))
+        metadata = {'backend': self.backend_name, 'gating': self.gating, 'janela': self.smoothing_window,
+                    'agendador': self.scheduler.report() if self.scheduler else {},
+                    'pipeline': {stage: {'processados': p, 'descartados': d}
+                                 for stage, (p, d) in self.pipeline.stats.snapshot().items()}
+                    if self.pipeline else {}}
+        if isinstance(self.backend, AdaptivePoseBackend):
+            metadata['qualidade'] = {'fps_alvo': self.target_fps, 'decisoes': self.backend.controller.report()}
+        n = self.tracer.export_chrome(path, metadata)
+        for name, stats in self.tracer.summary().items():
+            print(f"  {name:<14} p50 {stats['p50_ms']:7.2f} ms | p95 {stats['p95_ms']:7.2f} ms ({stats['n']} spans)")
+        print(f"Trace salvo em {path} ({n} eventos; abra em chrome://tracing ou ui.perfetto.dev)")
+
+    def start_recording(self):
+        """Abre a gravação da missão em gravacoes/ (lida depois com utils.gravacao.load_recording)."""
+        path = os.path.join(BASE_DIR, self.RECORDING_DIR,
+                            time.strftime(f'missao_{self.mission_name}_%Y%m%d_%H%M%S'))
+        try:
+            self.recorder = SessionRecorder(
+                path, self.model.classes_, exercises=list(EXERCISES), max_fps=self.record_fps or None,
+                metadata={'exercicio': self.mission_name, 'fonte': self.source,
+                          'backend': self.backend_name, 'janela': self.smoothing_window})
+        except OSError as e:
+            self.recorder = None
+            print(f"AVISO: não foi possível gravar a missão: {e}")
+
+    def handle_event(self, event):
+        """Traduz um evento do MissionEngine em feedback, som e progresso."""
+        if event.kind == DETECTED:
+            self.on_exercise_detected(event.exercise)
+        elif event.kind in (TRANSITION, REP):
+            self.update_feedback_text(f"Correto! Próximo passo: **{event.next_stage.upper()}**")
+            play_sound('transition', self.tracer)
+            # Repetição Completa
+            if event.kind == REP:
+                self.counter = event.reps
+                self.on_rep_success()
+        elif event.kind == WRONG_POSE:
+            # Pose errada, mas o modelo tem certeza: feedback de correção.
+            self.update_feedback_text(f"Mantenha a postura! O modelo espera **{event.expected.upper()}** agora.")
+        elif event.kind == LOW_CONFIDENCE:
+            # Confiança baixa: feedback para melhorar a visibilidade/postura.
+            self.update_feedback_text("Ajuste a posição! Confiança baixa. Certifique-se de que todas as partes do corpo estejam visíveis.")
         
     def load_ui_image(self, path, size):
-        try: return ImageTk.PhotoImage(Image.open(path).resize(size, Image.Resampling.LANCZOS))
+        try: return ImageTk.PhotoImage(ASSETS.image(os.path.join(BASE_DIR, path), size))
         except: return None
         
     def load_animation_frames(self, path):
@@ -297,8 +524,8 @@ class MissionFrame(tk.Frame):
             # Usa o caminho absoluto para carregar assets
             full_path = os.path.join(BASE_DIR, path)
             files = sorted(os.listdir(full_path), key=lambda x: int(''.join(filter(str.isdigit, x))))
-            for filename in files:
-                img = Image.open(os.path.join(full_path, filename)).resize((300, 300), Image.Resampling.LANCZOS)
+            paths = [os.path.join(full_path, filename) for filename in files]
+            for img in ASSETS.images(paths, (300, 300), os.path.basename(path)):
                 frames.append(ImageTk.PhotoImage(img))
         except: print(f"AVISO: Pasta de assets não encontrada em '{path}'.")
         return frames
@@ -306,6 +533,24 @@ class MissionFrame(tk.Frame):
     def stop_mission(self):
         if not self.is_mission_running: return
         self.is_mission_running = False
+        if self.scheduler:
+            self.scheduler.stop()
+            print(f"Agendador: {self.scheduler}")
+        if self.pipeline:
+            self.pipeline.stop()
+            print(f"Estatísticas do pipeline: {self.pipeline.stats}")
+            if isinstance(self.inference, GatedBackend):
+                print(f"Inferência espaçada: {self.inference}")
+        if self.tracer:
+            self.export_trace()
+            self.inference.set_tracer(None)
+            self.tracer = None
+        if self.recorder:
+            self.recorder.close()
+            print(f"Gravação em {self.recorder.path}: {self.recorder}")
+            self.recorder = None
+        self.scheduler = None
+        self.pipeline = None
         if self.cap: self.cap.release()
         self.cap = None
         
@@ -323,7 +568,7 @@ class MissionFrame(tk.Frame):
         if self.counter < self.MISSION_GOAL:
             progress_value = self.counter - 0.1
             self.update_feedback_text("Repetição Completa! Ótimo!")
-            play_sound('success')
+            play_sound('success', self.tracer)
         else:
             progress_value = self.MISSION_GOAL
             self.update_feedback_text("Você conseguiu!")
@@ -355,7 +600,6 @@ class MissionFrame(tk.Frame):
         if getattr(self, 'animation_state', 'idle') == 'action': frames_to_play = self.action_frames
         
         if not frames_to_play:
-            self.after(150, self.animate_hero)
             return
             
         self.current_frame_index = getattr(self, 'current_frame_index', 0)
@@ -367,8 +611,6 @@ class MissionFrame(tk.Frame):
         if self.current_frame_index >= len(frames_to_play):
             self.current_frame_index = 0
             if getattr(self, 'animation_state', 'idle') == 'action': self.animation_state = 'idle'
-            
-        self.after(150, self.animate_hero)
         
     def trigger_hero_action(self):
         self.animation_state = 'action'
@@ -395,7 +637,7 @@ class MissionCompleteFrame(tk.Frame):
         tk.Button(self, text="Voltar ao Menu", font=('Nunito', 16, 'bold'), command=lambda: controller.show_frame(LevelSelectionFrame)).pack(pady=50)
         
     def load_ui_image(self, path, size):
-        try: return ImageTk.PhotoImage(Image.open(os.path.join(BASE_DIR, path)).resize(size, Image.Resampling.LANCZOS))
+        try: return ImageTk.PhotoImage(ASSETS.image(os.path.join(BASE_DIR, path), size))
         except: return None
         
     def set_results(self, data):
@@ -405,5 +647,25 @@ class MissionCompleteFrame(tk.Frame):
             else: self.result_star_labels[i].config(image=self.star_empty_img)
 
 if __name__ == "__main__":
-    app = PoseApp()
+    parser = argparse.ArgumentParser(description="Missões do Herói IA")
+    parser.add_argument('--backend', choices=INFERENCE_BACKENDS, default='local',
+                        help="onde rodar pose + classificador: 'local' (mesmo processo) ou 'processo' (processo separado)")
+    parser.add_argument('--gating', action='store_true',
+                        help="roda a inferência completa só a cada N frames ou quando há movimento (ver EXERCISES[...]['gating'])")
+    parser.add_argument('--janela', type=int, default=1,
+                        help="frames da janela de suavização temporal (landmarks do modelo e probabilidades da contagem); 1 desliga")
+    parser.add_argument('--rastrear', action='store_true',
+                        help="mede cada estágio do frame, mostra FPS/latência sobre o vídeo e salva o trace em rastros/")
+    parser.add_argument('--fonte', default='0',
+                        help="índice da webcam, vídeo, pasta de imagens ou 'sintetico' (padrão: webcam 0)")
+    parser.add_argument('--gravar', nargs='?', type=float, const=DEFAULT_RECORD_FPS, default=None, metavar='FPS',
+                        help=f"grava landmarks, probabilidades e eventos de cada missão em gravacoes/ a até "
+                             f"{DEFAULT_RECORD_FPS:g} fps (~5 MB/h), mais os frames com evento; 0 grava todos "
+                             f"os frames (~31 MB/h a 30 fps)")
+    parser.add_argument('--fps-alvo', type=float, default=0,
+                        help="ajusta complexidade e resolução da pose para manter esse FPS (backend local); 0 desliga")
+    args = parser.parse_args()
+    app = PoseApp(inference_backend=args.backend, gating=args.gating, smoothing_window=args.janela,
+                  trace=args.rastrear, timer=StartupTimer(STARTED), source=args.fonte,
+                  target_fps=args.fps_alvo or None, record_fps=args.gravar)
     app.mainloop()
\ No newline at end of file
@@ -0,0 +1,81 @@
+import numpy as np
+import pytest
+
+from utils.base_dados import FEATURE_COLUMNS, Dataset, DatasetWriter, import_csv, load_many
+from utils.landmarks import NUM_LANDMARKS
+
+
+def samples(n, seed=0):
+    return np.random.default_rng(seed).random((n, NUM_LANDMARKS, 4), dtype=np.float32)
+
+
+def test_append_and_extend_round_trip(tmp_path):
+    path = str(tmp_path / 'conjunto')
+    landmarks = samples(150)
+    labels = np.array(['up', 'down', 'middle'] * 50)
+    with DatasetWriter(path, chunk_rows=16) as writer:
+        writer.append(landmarks[0], labels[0], 'camera', 7)
+        writer.extend(landmarks[1:], labels[1:], 'video.mp4', np.arange(1, 150))
+    dataset = Dataset(path)
+    assert len(dataset) == 150
+    np.testing.assert_array_equal(dataset.landmarks, landmarks)
+    np.testing.assert_array_equal(dataset.labels, labels)
+    assert dataset.source_names[0] == 'camera' and set(dataset.source_names[1:]) == {'video.mp4'}
+    assert dataset.frames[0] == 7 and dataset.frames[-1] == 149
+    assert dataset.class_counts() == {'up': 50, 'down': 50, 'middle': 50}
+
+
+def test_reopen_appends_with_same_vocabulary(tmp_path):
+    path = str(tmp_path / 'conjunto')
+    with DatasetWriter(path) as writer:
+        writer.extend(samples(3), ['up', 'down', 'up'], 'a')
+    with DatasetWriter(path) as writer:
+        writer.extend(samples(2, 1), ['down', 'middle'], 'b')
+    dataset = Dataset(path)
+    # Classes já conhecidas mantêm o código; só 'middle' entra no vocabulário
+    assert dataset.meta['classes'] == ['down', 'up', 'middle']
+    assert dataset.labels.tolist() == ['up', 'down', 'up', 'down', 'middle']
+    features, labels = load_many([path, path])
+    assert features.shape == (10, NUM_LANDMARKS * 4) and len(labels) == 10
+
+
+def test_import_csv_matches_to_frame(tmp_path):
+    pd = pytest.importorskip('pandas')
+    landmarks = samples(20)
+    df = pd.DataFrame(landmarks.reshape(20, -1), columns=FEATURE_COLUMNS)
+    df.insert(0, 'class', ['up', 'down'] * 10)
+    csv_path = tmp_path / 'coleta.csv'
+    df.to_csv(csv_path, index=False)
+    path = str(tmp_path / 'conjunto')
+    assert import_csv(str(csv_path), path) == 20
+    frame = Dataset(path).to_frame()
+    assert list(frame.columns) == ['class'] + FEATURE_COLUMNS
+    assert frame['class'].tolist() == df['class'].tolist()
+    np.testing.assert_allclose(frame[FEATURE_COLUMNS].to_numpy(), landmarks.reshape(20, -1), rtol=1e-6)
+    assert Dataset(path).meta['importados'] == ['coleta.csv']
+    # Importar de novo não duplica as amostras, a menos que seja forçado
+    assert import_csv(str(csv_path), path) is None
+    assert len(Dataset(path).labels) == 20
+    assert import_csv(str(csv_path), path, force=True) == 20
+    assert len(Dataset(path).labels) == 40
+
+
+def test_window_features_match_the_game_stream(tmp_path):
+    from utils.features_temporais import StreamingFeatureEngine
+    path = str(tmp_path / 'conjunto')
+    landmarks = samples(12)
+    with DatasetWriter(path) as writer:
+        writer.extend(landmarks[:6], ['up'] * 6, 'a.mp4', [0, 1, 2, 3, 7, 8])  # lacuna entre 3 e 7
+        writer.extend(landmarks[6:9], ['up'] * 3, 'b.mp4', [4, 5, 6])          # outra fonte
+        writer.extend(landmarks[9:], ['up'] * 3, 'c.csv')                     # frames desconhecidos
+    dataset = Dataset(path)
+    assert dataset.stream_resets().tolist() == [1, 0, 0, 0, 1, 0, 1, 0, 0, 1, 1, 1]
+    np.testing.assert_array_equal(dataset.window_features(1), dataset.features)
+    smoothed = dataset.window_features(3)
+    engine = StreamingFeatureEngine(NUM_LANDMARKS * 4, 3, features=('mean',))
+    for i, reset in enumerate(dataset.stream_resets()):
+        if reset:
+            engine.reset()
+        np.testing.assert_allclose(smoothed[i], engine.update(dataset.features[i]).mean, rtol=1e-6)
+    features, _ = load_many([path], window=3)
+    np.testing.assert_array_equal(features, smoothed)
@@ -0,0 +1,126 @@
+import os
+import shutil
+
+import numpy as np
+import pytest
+
+from utils import extracao
+from utils.cache_extracao import ExtractionCache
+from utils.extracao import POSE_KWARGS, SEGMENT_FRAMES, FullPassRecorder, cached_landmarks, save_extraction
+from utils.landmarks import NUM_LANDMARKS
+
+
+@pytest.fixture
+def video(tmp_path):
+    path = tmp_path / 'video.mp4'
+    path.write_bytes(os.urandom(4096))
+    return str(path)
+
+
+@pytest.fixture
+def cache(tmp_path):
+    return ExtractionCache(str(tmp_path / 'cache'))
+
+
+def extraction(tmp_path, frames=10, name='extracao'):
+    landmarks = np.random.default_rng(frames).random((frames, NUM_LANDMARKS, 4), dtype=np.float32)
+    landmarks[3] = np.nan
+    path = str(tmp_path / name)
+    save_extraction(path, np.arange(frames, dtype=np.int32), np.arange(frames) / 30.0, landmarks, {})
+    return path, landmarks
+
+
+def test_key_depends_on_content_settings_and_segments(tmp_path, cache, video):
+    key = cache.key(video, POSE_KWARGS, SEGMENT_FRAMES)
+    # Padrões do MediaPipe explícitos ou não: mesma chave
+    assert cache.key(video, dict(POSE_KWARGS, smooth_landmarks=True), SEGMENT_FRAMES) == key
+    assert cache.key(video, dict(POSE_KWARGS, model_complexity=0), SEGMENT_FRAMES) != key
+    assert cache.key(video, POSE_KWARGS, SEGMENT_FRAMES // 2) != key
+    assert cache.key(video, POSE_KWARGS, None) != key
+    # Cópia renomeada: mesmo conteúdo, mesma chave; conteúdo alterado: outra
+    copy = str(tmp_path / 'copia.mp4')
+    shutil.copy(video, copy)
+    assert cache.key(copy, POSE_KWARGS, SEGMENT_FRAMES) == key
+    with open(video, 'ab') as f:
+        f.write(b'x')
+    assert cache.key(video, POSE_KWARGS, SEGMENT_FRAMES) != key
+
+
+def test_unknown_pose_setting_is_rejected(cache, video):
+    with pytest.raises(ValueError):
+        cache.key(video, dict(POSE_KWARGS, complexidade=1), SEGMENT_FRAMES)
+
+
+def test_put_get_only_for_same_segments(tmp_path, cache, video):
+    path, landmarks = extraction(tmp_path)
+    assert cache.put(video, POSE_KWARGS, SEGMENT_FRAMES, path)
+    np.testing.assert_array_equal(cache.landmarks(video, POSE_KWARGS, SEGMENT_FRAMES), landmarks)
+    assert cache.get(video, POSE_KWARGS, 100) is None
+    assert cache.get(video, POSE_KWARGS, None) is None
+
+
+def test_corrupted_entry_is_discarded(tmp_path, cache, video):
+    path, _ = extraction(tmp_path)
+    entry = cache.put(video, POSE_KWARGS, SEGMENT_FRAMES, path)
+    with open(os.path.join(entry, 'landmarks.bin'), 'r+b') as f:
+        f.write(b'\xff' * 8)
+    assert cache.get(video, POSE_KWARGS, SEGMENT_FRAMES) is None
+    assert not os.path.exists(entry)
+
+
+def test_eviction_keeps_newest(tmp_path, video):
+    path, _ = extraction(tmp_path)
+    size = sum(os.path.getsize(os.path.join(path, f)) for f in os.listdir(path))
+    cache = ExtractionCache(str(tmp_path / 'cache'), max_bytes=int(size * 1.5))
+    first = cache.put(video, POSE_KWARGS, SEGMENT_FRAMES, path)
+    os.utime(os.path.join(first, 'meta.json'), (1, 1))
+    second = cache.put(video, POSE_KWARGS, None, path)
+    assert [p for _, _, p in cache.entries()] == [second]
+
+
+def test_full_pass_is_cached_and_preferred(tmp_path, cache, video):
+    path, segmented = extraction(tmp_path, frames=5)
+    cache.put(video, POSE_KWARGS, SEGMENT_FRAMES, path)
+    np.testing.assert_array_equal(cached_landmarks(cache, video), segmented)
+
+    recorder = FullPassRecorder(video)
+    buffer = np.zeros((NUM_LANDMARKS, 4), dtype=np.float32)
+    for frame_index in (0, 0, 1, 2, 2, 3, 4):  # frames repetidos: coleta pausada
+        buffer[:] = frame_index
+        recorder.add(frame_index, frame_index / 30.0, None if frame_index == 2 else buffer)
+    assert recorder.save(cache, fps=30.0)
+    landmarks = cached_landmarks(cache, video)
+    assert landmarks.shape == (5, NUM_LANDMARKS, 4)
+    assert np.isnan(landmarks[2]).all()
+    np.testing.assert_array_equal(landmarks[[0, 1, 3, 4], 0, 0], [0, 1, 3, 4])
+    # A extração em segmentos continua separada
+    np.testing.assert_array_equal(cache.landmarks(video, POSE_KWARGS, SEGMENT_FRAMES), segmented)
+
+
+class FakePose:
+    calls = 0
+
+    def process(self, image):
+        FakePose.calls += 1
+        return None
+
+    def reset(self):
+        pass
+
+
+def test_extract_videos_misses_cache_for_other_segment_size(tmp_path, cache, monkeypatch):
+    cv2 = pytest.importorskip('cv2')
+    video = str(tmp_path / 'video.avi')
+    writer = cv2.VideoWriter(video, cv2.VideoWriter_fourcc(*'MJPG'), 30, (32, 24))
+    for i in range(12):
+        writer.write(np.full((24, 32, 3), i * 10, dtype=np.uint8))
+    writer.release()
+    monkeypatch.setattr(extracao, '_make_pose', lambda kwargs: FakePose())
+    logs = []
+    run = lambda segment_frames: extracao.extract_videos([video], str(tmp_path / 'saida'), workers=1,
+                                                         segment_frames=segment_frames, cache=cache,
+                                                         log=logs.append)
+    assert run(5)[video]['frames'] == 12
+    assert run(5)[video]['frames'] == 12 and logs[-1].endswith('[cache]')
+    assert run(4)[video]['frames'] == 12 and not logs[-1].endswith('[cache]')
+    assert len(cache.entries()) == 2
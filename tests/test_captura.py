@@ -0,0 +1,31 @@
+import numpy as np
+import pytest
+
+cv2 = pytest.importorskip('cv2')
+
+from utils.captura import VideoFileSource
+
+
+@pytest.fixture
+def video(tmp_path):
+    path = str(tmp_path / 'video.avi')
+    writer = cv2.VideoWriter(path, cv2.VideoWriter_fourcc(*'MJPG'), 10.0, (32, 24))
+    for i in range(5):
+        writer.write(np.full((24, 32, 3), i * 40, dtype=np.uint8))
+    writer.release()
+    return path
+
+
+def test_video_source_reports_position_of_the_file(video):
+    source = VideoFileSource(video)
+    try:
+        assert source.get(cv2.CAP_PROP_FPS) == 10.0
+        assert (source.get(cv2.CAP_PROP_FRAME_WIDTH), source.get(cv2.CAP_PROP_FRAME_HEIGHT)) == (32, 24)
+        assert source.get(cv2.CAP_PROP_FRAME_COUNT) == 5
+        positions = []
+        while source.read()[0]:
+            positions.append(source.get(cv2.CAP_PROP_POS_MSEC))
+        assert len(positions) == 5
+        np.testing.assert_allclose(positions, [0, 100, 200, 300, 400], atol=1)
+    finally:
+        source.release()
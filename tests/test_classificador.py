@@ -0,0 +1,59 @@
+import numpy as np
+import pytest
+
+from utils.classificador_rapido import compile_classifier, n_classes, predict_proba_row
+from utils.inferencia import ProbabilityBuffers, classify_landmarks
+from utils.landmarks import NUM_LANDMARKS
+
+
+@pytest.fixture(scope='module', params=[2, 3])
+def model(request):
+    from sklearn.linear_model import LogisticRegression
+    from sklearn.pipeline import make_pipeline
+    from sklearn.preprocessing import StandardScaler
+    rng = np.random.default_rng(0)
+    X = rng.normal(size=(120, NUM_LANDMARKS * 4))
+    y = np.resize(['up', 'down', 'middle'][:request.param], len(X))
+    return make_pipeline(StandardScaler(), LogisticRegression(max_iter=1000)).fit(X, y)
+
+
+def test_predict_proba_row_writes_into_buffer(model):
+    fast = compile_classifier(model)
+    assert hasattr(fast, 'predict_proba_into')
+    row = np.random.default_rng(1).normal(size=NUM_LANDMARKS * 4)
+    out = np.empty(n_classes(fast))
+    result = predict_proba_row(fast, row, out)
+    assert result is out
+    np.testing.assert_allclose(out, model.predict_proba(row.reshape(1, -1))[0], atol=1e-6)
+
+
+def test_predict_proba_row_sklearn_fallback_fills_buffer(model):
+    row = np.random.default_rng(2).normal(size=NUM_LANDMARKS * 4)
+    out = np.empty(n_classes(model))
+    assert predict_proba_row(model, row, out) is out
+    np.testing.assert_allclose(out, model.predict_proba(row.reshape(1, -1))[0])
+
+
+def test_probability_buffers_rotate_without_allocating():
+    buffers = ProbabilityBuffers(count=3, width=4)
+    views = [buffers.next(2) for _ in range(4)]
+    assert all(v.shape == (2,) for v in views)
+    assert views[3].base is views[0].base
+    assert np.shares_memory(views[0], views[3])
+    assert not np.shares_memory(views[0], views[1])
+    # Mais classes que a largura: os buffers crescem
+    assert buffers.next(6).shape == (6,)
+
+
+def test_classify_landmarks_uses_ring(model):
+    fast = compile_classifier(model)
+    buffers = ProbabilityBuffers(count=2)
+    landmarks = np.random.default_rng(3).normal(size=(NUM_LANDMARKS, 4)).astype(np.float32)
+    first = classify_landmarks(fast, landmarks, out=buffers.next(n_classes(fast)))
+    expected = first.probabilities.copy()
+    second = classify_landmarks(fast, landmarks * 2, out=buffers.next(n_classes(fast)))
+    # O buffer do frame anterior continua intacto enquanto o anel não dá a volta
+    np.testing.assert_array_equal(first.probabilities, expected)
+    assert not np.shares_memory(first.probabilities, second.probabilities)
+    third = classify_landmarks(fast, landmarks, out=buffers.next(n_classes(fast)))
+    assert np.shares_memory(first.probabilities, third.probabilities)
@@ -0,0 +1,78 @@
+import numpy as np
+import pytest
+
+cv2 = pytest.importorskip('cv2')
+
+from utils.base_dados import Dataset
+from utils.cache_extracao import ExtractionCache
+from utils.coleta import CollectionSession
+from utils.extracao import POSE_KWARGS
+from utils.gravacao import read_columns, read_meta
+from utils.landmarks import NUM_LANDMARKS
+
+FRAMES, FPS = 6, 10.0
+
+
+class FakeLandmark:
+    def __init__(self, value):
+        self.x = self.y = self.z = self.visibility = value
+
+
+class FakePose:
+    """Pose cujo landmark é o primeiro pixel do frame (0 = sem pose)."""
+
+    def process(self, image):
+        value = float(image[0, 0, 0])
+        return type('Results', (), {'pose_landmarks': [FakeLandmark(value)] * NUM_LANDMARKS if value else None})()
+
+
+@pytest.fixture
+def video(tmp_path):
+    path = str(tmp_path / 'video.avi')
+    writer = cv2.VideoWriter(path, cv2.VideoWriter_fourcc(*'MJPG'), FPS, (32, 24))
+    for i in range(FRAMES):
+        writer.write(np.full((24, 32, 3), i * 40, dtype=np.uint8))
+    writer.release()
+    return path
+
+
+def session(tmp_path, video):
+    return CollectionSession(video, str(tmp_path / 'dados' / 'coleta'), cache=ExtractionCache(str(tmp_path / 'cache')),
+                             annotation_dir=str(tmp_path / 'rotulos'))
+
+
+def watch(collection, pose=None):
+    """Assiste ao vídeo até o fim como o laço da coleta; devolve os landmarks de cada frame."""
+    seen = []
+    while True:
+        ret, frame = collection.cap.read()
+        if not ret:
+            collection.video_finished = True
+            return seen
+        landmarks = collection.landmarks(pose, cv2.cvtColor(frame, cv2.COLOR_BGR2RGB), len(seen))
+        seen.append(None if landmarks is None else np.array(landmarks))
+
+
+def test_full_pass_is_cached_with_frame_timestamps(tmp_path, video):
+    first = session(tmp_path, video)
+    assert first.cached is None and first.full_pass is not None
+    seen = watch(first, FakePose())
+    assert seen[0] is None and seen[1] is not None
+    first.save_frame('up', seen[1], 1)
+    first.close()
+    assert Dataset(str(tmp_path / 'dados' / 'coleta')).labels.tolist() == ['up']
+
+    entry = first.cache.get(video, POSE_KWARGS, None)
+    columns = read_columns(entry, read_meta(entry)['colunas'])
+    np.testing.assert_allclose(columns['timestamp'], np.arange(FRAMES) / FPS)
+
+    # A próxima coleta do mesmo vídeo lê os landmarks do cache, sem Pose
+    second = session(tmp_path, video)
+    try:
+        assert second.full_pass is None and len(second.cached) == FRAMES
+        cached = watch(second)
+        assert cached[0] is None
+        for frame, expected in zip(cached[1:], seen[1:]):
+            np.testing.assert_allclose(frame, expected)
+    finally:
+        second.close()
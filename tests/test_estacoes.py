@@ -0,0 +1,198 @@
+import threading
+from collections import namedtuple
+
+import pytest
+
+from utils.estacoes import FairFrameScheduler, PosePool
+
+Packet = namedtuple('Packet', ['index', 'slot', 'image'])
+
+
+def test_pending_frame_is_replaced_by_newest():
+    scheduler = FairFrameScheduler()
+    dropped = []
+    queue = scheduler.register('a', on_drop=dropped.append)
+    queue.put(Packet(0, 0, None))
+    queue.put(Packet(1, 1, None))
+    assert dropped == [Packet(0, 0, None)] and queue.dropped == 1
+    assert scheduler.get(timeout=0) == ('a', Packet(1, 1, None))
+    assert scheduler.get(timeout=0) is None
+
+
+def test_fast_station_does_not_starve_slow_one():
+    scheduler = FairFrameScheduler()
+    fast, slow = scheduler.register('rapida'), scheduler.register('lenta')
+    fast.put(Packet(0, 0, None))
+    assert scheduler.get(timeout=0)[0] == 'rapida'
+    # A rápida já tem um frame em processamento: a lenta passa na frente
+    fast.put(Packet(1, 1, None))
+    slow.put(Packet(0, 0, None))
+    assert scheduler.get(timeout=0)[0] == 'lenta'
+    assert scheduler.get(timeout=0)[0] == 'rapida'
+
+
+def test_ties_go_to_least_recently_served():
+    scheduler = FairFrameScheduler()
+    queues = {name: scheduler.register(name) for name in 'abc'}
+    served = []
+    # Depois da primeira rodada, a ordem de chegada dos frames não importa
+    for frame, order in enumerate(('abc', 'cba', 'bca')):
+        for name in order:
+            queues[name].put(Packet(frame, frame, None))
+        for _ in range(3):
+            name, _ = scheduler.get(timeout=0)
+            scheduler.done(name)
+            served.append(name)
+    assert served == list('abc') * 3
+
+
+def test_close_wakes_waiting_worker():
+    scheduler = FairFrameScheduler()
+    result = []
+    worker = threading.Thread(target=lambda: result.append(scheduler.get(timeout=5)))
+    worker.start()
+    scheduler.close()
+    worker.join(1)
+    assert not worker.is_alive() and result == [None]
+
+
+class FakeCapture:
+    def __init__(self):
+        self.started = False
+
+    def start(self):
+        self.started = True
+
+    def stop(self):
+        pass
+
+    def join(self, timeout=None):
+        pass
+
+
+class FakeCap:
+    released = False
+
+    def release(self):
+        self.released = True
+
+
+class FakeResults:
+    def drain(self):
+        return []
+
+
+class FakeStation:
+    def __init__(self, name):
+        self.name = name
+        self.cap = FakeCap()
+        self.capture = FakeCapture()
+        self.results = FakeResults()
+        self.recorder = None
+        self.handled = []
+        self.released = []
+
+    def attach(self, scheduler):
+        return scheduler.register(self.name, on_drop=self.release)
+
+    def release(self, packet):
+        self.released.append(packet)
+
+    def handle(self, packet, landmarks):
+        self.handled.append(packet)
+
+    def report(self):
+        return {}
+
+
+class FakePose:
+    def process(self, image):
+        return type('Results', (), {'pose_landmarks': None})()
+
+    def close(self):
+        pass
+
+
+def failing_factory(failures):
+    lock = threading.Lock()
+    calls = []
+
+    def factory():
+        with lock:
+            calls.append(None)
+            if len(calls) <= failures:
+                raise OSError("modelo do Pose não encontrado")
+        return FakePose()
+    return factory
+
+
+def test_pool_raises_when_every_worker_fails():
+    pool = PosePool(failing_factory(2), workers=2)
+    station = pool.add(FakeStation('a'))
+    with pytest.raises(RuntimeError, match="modelo do Pose não encontrado"):
+        pool.start()
+    assert len(pool.failed) == 2
+    assert not station.capture.started and station.cap.released
+
+
+def test_pool_keeps_running_with_some_workers(capsys):
+    pool = PosePool(failing_factory(1), workers=2)
+    station = pool.add(FakeStation('a'))
+    pool.start()
+    try:
+        assert "1 de 2 workers sem Pose" in capsys.readouterr().out
+        assert station.capture.started and pool.report()['workers_sem_pose'] == 1
+        pool.scheduler.put('a', Packet(0, 0, None))
+        for _ in range(100):
+            if station.handled:
+                break
+            threading.Event().wait(0.01)
+        assert station.handled == [Packet(0, 0, None)]
+    finally:
+        pool.stop()
+
+
+class SharedRegistry:
+    """Registro que, como o ModelRegistry, devolve sempre a mesma instância compilada."""
+
+    def __init__(self, model):
+        self.model = model
+
+    def compiled(self, key):
+        return self.model
+
+
+def test_stations_classify_concurrently_with_their_own_buffers():
+    import numpy as np
+    from rodar_estacoes import build_station
+    from utils.classificador_rapido import FusedLogisticClassifier
+
+    rng = np.random.default_rng(0)
+    shared = FusedLogisticClassifier(rng.normal(size=(1, 8)), rng.normal(size=1), ['down', 'up'], mode='binary')
+    registry = SharedRegistry(shared)
+    stations = [build_station(name, 'estrelas', 'sintetico:64x48', registry, 1) for name in 'ab']
+    try:
+        assert stations[0].model is not shared and stations[0].model is not stations[1].model
+        rows = rng.normal(size=(2, 8)).astype(np.float32)
+        expected = [shared.predict_proba(row.reshape(1, -1))[0] for row in rows]
+        errors = []
+        start = threading.Barrier(2)
+
+        def classify(station, row, want):
+            out = np.empty(2)
+            start.wait()
+            for _ in range(20000):
+                station.model.predict_proba_into(row, out)
+                if not np.allclose(out, want, atol=1e-5):
+                    errors.append(station.name)
+                    return
+
+        threads = [threading.Thread(target=classify, args=args) for args in zip(stations, rows, expected)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        assert errors == []
+    finally:
+        for station in stations:
+            station.cap.release()
@@ -0,0 +1,69 @@
+import numpy as np
+import pytest
+
+from utils.features_temporais import FEATURE_NAMES, StreamingFeatureEngine, batch_feature_matrix, batch_features
+
+
+@pytest.mark.parametrize('window', [1, 2, 5, 7])
+@pytest.mark.parametrize('frames', [3, 50])
+def test_streaming_matches_batch(window, frames):
+    X = np.random.default_rng(window * frames).normal(size=(frames, 6))
+    expected = batch_features(X, window)
+    engine = StreamingFeatureEngine(X.shape[1], window)
+    for i, row in enumerate(X):
+        engine.update(row)
+        for name in FEATURE_NAMES:
+            np.testing.assert_allclose(getattr(engine, name), expected[name][i], atol=1e-12,
+                                       err_msg=f"{name}, frame {i}")
+
+
+def test_vector_matches_batch_matrix():
+    X = np.random.default_rng(0).normal(size=(20, 4))
+    matrix = batch_feature_matrix(X, window=4)
+    engine = StreamingFeatureEngine(4, 4)
+    out = np.empty(16)
+    for i, row in enumerate(X):
+        assert engine.update(row).vector(out) is out
+        np.testing.assert_allclose(out, matrix[i], atol=1e-12)
+
+
+def test_reset_starts_a_new_window():
+    X = np.random.default_rng(1).normal(size=(30, 3))
+    engine = StreamingFeatureEngine(3, 5)
+    for row in X[:13]:
+        engine.update(row)
+    engine.reset()
+    expected = batch_features(X[13:], 5)
+    for i, row in enumerate(X[13:]):
+        engine.update(row)
+        for name in FEATURE_NAMES:
+            np.testing.assert_allclose(getattr(engine, name), expected[name][i], atol=1e-12)
+
+
+def test_batch_resets_match_streaming_resets():
+    X = np.random.default_rng(2).normal(size=(40, 5))
+    reset = np.zeros(40, dtype=bool)
+    reset[[7, 8, 25]] = True
+    expected = batch_features(X, 4, reset)
+    engine = StreamingFeatureEngine(5, 4)
+    for i, row in enumerate(X):
+        if reset[i]:
+            engine.reset()
+        engine.update(row)
+        for name in FEATURE_NAMES:
+            np.testing.assert_allclose(getattr(engine, name), expected[name][i], atol=1e-12,
+                                       err_msg=f"{name}, frame {i}")
+
+
+def test_mean_only_engine_skips_other_features():
+    X = np.random.default_rng(3).normal(size=(12, 3))
+    engine = StreamingFeatureEngine(3, 5, features=('mean',))
+    assert engine.velocity is None and engine.minimum is None
+    means = batch_features(X, 5, features=('mean',))
+    assert list(means) == ['mean']
+    for i, row in enumerate(X):
+        np.testing.assert_allclose(engine.update(row).mean, means['mean'][i], atol=1e-12)
+    with pytest.raises(ValueError):
+        engine.vector()
+    with pytest.raises(ValueError):
+        StreamingFeatureEngine(3, 5, features=('media',))
@@ -0,0 +1,38 @@
+import os
+
+import pytest
+
+import gerar_audio
+from gerar_audio import ToneBackend, build
+
+TEXTS = {'start': "Missão iniciada!", 'success': "Repetição concluída! Ótimo!"}
+
+
+def test_rebuild_is_up_to_date(tmp_path, capsys):
+    built, current, failed = build(str(tmp_path), ToneBackend(), TEXTS, workers=1)
+    assert sorted(built) == sorted(TEXTS) and current == 0 and not failed
+    assert sorted(os.listdir(tmp_path)) == ['manifesto_audio.json', 'start.wav', 'success.wav']
+
+    built, current, failed = build(str(tmp_path), ToneBackend(), TEXTS, workers=1)
+    assert built == [] and current == len(TEXTS) and not failed
+    assert "Em dia: start" in capsys.readouterr().out
+
+    # Só o texto alterado é refeito
+    built, current, _ = build(str(tmp_path), ToneBackend(), dict(TEXTS, start="Outro texto"), workers=1)
+    assert built == ['start'] and current == 1
+
+
+def test_tone_backend_defaults_outside_game_audio(tmp_path, monkeypatch):
+    assert not gerar_audio.is_game_audio_dir(ToneBackend.output_dir)
+    monkeypatch.setattr(ToneBackend, 'output_dir', str(tmp_path / 'tom'))
+    built, _, _ = build(backend=ToneBackend(), texts=TEXTS, workers=1)
+    assert sorted(built) == sorted(TEXTS)
+    assert os.path.exists(tmp_path / 'tom' / 'start.wav')
+
+
+def test_tone_backend_refuses_game_audio(tmp_path, monkeypatch):
+    game = tmp_path / 'assets' / 'audio'
+    monkeypatch.setattr(gerar_audio, 'GAME_AUDIO_DIR', str(game))
+    with pytest.raises(ValueError):
+        build(str(game), ToneBackend(), TEXTS, workers=1)
+    assert not game.exists()
@@ -0,0 +1,44 @@
+import numpy as np
+
+from utils.contador import REP
+from utils.contador import MissionEvent
+from utils.gravacao import DEFAULT_RECORD_FPS, EVENT_CODES, SessionRecorder, load_recording
+from utils.inferencia import PoseOutput
+from utils.landmarks import NUM_LANDMARKS
+
+
+def pose(value):
+    return PoseOutput(np.full((NUM_LANDMARKS, 4), value, dtype=np.float32), np.array([0.25, 0.75]))
+
+
+def test_recording_round_trip_keeps_event_frames_at_the_default_fps(tmp_path):
+    path = str(tmp_path / 'missao')
+    recorder = SessionRecorder(path, ['down', 'up'], exercises=['estrelas'], max_fps=DEFAULT_RECORD_FPS,
+                               chunk_rows=4, metadata={'exercicio': 'estrelas'})
+    rep = MissionEvent(REP, 'up', 0.9, 'up', 'down', 1, 'estrelas')
+    # 2 s a 30 fps; um frame sem pose e uma repetição fora do ritmo de 5 fps
+    for i in range(60):
+        t = 100.0 + i / 30
+        output = PoseOutput(None, None) if i == 6 else pose(i / 64)
+        recorder.record(t, output, event=rep if i == 31 else None, reps=1 if i > 31 else 0)
+    recorder.close()
+
+    data = load_recording(path)
+    assert data['meta']['frames'] == recorder.recorded == len(data['timestamp'])
+    # 5 fps em 2 s mais o frame do evento, que nunca é pulado
+    assert recorder.recorded == 2 * int(DEFAULT_RECORD_FPS) + 1
+    assert recorder.skipped == 60 - recorder.recorded and recorder.dropped == 0
+    assert data['timestamp'][0] == 0 and np.all(np.diff(data['timestamp']) > 0)
+
+    events = np.flatnonzero(data['event'])
+    assert len(events) == 1
+    row = events[0]
+    np.testing.assert_allclose(data['timestamp'][row], 31 / 30)
+    assert data['event'][row] == EVENT_CODES[REP] and data['reps'][row] == 1
+    assert data['meta']['exercicios'][data['exercise'][row]] == 'estrelas'
+    np.testing.assert_allclose(data['landmarks'][row], 31 / 64, atol=1e-3)
+    np.testing.assert_allclose(data['probabilities'][row], [0.25, 0.75])
+    assert data['landmarks'].dtype == np.float16 and data['landmarks'].shape[1:] == (NUM_LANDMARKS, 4)
+    assert data['meta']['exercicio'] == 'estrelas' and data['meta']['classes'] == ['down', 'up']
+    # O frame sem pose (o segundo gravado) vira NaN
+    assert np.isnan(data['landmarks'][1]).all() and np.isnan(data['probabilities'][1]).all()
@@ -0,0 +1,152 @@
+import queue
+
+import numpy as np
+import pytest
+
+from utils.inferencia import RESULT_DTYPE, PoseOutput, ProcessPoseBackend, _process_frame
+from utils.landmarks import NUM_LANDMARKS
+
+SHAPE = (4, 4, 3)
+
+
+class FakeLandmark:
+    def __init__(self, value):
+        self.x = self.y = self.z = self.visibility = value
+
+
+class FakePose:
+    """Pose cujo landmark é o valor do primeiro pixel do frame (0 = sem pose)."""
+
+    def process(self, image):
+        value = float(image[0, 0, 0])
+        if not value:
+            return type('Results', (), {'pose_landmarks': None})()
+        return [FakeLandmark(value)] * NUM_LANDMARKS
+
+
+class FakeModel:
+    classes_ = np.array(['a', 'b'])
+
+    def predict_proba(self, X):
+        return np.array([[0.25, 0.75]])
+
+
+class FakeProcess:
+    def is_alive(self):
+        return True
+
+
+class FakeWorker:
+    """Fila de pedidos que responde como o processo filho, opcionalmente atrasando frames."""
+
+    def __init__(self, backend, model=FakeModel()):
+        self.backend = backend
+        self.model = model
+        self.delayed = set()
+        self.late = []
+        self.slots = []
+
+    def put(self, msg):
+        _, slot, frame_id = msg
+        self.slots.append(slot)
+        try:
+            _process_frame(FakePose(), self.model, None, self.backend._frames, self.backend._records, slot, frame_id)
+            reply = ('done', slot, frame_id)
+        except Exception as e:
+            reply = ('frame_error', slot, frame_id, str(e))
+        if frame_id in self.delayed:
+            self.late.append(reply)
+        else:
+            # A resposta atrasada chega antes da resposta deste frame
+            for late in self.late:
+                self.backend._replies.put(late)
+            self.late = []
+            self.backend._replies.put(reply)
+
+
+def make_backend(slots=2, model=FakeModel()):
+    backend = ProcessPoseBackend.__new__(ProcessPoseBackend)
+    backend.slots = slots
+    backend.classes_ = np.array(['a', 'b'])
+    backend.tracer = None
+    backend.frame_timeout = 0.05
+    backend.stale_replies = 0
+    backend._last_error = None
+    backend._next_slot = 0
+    backend._next_id = 0
+    backend._busy = {}
+    backend._frames = np.zeros((slots,) + SHAPE, dtype=np.uint8)
+    backend._records = np.zeros(slots, dtype=RESULT_DTYPE)
+    backend._replies = queue.Queue()
+    backend._process = FakeProcess()
+    backend._requests = FakeWorker(backend, model)
+    return backend
+
+
+def frame(value):
+    return np.full(SHAPE, value, dtype=np.uint8)
+
+
+def test_infer_returns_the_frame_landmarks():
+    backend = make_backend()
+    output = backend.infer(frame(3))
+    assert output.landmarks[0, 0] == 3
+    np.testing.assert_allclose(output.probabilities, [0.25, 0.75])
+    assert backend.infer(frame(0)) == PoseOutput(None, None)
+
+
+def test_late_reply_after_timeout_is_discarded():
+    backend = make_backend()
+    backend._requests.delayed.add(0)
+    with pytest.raises(TimeoutError, match="frame 0"):
+        backend.infer(frame(7))
+    # O 'done' do frame 0 chega agora, antes do frame 1: não pode ser confundido com ele
+    output = backend.infer(frame(9))
+    assert output.landmarks[0, 0] == 9
+    assert backend.stale_replies == 1
+    assert backend.infer(frame(11)).landmarks[0, 0] == 11
+
+
+def test_frame_error_returns_empty_output_and_is_reported_once(capsys):
+    backend = make_backend(model=None)
+    assert backend.infer(frame(5)) == PoseOutput(None, None)
+    assert backend.infer(frame(6)) == PoseOutput(None, None)
+    assert capsys.readouterr().out.count("nenhum modelo carregado") == 1
+
+
+def test_dead_worker_raises_instead_of_waiting_forever():
+    backend = make_backend()
+    backend._process = type('Dead', (), {'is_alive': lambda self: False})()
+    backend._requests = type('Sink', (), {'put': lambda self, msg: None})()
+    with pytest.raises(RuntimeError):
+        backend.infer(frame(1))
+
+
+def test_set_model_skips_stale_frame_replies():
+    backend = make_backend()
+    backend._replies.put(('done', 0, 41))
+    backend._replies.put(('classes', ['x', 'y', 'z']))
+    backend._requests = type('Sink', (), {'put': lambda self, msg: None})()
+    backend.set_model(None, 'modelo.pkl')
+    assert list(backend.classes_) == ['x', 'y', 'z']
+    assert backend.stale_replies == 1
+
+
+def test_timed_out_slot_is_not_reused_before_its_reply():
+    backend = make_backend(slots=2)
+    worker = backend._requests
+    worker.delayed.update({0, 1})
+    for value in (7, 8):
+        with pytest.raises(TimeoutError):
+            backend.infer(frame(value))
+    assert worker.slots == [0, 1]
+    # Os dois slots ainda com o filho: sem resposta, o próximo frame não sobrescreve nenhum
+    with pytest.raises(TimeoutError, match="nenhum slot livre"):
+        backend.infer(frame(9))
+    assert worker.slots == [0, 1]
+    # Chega a resposta atrasada do frame 1: o slot 1 é liberado e reaproveitado
+    backend._replies.put(worker.late.pop())
+    assert backend.infer(frame(9)).landmarks[0, 0] == 9
+    assert worker.slots == [0, 1, 1]
+    # A resposta do frame 0 chegou junto e também liberou o slot 0
+    assert backend._busy == {}
@@ -0,0 +1,34 @@
+import time
+
+import numpy as np
+import pytest
+
+from utils.pipeline import CaptureThread, FramePool, LatestQueue, StageStats
+
+
+class FakeCap:
+    def __init__(self, frames):
+        self.frames = frames
+
+    def read(self, out=None):
+        if not self.frames:
+            return False, None
+        self.frames -= 1
+        return True, np.zeros((24, 32, 3), dtype=np.uint8)
+
+
+def test_frames_lost_to_a_full_pool_are_counted():
+    pytest.importorskip('cv2')
+    stats = StageStats()
+    pool = FramePool((24, 32, 3), count=2)
+    queue = LatestQueue(maxsize=4)
+    capture = CaptureThread(FakeCap(10), queue, stats, pool, size=(32, 24))
+    capture.start()
+    deadline = time.perf_counter() + 2
+    while capture.cap.frames and time.perf_counter() < deadline:
+        time.sleep(0.01)
+    capture.stop()
+    capture.join(1)
+    # Ninguém devolveu os buffers: só 2 frames entram, os outros 8 são descartados
+    assert stats.snapshot()['captura'] == (2, 8)
+    assert capture.pool_dropped == 8 and len(queue.drain()) == 2
@@ -0,0 +1,72 @@
+from utils.qualidade import QualityController
+
+SLOW, FAST = 0.05, 0.01  # orçamento de 30 fps: 33 ms; folga abaixo de 20 ms
+LEVELS = ((1, (640, 480)), (0, (640, 480)))
+
+
+def controller(**kwargs):
+    options = dict(levels=LEVELS, start=0, window=3, cooldown=1.0, retry_after=30.0, log=None)
+    options.update(kwargs)
+    return QualityController(**options)
+
+
+def feed(control, latency, now, frames=3):
+    """Observa `frames` latências iguais a partir de `now`; devolve a última decisão."""
+    decision = None
+    for i in range(frames):
+        decision = control.observe(latency, now + i * 0.01) or decision
+    return decision
+
+
+def test_waits_for_a_full_window_before_moving_down():
+    control = controller()
+    assert feed(control, SLOW, 0.0, frames=2) is None and control.level == 0
+    decision = feed(control, SLOW, 0.1, frames=1)
+    assert (decision.previous, decision.level, decision.reason) == (0, 1, "acima do orçamento")
+
+
+def test_cooldown_holds_the_new_level():
+    control = controller(cooldown=5.0)
+    feed(control, SLOW, 0.0)
+    assert feed(control, SLOW, 1.0) is None and control.level == 1
+
+
+def test_failed_level_is_not_retried_before_retry_after():
+    control = controller()
+    feed(control, SLOW, 0.0)
+    assert feed(control, FAST, 10.0) is None and control.level == 1
+    decision = feed(control, FAST, 30.0)
+    assert (decision.level, decision.reason) == (0, "com folga")
+
+
+def test_no_move_up_without_enough_headroom():
+    control = controller(start=1)
+    assert feed(control, 0.025, 0.0) is None and control.level == 1
+
+
+def test_retry_wait_doubles_while_the_level_keeps_failing():
+    control = controller(max_retry_after=100.0)
+    now, waits = 0.0, []
+    feed(control, SLOW, now)
+    for _ in range(4):
+        blocked_at, wait = control._blocked[0]
+        waits.append(wait)
+        # Tenta de novo assim que a espera permite e o nível estoura em seguida
+        while not feed(control, FAST, now):
+            now += 1.0
+        assert wait <= now + 0.02 - blocked_at < wait + 1.0
+        now += 2.0
+        assert feed(control, SLOW, now).level == 1
+    assert waits == [30.0, 60.0, 100.0, 100.0]
+
+
+def test_level_that_held_resets_the_backoff():
+    control = controller()
+    feed(control, SLOW, 0.0)
+    feed(control, FAST, 30.0)
+    feed(control, SLOW, 32.0)
+    assert control._blocked[0][1] == 60.0
+    feed(control, FAST, 93.0)
+    # Sustentou o nível por mais que retry_after: a próxima espera volta ao valor base
+    feed(control, SLOW, 200.0)
+    assert control._blocked[0] == (200.02, 30.0)
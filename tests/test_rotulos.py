@@ -0,0 +1,127 @@
+import gc
+import os
+
+import numpy as np
+import pytest
+
+from utils import base_dados
+from utils.base_dados import Dataset, DatasetWriter, remove_source, source_name
+from utils.extracao import save_extraction
+from utils.landmarks import NUM_LANDMARKS
+from utils.rotulos import (NO_LABEL, Interval, RangeEditor, label_frames, label_video, load_intervals,
+                           parse_intervals, save_intervals)
+
+
+def test_parse_intervals_formats():
+    intervals = parse_intervals(["# inicio fim classe", "0:03-0:05 up", "0:05.5 0:07 middle  # comentário",
+                                 "12.0,14.25,down", ""])
+    assert intervals == [Interval(3.0, 5.0, 'up'), Interval(5.5, 7.0, 'middle'), Interval(12.0, 14.25, 'down')]
+    with pytest.raises(ValueError, match="sobrepostas"):
+        parse_intervals(["0:01-0:04 up", "0:03-0:05 down"])
+    with pytest.raises(ValueError, match=":1:"):
+        parse_intervals(["0:01 up"])
+
+
+def test_save_load_round_trip(tmp_path):
+    path = str(tmp_path / 'rotulos' / 'video.txt')
+    intervals = [Interval(0.5, 1.25, 'up'), Interval(2.0, 3.0, 'down')]
+    save_intervals(path, intervals)
+    assert load_intervals(path) == intervals
+
+
+def test_label_frames_end_is_exclusive():
+    timestamps = np.arange(10) / 2.0  # 0, 0.5, ..., 4.5
+    codes, classes = label_frames(timestamps, [Interval(1.0, 2.0, 'up'), Interval(3.0, 4.0, 'down')])
+    assert classes == ['down', 'up']
+    assert codes.tolist() == [NO_LABEL, NO_LABEL, 1, 1, NO_LABEL, NO_LABEL, 0, 0, NO_LABEL, NO_LABEL]
+
+
+def test_range_editor_marks_and_saves(tmp_path):
+    path = str(tmp_path / 'video.txt')
+    editor = RangeEditor(path, fps=10.0)
+    assert not editor.edit(ord('f'), 5, 'up')  # sem faixa aberta
+    editor.edit(ord('i'), 10, 'up')
+    assert editor.edit(ord('f'), 19, 'up')
+    assert load_intervals(path) == [Interval(0.95, 1.95, 'up')]
+    # Sobreposta: recusada, e a faixa aberta continua valendo
+    editor.edit(ord('i'), 15, 'down')
+    assert not editor.edit(ord('f'), 25, 'down')
+    assert editor.start is not None and "ABERTA" in editor.status()
+    assert editor.edit(ord('z'), 25, 'down')
+    assert load_intervals(path) == [] and RangeEditor(path).intervals == []
+
+
+def test_source_name():
+    assert source_name('../videos/asas.mp4') == 'asas.mp4'
+    assert source_name(os.path.join('imagens', 'coleta', '')) == 'coleta'
+    assert source_name(0) == '0' and source_name('') == ''
+
+
+def samples(n, seed=0):
+    return np.random.default_rng(seed).random((n, NUM_LANDMARKS, 4), dtype=np.float32)
+
+
+def no_open_memmaps(path):
+    gc.collect()
+    return not [o for o in gc.get_objects()
+                if isinstance(o, np.memmap) and str(getattr(o, 'filename', '') or '').startswith(path)]
+
+
+def test_remove_source_releases_memmaps(tmp_path, monkeypatch):
+    path = str(tmp_path / 'conjunto')
+    with DatasetWriter(path) as writer:
+        writer.extend(samples(5), ['up'] * 5, '../videos/a.mp4')
+        writer.extend(samples(3, 1), ['down'] * 3, 'b.mp4')
+    checked = []
+    replace = os.replace
+
+    def checked_replace(src, dst):
+        # No Windows, renomear a pasta com um arquivo mapeado falha
+        if src == path:
+            checked.append(no_open_memmaps(path))
+        replace(src, dst)
+    monkeypatch.setattr(base_dados.os, 'replace', checked_replace)
+    assert remove_source(path, 'videos/a.mp4') == 5
+    assert checked == [True]
+    dataset = Dataset(path)
+    np.testing.assert_array_equal(dataset.landmarks, samples(3, 1))
+    assert dataset.source_names.tolist() == ['b.mp4'] * 3
+    assert remove_source(path, 'a.mp4') == 0 and remove_source(str(tmp_path / 'nada'), 'a.mp4') == 0
+    assert sorted(os.listdir(tmp_path)) == ['conjunto']
+
+
+def test_remove_source_matches_old_full_paths(tmp_path):
+    path = str(tmp_path / 'conjunto')
+    with DatasetWriter(path) as writer:
+        writer.append(samples(1)[0], 'up', 'x.mp4')
+    # Conjunto gravado antes da normalização, com o caminho inteiro
+    dataset = Dataset(path)
+    dataset.meta['fontes'][0] = '../videos/x.mp4'
+    base_dados.write_meta(path, dataset.meta)
+    del dataset
+    assert remove_source(path, 'videos/x.mp4') == 1
+
+
+def test_label_video_replaces_collected_samples(tmp_path):
+    frames = 20
+    landmarks = samples(frames)
+    landmarks[5] = np.nan  # sem pose: fica de fora
+    extraction = str(tmp_path / 'extracao')
+    save_extraction(extraction, np.arange(frames, dtype=np.int32), np.arange(frames) / 10.0, landmarks, {})
+    dataset = str(tmp_path / 'conjunto')
+    # Amostras da coleta interativa, gravadas com o caminho relativo do vídeo
+    with DatasetWriter(dataset) as writer:
+        writer.append(landmarks[0], 'up', '../videos/v.mp4', 0)
+        writer.append(samples(1, 9)[0], 'up', 'outro.mp4', 0)
+
+    intervals = [Interval(0.0, 0.8, 'up'), Interval(1.0, 1.5, 'down')]
+    video = str(tmp_path / 'videos' / 'v.mp4')
+    assert label_video(video, intervals, dataset, extraction) == {'down': 5, 'up': 7}
+    # Rotular de novo não duplica
+    assert label_video(video, intervals, dataset, extraction) == {'down': 5, 'up': 7}
+    data = Dataset(dataset)
+    assert len(data) == 13
+    assert sorted(data.meta['fontes']) == ['outro.mp4', 'v.mp4']
+    mine = data.source_names == 'v.mp4'
+    assert data.frames[mine].tolist() == [0, 1, 2, 3, 4, 6, 7, 10, 11, 12, 13, 14]
+    np.testing.assert_array_equal(data.landmarks[mine], landmarks[data.frames[mine]])
@@ -0,0 +1,33 @@
+import os
+
+import pytest
+
+os.environ.setdefault('SDL_AUDIODRIVER', 'dummy')
+pygame = pytest.importorskip('pygame')
+testar_modelo = pytest.importorskip('testar_modelo')
+
+from gerar_audio import ToneBackend
+
+
+@pytest.fixture(autouse=True)
+def sounds_state(monkeypatch):
+    monkeypatch.setattr(testar_modelo, 'mixer_available', False)
+    monkeypatch.setattr(testar_modelo, 'SOUNDS', {})
+    yield
+    pygame.mixer.quit()
+
+
+def test_mixer_not_available_when_no_sound_loads(tmp_path, monkeypatch):
+    monkeypatch.setattr(testar_modelo, 'sound_path', lambda name: str(tmp_path / f'{name}.wav'))
+    assert testar_modelo.init_sounds() == {}
+    assert not testar_modelo.mixer_available
+    testar_modelo.play_sound('start')  # não toca nada, não falha
+
+
+def test_sounds_that_load_are_kept(tmp_path, monkeypatch):
+    ToneBackend().synthesize("Missão iniciada!", str(tmp_path / 'start'))
+    monkeypatch.setattr(testar_modelo, 'sound_path', lambda name: str(tmp_path / f'{name}.wav'))
+    sounds = testar_modelo.init_sounds()
+    if not pygame.mixer.get_init():
+        pytest.skip("sem dispositivo de áudio")
+    assert list(sounds) == ['start'] and testar_modelo.mixer_available
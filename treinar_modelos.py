@@ -0,0 +1,92 @@
+# arquivo: treinar_modelos.py
+# Retreina os modelos de todos os exercícios do manifesto (modelos/manifesto.json)
+# com um comando só, usando todos os núcleos (ver utils/treino.py):
+# - amostras dos conjuntos em dados/ listados no campo "dados" de cada exercício;
+# - validação cruzada estratificada (StratifiedKFold) de cada combinação de
+#   regularização C e conjunto de features, todas em paralelo;
+# - o melhor (F1 macro) é treinado com todos os dados e salvo no .pkl do
+#   manifesto, no mesmo formato de antes (StandardScaler + LogisticRegression
+#   sobre os 132 valores), então o jogo o recarrega sozinho;
+# - um relatório JSON com as métricas da busca e por classe de cada exercício.
+#
+# Uso:
+#   python treinar_modelos.py
+#   python treinar_modelos.py asas sentar --folds 10 --C 0.1 1 10 --workers 4
+#   python treinar_modelos.py --features todos --sem-salvar
+#   python treinar_modelos.py --janela 5   # para jogar com testar_modelo.py --janela 5
+
+import argparse
+import json
+import os
+import pickle
+import time
+
+from utils.exercicios import EXERCISES, MODELS_DIR
+from utils.treino import DEFAULT_C, DEFAULT_FOLDS, FEATURE_SETS, SEED, train_exercises
+
+REPORT_PATH = os.path.join(MODELS_DIR, 'relatorio_treino.json')
+
+
+def save_model(model, path):
+    """Troca o .pkl de uma vez, para o jogo nunca ler um arquivo pela metade."""
+    tmp = f"{path}.{os.getpid()}.tmp"
+    with open(tmp, 'wb') as f:
+        pickle.dump(model, f)
+    os.replace(tmp, path)
+
+
+def format_report(key, report):
+    best = report['melhor']
+    lines = [f"\n{EXERCISES[key]['name']} ({key}): {report['amostras']} amostras {report['classes']}"]
+    if 'f1_macro' not in best:
+        lines.append(f"  poucas amostras para validação cruzada; treinado com {best['features']}, C={best['C']:g}")
+        return "\n".join(lines)
+    lines.append(f"  melhor: {best['features']} ({best['n_features']} features), C={best['C']:g} | "
+                 f"F1 macro {best['f1_macro']:.3f} ± {best['f1_macro_dp']:.3f} | "
+                 f"acurácia {best['acuracia'] * 100:.1f}% ({report['folds']} folds)")
+    for name in report['classes']:
+        scores = report['por_classe'][name]
+        lines.append(f"    {name:<12} precisão {scores['precision']:.2f}  revocação {scores['recall']:.2f}  "
+                     f"F1 {scores['f1-score']:.2f}")
+    return "\n".join(lines)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Treina os modelos de todos os exercícios do manifesto")
+    parser.add_argument('exercicios', nargs='*', help=f"exercícios a treinar (padrão: todos; {', '.join(EXERCISES)})")
+    parser.add_argument('--folds', type=int, default=DEFAULT_FOLDS, help="folds da validação cruzada")
+    parser.add_argument('--C', type=float, nargs='+', default=list(DEFAULT_C), help="valores de regularização")
+    parser.add_argument('--features', nargs='+', choices=sorted(FEATURE_SETS), default=list(FEATURE_SETS),
+                        help="conjuntos de features avaliados")
+    parser.add_argument('--janela', type=int, default=1, metavar='N',
+                        help="treina com a média dos últimos N frames de cada fonte, a entrada do jogo com --janela N")
+    parser.add_argument('--workers', type=int, default=os.cpu_count(), help="processos (padrão: todos os núcleos)")
+    parser.add_argument('--semente', type=int, default=SEED)
+    parser.add_argument('--relatorio', default=REPORT_PATH, metavar='ARQUIVO', help="relatório JSON das métricas")
+    parser.add_argument('--sem-salvar', action='store_true', help="só avalia; não troca os .pkl")
+    args = parser.parse_args()
+
+    unknown = [key for key in args.exercicios if key not in EXERCISES]
+    if unknown:
+        parser.error(f"exercício desconhecido: {', '.join(unknown)}")
+    exercises = {key: EXERCISES[key] for key in (args.exercicios or EXERCISES)}
+    start = time.perf_counter()
+    models, reports = train_exercises(exercises, args.C, tuple(args.features), args.folds, args.workers, args.semente,
+                                      args.janela)
+    for key, report in reports.items():
+        print(format_report(key, report))
+        if key in models and not args.sem_salvar:
+            save_model(models[key], exercises[key]['model_path'])
+            report['modelo'] = exercises[key]['model']
+            print(f"  modelo salvo em '{exercises[key]['model_path']}'")
+
+    with open(args.relatorio, 'w', encoding='utf-8') as f:
+        json.dump({'data': time.strftime('%Y-%m-%dT%H:%M:%S'), 'folds': args.folds, 'C': args.C,
+                   'features': args.features, 'semente': args.semente, 'janela': args.janela,
+                   'exercicios': reports},
+                  f, ensure_ascii=False, indent=2)
+    print(f"\n{len(reports)} exercício(s) em {time.perf_counter() - start:.1f} s; relatório em '{args.relatorio}'")
+
+
+if __name__ == "__main__":
+    main()
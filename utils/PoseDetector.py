@@ -2,6 +2,8 @@ import cv2
 import mediapipe as mp
 import numpy as np
 
+from utils.landmarks import landmarks_to_array, new_landmark_buffer, pixel_coords
+
 class PoseDetector:
     def __init__(self, mode=False, complexity=1, smooth=True,
                  detection_con=0.5, track_con=0.5):
@@ -12,6 +14,9 @@ class PoseDetector:
                                       min_detection_confidence=detection_con,
                                       min_tracking_confidence=track_con)
         self.mp_draw = mp.solutions.drawing_utils
+        self.landmark_array = new_landmark_buffer()
+        self.landmark_pixels = None
+        self.landmark_list = []
 
     def find_pose(self, img, draw=True):
         img_rgb = cv2.cvtColor(img, cv2.COLOR_BGR2RGB)
@@ -23,21 +28,22 @@ class PoseDetector:
 
     def get_landmark_positions(self, img):
         self.landmark_list = []
-        if self.results.pose_landmarks:
-            for id, lm in enumerate(self.results.pose_landmarks.landmark):
-                h, w, c = img.shape
-                px, py = int(lm.x * w), int(lm.y * h)
-                self.landmark_list.append([id, px, py])
+        self.landmark_pixels = None
+        if landmarks_to_array(self.results, self.landmark_array) is not None:
+            h, w, c = img.shape
+            # Array (33, 2) em pixels; a lista [id, px, py] é mantida para quem já a usa
+            self.landmark_pixels = pixel_coords(self.landmark_array, w, h)
+            self.landmark_list = [[id, px, py] for id, (px, py) in enumerate(self.landmark_pixels.tolist())]
         return self.landmark_list
 
     def calculate_angle(self, p1_idx, p2_idx, p3_idx):
-        if len(self.landmark_list) == 0:
+        if self.landmark_pixels is None:
             return None
         
-        # As coordenadas agora estão em landmark_list[indice][1] e [2]
-        _, x1, y1 = self.landmark_list[p1_idx]
-        _, x2, y2 = self.landmark_list[p2_idx]
-        _, x3, y3 = self.landmark_list[p3_idx]
+        # As coordenadas em pixels estão em landmark_pixels[indice]
+        x1, y1 = self.landmark_pixels[p1_idx]
+        x2, y2 = self.landmark_pixels[p2_idx]
+        x3, y3 = self.landmark_pixels[p3_idx]
 
         radians = np.arctan2(y3 - y2, x3 - x2) - np.arctan2(y1 - y2, x1 - x2)
         angle = np.abs(np.degrees(radians))
@@ -0,0 +1,122 @@
+# utils/agendador.py
+"""Agendador de frames no ritmo da câmera para a thread do Tk.
+
+Substitui os `after(10)` / `after(150)` fixos por um único laço que:
+- usa o FPS real informado pela câmera como período do vídeo;
+- mede o custo de cada tick e agenda o próximo para o instante em que o
+  próximo frame é esperado (descontando o tempo já gasto);
+- avança a animação do herói no mesmo laço, no seu próprio intervalo;
+- acumula FPS alcançado e jitter para relatório.
+"""
+import time
+from collections import deque
+
+import numpy as np
+
+DEFAULT_FPS = 30.0
+
+
+def camera_fps(cap, default=DEFAULT_FPS):
+    """FPS informado pela câmera; muitas webcams devolvem 0 ou valores absurdos."""
+    import cv2
+    try:
+        fps = float(cap.get(cv2.CAP_PROP_FPS))
+    except Exception:
+        fps = 0.0
+    if not 1.0 <= fps <= 120.0:
+        return default
+    return fps
+
+
+class FrameScheduler:
+    """Laço único de temporização (vídeo + sprite) baseado em `widget.after`.
+
+    `on_frame()` deve retornar True quando exibiu um frame novo. Se o frame
+    ainda não chegou, o agendador tenta de novo em uma fração do período em
+    vez de esperar um período inteiro.
+    """
+
+    RETRY_FRACTION = 0.25
+
+    def __init__(self, widget, fps, on_frame, on_sprite=None, sprite_interval=0.15, history=300):
+        self.widget = widget
+        self.fps = fps
+        self.period = 1.0 / fps
+        self.on_frame = on_frame
+        self.on_sprite = on_sprite
+        self.sprite_interval = sprite_interval
+        self._after_id = None
+        self._running = False
+        self._intervals = deque(maxlen=history)
+        self._costs = deque(maxlen=history)
+        self._frames_shown = 0
+        self._ticks = 0
+
+    def start(self):
+        now = time.perf_counter()
+        self._running = True
+        self._started = now
+        self._last_frame = None
+        self._next_sprite = now
+        self._tick()
+
+    def stop(self):
+        self._running = False
+        if self._after_id is not None:
+            self.widget.after_cancel(self._after_id)
+            self._after_id = None
+        self._stopped = time.perf_counter()
+
+    def _tick(self):
+        self._after_id = None
+        if not self._running:
+            return
+        t0 = time.perf_counter()
+        self._ticks += 1
+
+        shown = self.on_frame()
+        if shown:
+            if self._last_frame is not None:
+                self._intervals.append(t0 - self._last_frame)
+            self._last_frame = t0
+            self._frames_shown += 1
+
+        if self.on_sprite and t0 >= self._next_sprite:
+            self.on_sprite()
+            # Se atrasou mais de um intervalo, não tenta "recuperar" quadros
+            self._next_sprite = max(self._next_sprite + self.sprite_interval, t0)
+
+        now = time.perf_counter()
+        self._costs.append(now - t0)
+        if not self._running:
+            return
+
+        if shown:
+            # Próximo frame esperado: um período depois deste, menos o custo do tick
+            deadline = t0 + self.period
+        else:
+            deadline = now + self.period * self.RETRY_FRACTION
+        deadline = min(deadline, self._next_sprite) if self.on_sprite else deadline
+        delay_ms = max(1, int(round((deadline - now) * 1000)))
+        self._after_id = self.widget.after(delay_ms, self._tick)
+
+    def report(self):
+        """Métricas do laço: FPS alcançado, jitter e custo do tick (em ms)."""
+        end = time.perf_counter() if self._running else getattr(self, '_stopped', time.perf_counter())
+        elapsed = max(end - getattr(self, '_started', end), 1e-9)
+        intervals = np.array(self._intervals) * 1000
+        costs = np.array(self._costs) * 1000
+        return {
+            'fps_camera': self.fps,
+            'fps_alcancado': self._frames_shown / elapsed,
+            'jitter_ms': float(np.std(intervals - self.period * 1000)) if len(intervals) else 0.0,
+            'custo_tick_medio_ms': float(costs.mean()) if len(costs) else 0.0,
+            'custo_tick_p95_ms': float(np.percentile(costs, 95)) if len(costs) else 0.0,
+            'ticks': self._ticks,
+        }
+
+    def __str__(self):
+        r = self.report()
+        return (f"FPS câmera {r['fps_camera']:.1f} | alcançado {r['fps_alcancado']:.1f} | "
+                f"jitter {r['jitter_ms']:.1f} ms | tick médio {r['custo_tick_medio_ms']:.1f} ms "
+                f"(p95 {r['custo_tick_p95_ms']:.1f} ms)")
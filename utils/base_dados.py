@@ -0,0 +1,303 @@
+# utils/base_dados.py
+"""Conjunto de dados da coleta em colunas binárias float32, no lugar dos CSVs.
+
+Um conjunto é uma pasta em `dados/` (uma por exercício), no mesmo formato
+das gravações das missões (utils/gravacao.py): um `.bin` por coluna e um
+`meta.json` com os vocabulários.
+
+    landmarks.bin   (33, 4) float32  [x, y, z, visibilidade]
+    class.bin       int16  índice em meta['classes']
+    source.bin      int16  índice em meta['fontes'] (nome do vídeo ou câmera de origem, `source_name`)
+    frame.bin       int32  índice do frame na fonte (-1 = desconhecido, ex.: CSV importado)
+
+- DatasetWriter: `append()` só copia a amostra para um bloco em memória; a
+  thread do ColumnWriter anexa os blocos aos arquivos (nada de reabrir um
+  CSV a cada tecla).
+- Dataset: colunas em `np.memmap`, sem parsing; `features` (N, 132),
+  `labels`, `to_frame()` com as mesmas colunas do CSV antigo (class, x1..v33)
+  para os scripts de treino que usam pandas.
+- `remove_source` tira as amostras de uma fonte (ex.: um vídeo rotulado de
+  novo por faixas, utils/rotulos.py).
+- `import_csv` traz os `coord_videos/*.csv` existentes (uma vez só cada); `load_training_frame`
+  abre o conjunto e, na primeira vez, importa o CSV sozinho.
+"""
+import os
+import shutil
+import time
+
+import numpy as np
+
+from utils.gravacao import ColumnWriter, column_specs, read_columns, read_meta, write_meta, META_NAME
+from utils.landmarks import NUM_LANDMARKS
+
+DATA_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'dados')
+FEATURE_COLUMNS = [f"{c}{i}" for i in range(1, NUM_LANDMARKS + 1) for c in ('x', 'y', 'z', 'v')]
+COLUMNS = {
+    'landmarks': (np.dtype(np.float32), (NUM_LANDMARKS, 4)),
+    'class': (np.dtype(np.int16), ()),
+    'source': (np.dtype(np.int16), ()),
+    'frame': (np.dtype(np.int32), ()),
+}
+CHUNK_ROWS = 64  # amostras em memória antes de ir para o disco
+
+
+def dataset_path(name):
+    """Pasta do conjunto `name` em dados/ (ou o próprio caminho, se já for um)."""
+    return name if os.path.dirname(name) else os.path.join(DATA_DIR, name)
+
+
+def dataset_exists(path):
+    return os.path.exists(os.path.join(path, META_NAME))
+
+
+def source_name(source):
+    """Nome de uma fonte no conjunto: só o nome do arquivo ('../videos/a.mp4' -> 'a.mp4').
+
+    Toda fonte passa por aqui (coleta, rótulos por faixa, `remove_source`), então
+    o mesmo vídeo aberto por caminhos diferentes é sempre a mesma fonte.
+    """
+    source = str(source)
+    return os.path.basename(os.path.normpath(source)) if source else ''
+
+
+def _new_meta():
+    return {'versao': 1, 'colunas': column_specs(COLUMNS), 'classes': [], 'fontes': [], 'importados': []}
+
+
+class DatasetWriter:
+    """Acrescenta amostras a um conjunto (criado se não existir), em blocos."""
+
+    def __init__(self, path, chunk_rows=CHUNK_ROWS):
+        self.path = path
+        os.makedirs(path, exist_ok=True)
+        self.meta = read_meta(path) if dataset_exists(path) else _new_meta()
+        write_meta(path, self.meta)
+        self._codes = {'classes': {c: i for i, c in enumerate(self.meta['classes'])},
+                       'fontes': {s: i for i, s in enumerate(self.meta['fontes'])}}
+        self._writer = ColumnWriter(path, COLUMNS, chunk_rows, name='base-dados')
+        self.appended = 0
+
+    def _code(self, vocabulary, value):
+        codes = self._codes[vocabulary]
+        code = codes.get(value)
+        if code is None:
+            # Vocabulário novo vai para o meta.json antes de qualquer linha que o use
+            code = codes[value] = len(self.meta[vocabulary])
+            self.meta[vocabulary].append(value)
+            write_meta(self.path, self.meta)
+        return code
+
+    def _slot(self):
+        slot = self._writer.row()
+        while slot is None:
+            # Coleta não é tempo real: espera um bloco voltar do disco
+            time.sleep(0.001)
+            slot = self._writer.row()
+        return slot
+
+    def append(self, landmarks, label, source='', frame=-1):
+        """Uma amostra: landmarks (33, 4) ou (132,), classe, fonte e índice do frame."""
+        chunk, row = self._slot()
+        chunk['landmarks'][row] = np.reshape(landmarks, (NUM_LANDMARKS, 4))
+        chunk['class'][row] = self._code('classes', str(label))
+        chunk['source'][row] = self._code('fontes', source_name(source))
+        chunk['frame'][row] = frame
+        self._writer.commit()
+        self.appended += 1
+
+    def extend(self, landmarks, labels, source='', frames=None):
+        """Várias amostras de uma vez (ex.: importação); `landmarks` (N, 33, 4) ou (N, 132).
+
+        Copia fatias inteiras para os blocos, sem laço por amostra.
+        """
+        landmarks = np.asarray(landmarks, dtype=np.float32).reshape(-1, NUM_LANDMARKS, 4)
+        names, inverse = np.unique(np.asarray(labels, dtype=str), return_inverse=True)
+        classes = np.array([self._code('classes', name) for name in names.tolist()], dtype=np.int16)[inverse]
+        source = self._code('fontes', source_name(source))
+        frames = np.full(len(landmarks), -1, dtype=np.int32) if frames is None else np.asarray(frames)
+        done = 0
+        while done < len(landmarks):
+            chunk, row = self._slot()
+            n = min(len(landmarks) - done, self._writer.chunk_rows - row)
+            chunk['landmarks'][row:row + n] = landmarks[done:done + n]
+            chunk['class'][row:row + n] = classes[done:done + n]
+            chunk['source'][row:row + n] = source
+            chunk['frame'][row:row + n] = frames[done:done + n]
+            self._writer.commit(n)
+            done += n
+        self.appended += len(landmarks)
+
+    def flush(self):
+        self._writer.flush()
+
+    def close(self):
+        self._writer.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+class Dataset:
+    """Conjunto aberto por memória mapeada; nada é copiado até alguém pedir."""
+
+    def __init__(self, path):
+        self.path = path
+        self.meta = read_meta(path)
+        columns = read_columns(path, self.meta['colunas'])
+        self.landmarks = columns['landmarks']
+        self.class_codes = columns['class']
+        self.source_codes = columns['source']
+        self.frames = columns['frame']
+        self.classes = np.array(self.meta['classes'], dtype=object)
+        self.sources = np.array(self.meta['fontes'], dtype=object)
+
+    def __len__(self):
+        return len(self.landmarks)
+
+    @property
+    def features(self):
+        """(N, 132) float32, na ordem das colunas x1, y1, z1, v1, ... do CSV."""
+        return self.landmarks.reshape(len(self), -1)
+
+    @property
+    def labels(self):
+        return self.classes[self.class_codes] if len(self.classes) else np.empty(0, dtype=object)
+
+    @property
+    def source_names(self):
+        return self.sources[self.source_codes] if len(self.sources) else np.empty(0, dtype=object)
+
+    def stream_resets(self):
+        """(N,) bool: True onde a amostra não continua a anterior (outra fonte ou frame não consecutivo).
+
+        É onde o motor de suavização do jogo recomeçaria; amostras sem frame
+        conhecido (ex.: CSV importado) ficam sozinhas.
+        """
+        sources = np.asarray(self.source_codes)
+        frames = np.asarray(self.frames)
+        resets = np.ones(len(self), dtype=bool)
+        resets[1:] = (sources[1:] != sources[:-1]) | (frames[1:] != frames[:-1] + 1) | (frames[:-1] < 0)
+        return resets
+
+    def window_features(self, window):
+        """(N, 132) com a média dos últimos `window` frames de cada amostra, como o jogo com `--janela`."""
+        if window <= 1:
+            return self.features
+        from utils.features_temporais import batch_features
+        return batch_features(self.features, window, self.stream_resets(), ('mean',))['mean'].astype(np.float32)
+
+    def class_counts(self):
+        counts = np.bincount(self.class_codes, minlength=len(self.classes))
+        return dict(zip(self.meta['classes'], counts.tolist()))
+
+    def to_frame(self, with_source=False):
+        """DataFrame com as colunas do CSV antigo (class, x1..v33) em float32."""
+        import pandas as pd
+        df = pd.DataFrame(self.features, columns=FEATURE_COLUMNS, copy=False)
+        df.insert(0, 'class', self.labels)
+        if with_source:
+            df['source'] = self.source_names
+            df['frame'] = np.asarray(self.frames)
+        return df
+
+    def __repr__(self):
+        return f"Dataset({self.path!r}, {len(self)} amostras, classes={self.class_counts()})"
+
+
+def open_dataset(path):
+    return Dataset(dataset_path(path))
+
+
+def load_many(paths, window=1):
+    """(features (N, 132) float32, rótulos) de vários conjuntos, com uma única cópia.
+
+    Com `window` > 1, cada amostra vira a média da janela (`Dataset.window_features`).
+    """
+    datasets = [open_dataset(path) for path in paths]
+    features = (np.concatenate([d.window_features(window) for d in datasets]) if datasets
+                else np.empty((0, 4 * NUM_LANDMARKS)))
+    labels = np.concatenate([d.labels for d in datasets]) if datasets else np.empty(0, dtype=object)
+    return features, labels
+
+
+def _copy_without_source(path, tmp, source):
+    """Grava em `tmp` o conjunto sem as amostras da fonte; devolve quantas ficaram de fora.
+
+    Função à parte para que nenhum memmap do conjunto sobreviva à cópia: no
+    Windows, a pasta não pode ser renomeada com um arquivo dela mapeado.
+    """
+    dataset = Dataset(path)
+    # Conjuntos antigos podem ter a fonte gravada com o caminho inteiro
+    codes = [i for i, name in enumerate(dataset.meta['fontes']) if source_name(name) == source]
+    keep = ~np.isin(dataset.source_codes, codes)
+    removed = len(dataset) - int(keep.sum())
+    if removed:
+        os.makedirs(tmp, exist_ok=True)
+        for name, column in (('landmarks', 'landmarks'), ('class', 'class_codes'),
+                             ('source', 'source_codes'), ('frame', 'frames')):
+            np.ascontiguousarray(getattr(dataset, column)[keep]).tofile(os.path.join(tmp, f'{name}.bin'))
+        write_meta(tmp, dataset.meta)
+    return removed
+
+
+def remove_source(path, source):
+    """Apaga do conjunto as amostras de uma fonte (ex.: antes de rotular o vídeo de novo); devolve quantas."""
+    path = dataset_path(path)
+    if not dataset_exists(path):
+        return 0
+    # Reescreve só as linhas mantidas numa pasta temporária e troca de uma vez
+    tmp = f"{path}.{os.getpid()}.tmp"
+    shutil.rmtree(tmp, ignore_errors=True)
+    removed = _copy_without_source(path, tmp, source_name(source))
+    if removed:
+        old = f"{path}.{os.getpid()}.old"
+        os.replace(path, old)
+        os.replace(tmp, path)
+        shutil.rmtree(old, ignore_errors=True)
+    return removed
+
+
+def import_csv(csv_path, path, source=None, force=False):
+    """Acrescenta ao conjunto as linhas de um CSV da coleta antiga (class, x1..v33); devolve quantas.
+
+    Um CSV que já consta em `importados` não é lido de novo (devolve None),
+    para não duplicar as amostras; `force` importa mesmo assim.
+    """
+    name = os.path.basename(csv_path)
+    if not force and dataset_exists(path) and name in read_meta(path)['importados']:
+        return None
+    import pandas as pd
+    df = pd.read_csv(csv_path, usecols=['class'] + FEATURE_COLUMNS, dtype={c: np.float32 for c in FEATURE_COLUMNS})
+    with DatasetWriter(path) as writer:
+        writer.extend(df[FEATURE_COLUMNS].to_numpy(), df['class'].astype(str), source or name)
+        writer.meta['importados'].append(name)
+        write_meta(path, writer.meta)
+    return len(df)
+
+
+def load_training_frame(path, csv_path=None):
+    """DataFrame de treino do conjunto; se ele ainda não existe, importa o CSV antigo primeiro."""
+    path = dataset_path(path)
+    if not dataset_exists(path) and csv_path and os.path.exists(csv_path):
+        n = import_csv(csv_path, path)
+        print(f"{n} amostras de '{csv_path}' importadas para '{path}'")
+    return Dataset(path).to_frame()
+
+
+if __name__ == '__main__':
+    # python -m utils.base_dados coord_videos/*.csv  -> importa cada CSV para dados/<nome>
+    import argparse
+    parser = argparse.ArgumentParser(description="Importa CSVs da coleta para o formato binário em dados/")
+    parser.add_argument('csvs', nargs='+')
+    parser.add_argument('--forcar', action='store_true', help="importa de novo CSVs que já foram importados")
+    args = parser.parse_args()
+    for csv_path in args.csvs:
+        target = dataset_path(os.path.splitext(os.path.basename(csv_path))[0])
+        n = import_csv(csv_path, target, force=args.forcar)
+        if n is None:
+            print(f"{csv_path}: já importado em {target}, ignorado (use --forcar para importar de novo)")
+        else:
+            print(f"{csv_path}: {n} amostras -> {target}")
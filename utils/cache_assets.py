@@ -0,0 +1,74 @@
+# utils/cache_assets.py
+"""Cache de imagens já redimensionadas (sprites do herói e estrelas da interface).
+
+Os PNGs de assets/ são grandes (1024x1024) e eram reduzidos com LANCZOS a
+cada abertura do jogo. O `AssetCache` faz isso uma única vez: as imagens de
+uma animação (ou uma imagem avulsa) são redimensionadas e empacotadas num
+atlas `.npy` (N, altura, largura, canais) uint8. O nome do arquivo leva um
+hash dos caminhos, mtimes e tamanhos das imagens de origem e do tamanho
+final, então qualquer mudança nos PNGs gera um atlas novo e o antigo é
+apagado. Nas aberturas seguintes só há um `np.load`, sem reamostragem.
+"""
+import hashlib
+import os
+
+import numpy as np
+
+
+class AssetCache:
+    """Atlas pré-redimensionados em disco, reconstruídos quando a origem muda."""
+
+    def __init__(self, cache_dir):
+        self.cache_dir = cache_dir
+
+    def _key(self, paths, size):
+        digest = hashlib.sha1(repr(size).encode())
+        for path in paths:
+            st = os.stat(path)
+            digest.update(f"{os.path.abspath(path)}|{st.st_mtime_ns}|{st.st_size}".encode())
+        return digest.hexdigest()[:16]
+
+    def _build(self, paths, size):
+        """Abre e redimensiona as imagens (o trabalho caro que o cache evita)."""
+        from PIL import Image
+        images = [Image.open(path) for path in paths]
+        # Um único modo por atlas: RGBA se alguma imagem tiver transparência
+        mode = 'RGBA' if any('A' in img.getbands() or 'transparency' in img.info for img in images) else 'RGB'
+        return np.stack([np.asarray(img.convert(mode).resize(size, Image.Resampling.LANCZOS))
+                         for img in images])
+
+    def atlas(self, paths, size, name):
+        """Array (N, altura, largura, canais) com as imagens de `paths` no tamanho `size` (largura, altura)."""
+        w, h = size
+        prefix = f"{name}_{w}x{h}_"
+        path = os.path.join(self.cache_dir, f"{prefix}{self._key(paths, size)}.npy")
+        try:
+            return np.load(path)
+        except (OSError, ValueError):
+            pass
+
+        atlas = self._build(paths, size)
+        try:
+            os.makedirs(self.cache_dir, exist_ok=True)
+            # Remove atlas antigos deste mesmo conjunto e tamanho
+            for filename in os.listdir(self.cache_dir):
+                if filename.startswith(prefix):
+                    os.remove(os.path.join(self.cache_dir, filename))
+            tmp = f"{path}.{os.getpid()}.tmp"
+            with open(tmp, 'wb') as f:
+                np.save(f, atlas)
+            os.replace(tmp, path)
+        except OSError as e:
+            # Sem permissão de escrita: o jogo funciona, só não guarda o cache
+            print(f"AVISO: não foi possível gravar o cache de imagens em '{self.cache_dir}': {e}")
+        return atlas
+
+    def images(self, paths, size, name):
+        """Lista de PIL.Image, uma por caminho, vindas do atlas."""
+        from PIL import Image
+        return [Image.fromarray(frame) for frame in self.atlas(paths, size, name)]
+
+    def image(self, path, size):
+        """Uma imagem avulsa redimensionada (ex.: as estrelas da interface)."""
+        name = os.path.splitext(os.path.basename(path))[0]
+        return self.images([path], size, name)[0]
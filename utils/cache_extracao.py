@@ -0,0 +1,222 @@
+# utils/cache_extracao.py
+"""Cache em disco das extrações de landmarks, endereçado pelo conteúdo do vídeo.
+
+Rodar o MediaPipe de novo no mesmo vídeo (outra coleta, um rótulo trocado,
+uma nova extração) dá o mesmo resultado; o `ExtractionCache` guarda cada
+extração (utils/extracao.py) numa pasta cujo nome é a chave:
+
+    sha1(sha256 do conteúdo do vídeo + configurações do Pose normalizadas
+         + tamanho dos segmentos)
+
+As configurações entram já completadas com os padrões do MediaPipe
+(complexidade, confianças, suavização...), então `Pose()` e
+`Pose(model_complexity=1)` caem na mesma entrada, e qualquer mudança gera
+uma entrada nova. O tamanho dos segmentos também muda o resultado, porque
+o rastreamento recomeça no início de cada um; None é uma passada contínua
+pelo vídeo inteiro (ex.: a da coleta interativa). Renomear ou copiar o vídeo não invalida nada; o sha256
+de cada arquivo é memorizado por (caminho, tamanho, mtime) em
+`hashes.json`, para não reler vídeos grandes a cada execução.
+
+- Integridade: o meta.json de cada extração traz o sha1 de cada coluna;
+  uma entrada com arquivo truncado ou alterado é apagada e tratada como
+  ausente.
+- Tamanho: depois de cada `put`, as entradas usadas há mais tempo (pelo
+  mtime do meta.json, atualizado a cada acerto) são apagadas até o cache
+  caber em `max_bytes`.
+"""
+import hashlib
+import json
+import os
+import shutil
+
+from utils.gravacao import META_NAME, read_columns, read_meta
+
+CACHE_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), '.cache_extracao')
+MAX_BYTES = 2 * 1024 ** 3
+HASHES_NAME = 'hashes.json'
+# Padrões do mp.solutions.pose.Pose; a chave usa sempre o conjunto completo
+POSE_DEFAULTS = dict(static_image_mode=False, model_complexity=1, smooth_landmarks=True,
+                     enable_segmentation=False, smooth_segmentation=True,
+                     min_detection_confidence=0.5, min_tracking_confidence=0.5)
+_BLOCK = 1 << 20
+
+
+def file_sha256(path):
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for block in iter(lambda: f.read(_BLOCK), b''):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+def column_checksums(path, columns):
+    """{coluna: sha1 do `<coluna>.bin`}, gravado no meta.json de cada extração."""
+    checksums = {}
+    for name in columns:
+        digest = hashlib.sha1()
+        with open(os.path.join(path, f'{name}.bin'), 'rb') as f:
+            for block in iter(lambda: f.read(_BLOCK), b''):
+                digest.update(block)
+        checksums[name] = digest.hexdigest()
+    return checksums
+
+
+def pose_settings(pose_kwargs):
+    """Configurações do Pose completadas com os padrões, na forma que entra na chave."""
+    unknown = set(pose_kwargs) - set(POSE_DEFAULTS)
+    if unknown:
+        raise ValueError(f"configurações do Pose desconhecidas: {', '.join(sorted(unknown))}")
+    settings = dict(POSE_DEFAULTS, **pose_kwargs)
+    return {k: (float(v) if isinstance(v, float) else v) for k, v in sorted(settings.items())}
+
+
+class ExtractionCache:
+    """Extrações por (conteúdo do vídeo, configurações do Pose), com limite de tamanho."""
+
+    def __init__(self, cache_dir=CACHE_DIR, max_bytes=MAX_BYTES):
+        self.cache_dir = cache_dir
+        self.max_bytes = max_bytes
+        self._hashes = None
+
+    # --- Chaves -----------------------------------------------------------------
+
+    def _load_hashes(self):
+        if self._hashes is None:
+            try:
+                with open(os.path.join(self.cache_dir, HASHES_NAME), encoding='utf-8') as f:
+                    self._hashes = json.load(f)
+            except (OSError, ValueError):
+                self._hashes = {}
+        return self._hashes
+
+    def video_hash(self, video):
+        """sha256 do vídeo, relido só quando o arquivo muda (tamanho ou mtime)."""
+        st = os.stat(video)
+        stamp = f"{st.st_size}|{st.st_mtime_ns}"
+        hashes = self._load_hashes()
+        entry = hashes.get(os.path.abspath(video))
+        if entry and entry['arquivo'] == stamp:
+            return entry['sha256']
+        digest = file_sha256(video)
+        hashes[os.path.abspath(video)] = {'arquivo': stamp, 'sha256': digest}
+        try:
+            os.makedirs(self.cache_dir, exist_ok=True)
+            tmp = os.path.join(self.cache_dir, f"{HASHES_NAME}.{os.getpid()}.tmp")
+            with open(tmp, 'w', encoding='utf-8') as f:
+                json.dump(hashes, f, indent=1)
+            os.replace(tmp, os.path.join(self.cache_dir, HASHES_NAME))
+        except OSError as e:
+            print(f"AVISO: não foi possível gravar '{HASHES_NAME}' em '{self.cache_dir}': {e}")
+        return digest
+
+    def key(self, video, pose_kwargs, segment_frames):
+        """Chave da extração; `segment_frames` None = rastreamento contínuo, sem segmentos."""
+        settings = json.dumps(dict(pose_settings(pose_kwargs), segmento=segment_frames), sort_keys=True)
+        return hashlib.sha1(f"{self.video_hash(video)}|{settings}".encode()).hexdigest()
+
+    def _entry(self, key):
+        return os.path.join(self.cache_dir, key)
+
+    # --- Leitura e escrita --------------------------------------------------------
+
+    def verify(self, path):
+        """True se todas as colunas batem com os tamanhos e sha1 do meta.json."""
+        try:
+            meta = read_meta(path)
+            expected = meta['sha1']
+            columns = read_columns(path, meta['colunas'])
+            if any(len(data) != meta['frames'] for data in columns.values()):
+                return False
+            return column_checksums(path, expected) == expected
+        except (OSError, ValueError, KeyError):
+            return False
+
+    def get(self, video, pose_kwargs, segment_frames):
+        """Pasta da extração em cache, ou None (ausente ou corrompida, que é apagada)."""
+        path = self._entry(self.key(video, pose_kwargs, segment_frames))
+        if not os.path.exists(os.path.join(path, META_NAME)):
+            return None
+        if not self.verify(path):
+            print(f"AVISO: extração em cache corrompida, descartada: {path}")
+            shutil.rmtree(path, ignore_errors=True)
+            return None
+        # Marca o uso (ordem da remoção por tamanho)
+        os.utime(os.path.join(path, META_NAME))
+        return path
+
+    def landmarks(self, video, pose_kwargs, segment_frames):
+        """Landmarks (N, 33, 4) em memmap de uma extração em cache, ou None."""
+        path = self.get(video, pose_kwargs, segment_frames)
+        if path is None:
+            return None
+        return read_columns(path, read_meta(path)['colunas'])['landmarks']
+
+    def put(self, video, pose_kwargs, segment_frames, extraction):
+        """Copia uma extração pronta (com os sha1 no meta.json) para o cache; devolve a pasta."""
+        path = self._entry(self.key(video, pose_kwargs, segment_frames))
+        tmp = f"{path}.{os.getpid()}.tmp"
+        try:
+            shutil.rmtree(tmp, ignore_errors=True)
+            shutil.copytree(extraction, tmp)
+            shutil.rmtree(path, ignore_errors=True)
+            os.replace(tmp, path)
+            os.utime(os.path.join(path, META_NAME))
+        except OSError as e:
+            # Sem espaço ou permissão: a extração continua valendo, só não fica no cache
+            print(f"AVISO: não foi possível guardar a extração no cache '{self.cache_dir}': {e}")
+            shutil.rmtree(tmp, ignore_errors=True)
+            return None
+        self.evict(keep=path)
+        return path
+
+    # --- Tamanho ----------------------------------------------------------------
+
+    def entries(self):
+        """[(mtime do último uso, bytes, pasta)] de cada entrada, da mais antiga à mais recente."""
+        if not os.path.isdir(self.cache_dir):
+            return []
+        entries = []
+        for name in os.listdir(self.cache_dir):
+            path = os.path.join(self.cache_dir, name)
+            meta = os.path.join(path, META_NAME)
+            if name.endswith('.tmp') or not os.path.exists(meta):
+                continue
+            size = sum(os.path.getsize(os.path.join(path, f)) for f in os.listdir(path))
+            entries.append((os.path.getmtime(meta), size, path))
+        return sorted(entries)
+
+    def size_bytes(self):
+        return sum(size for _, size, _ in self.entries())
+
+    def evict(self, keep=None):
+        """Apaga as entradas usadas há mais tempo até o cache caber em `max_bytes`."""
+        entries = self.entries()
+        total = sum(size for _, size, _ in entries)
+        removed = 0
+        for _, size, path in entries:
+            if total <= self.max_bytes:
+                break
+            if path == keep:
+                continue
+            shutil.rmtree(path, ignore_errors=True)
+            total -= size
+            removed += 1
+        return removed
+
+
+if __name__ == '__main__':
+    # python -m utils.cache_extracao [--verificar] [--limpar]
+    import argparse
+    parser = argparse.ArgumentParser(description="Estado do cache de extrações de landmarks")
+    parser.add_argument('--verificar', action='store_true', help="confere o sha1 de todas as entradas")
+    parser.add_argument('--limpar', action='store_true', help="apaga o cache inteiro")
+    args = parser.parse_args()
+    cache = ExtractionCache()
+    if args.limpar:
+        shutil.rmtree(cache.cache_dir, ignore_errors=True)
+    for used, size, path in cache.entries():
+        meta = read_meta(path)
+        status = ('ok' if cache.verify(path) else 'CORROMPIDA') if args.verificar else ''
+        print(f"{os.path.basename(path)[:12]}  {size / 1e6:7.1f} MB  {meta['frames']:7d} frames  "
+              f"{os.path.basename(meta.get('video', '?'))} {status}")
+    print(f"{cache.size_bytes() / 1e6:.1f} MB de {cache.max_bytes / 1e6:.0f} MB em {cache.cache_dir}")
@@ -0,0 +1,235 @@
+# utils/captura.py
+"""Fontes de frames intercambiáveis para o jogo e para a coleta de dados.
+
+Todas têm a mesma interface do `cv2.VideoCapture` usada no projeto
+(`read(image=None)`, `isOpened()`, `get(prop)`, `release()`), então o
+pipeline, o `camera_fps` e os scripts de coleta funcionam com qualquer uma:
+
+- WebcamSource: negocia com o dispositivo o formato de pixel (ex.: MJPG), a
+  resolução e o FPS pedidos, em vez de receber 1080p e reduzir em Python;
+  informa o que a câmera de fato aceitou.
+- VideoFileSource: um vídeo gravado (opcionalmente no ritmo real e em laço).
+- ImageDirSource: uma pasta de imagens, em ordem natural dos nomes.
+- SyntheticSource: padrão em movimento gerado na hora, sem câmera.
+
+`open_source(spec)` escolhe a fonte: um número é uma webcam, "sintetico" (ou
+"sintetico:640x480") o gerador, uma pasta o ImageDirSource e qualquer outro
+caminho um vídeo.
+"""
+import os
+import time
+
+import numpy as np
+
+DEFAULT_SIZE = (640, 480)
+DEFAULT_FPS = 30.0
+DEFAULT_FOURCC = 'MJPG'
+IMAGE_EXTENSIONS = ('.png', '.jpg', '.jpeg', '.bmp')
+
+
+class CaptureSource:
+    """Base das fontes: ritmo opcional de tempo real e `get` compatível com o OpenCV."""
+
+    def __init__(self, size=DEFAULT_SIZE, fps=DEFAULT_FPS, realtime=False):
+        self.size = tuple(size)
+        self.fps = float(fps) if fps else DEFAULT_FPS
+        self.realtime = realtime
+        self._next_frame = None
+
+    def _pace(self):
+        """Em tempo real, espera até o instante do próximo frame (como uma câmera faria)."""
+        if not self.realtime:
+            return
+        now = time.perf_counter()
+        if self._next_frame is not None and now < self._next_frame:
+            time.sleep(self._next_frame - now)
+            now = self._next_frame
+        self._next_frame = max(now, self._next_frame or now) + 1.0 / self.fps
+
+    def get(self, prop):
+        import cv2
+        if prop == cv2.CAP_PROP_FPS:
+            return self.fps
+        if prop == cv2.CAP_PROP_FRAME_WIDTH:
+            return float(self.size[0])
+        if prop == cv2.CAP_PROP_FRAME_HEIGHT:
+            return float(self.size[1])
+        return 0.0
+
+    def isOpened(self):
+        return True
+
+    def release(self):
+        pass
+
+    def describe(self):
+        w, h = self.size
+        return f"{type(self).__name__} {w}x{h} @ {self.fps:.0f} fps"
+
+
+class WebcamSource(CaptureSource):
+    """Webcam com formato, resolução e FPS negociados com o driver."""
+
+    def __init__(self, index=0, size=DEFAULT_SIZE, fps=DEFAULT_FPS, fourcc=DEFAULT_FOURCC, api=None):
+        import cv2
+        super().__init__(size, fps)
+        self.cap = cv2.VideoCapture(index) if api is None else cv2.VideoCapture(index, api)
+        self.requested = (tuple(size), float(fps), fourcc)
+        if self.cap.isOpened():
+            self._negotiate(cv2, size, fps, fourcc)
+
+    def _negotiate(self, cv2, size, fps, fourcc):
+        # A ordem importa em vários drivers (V4L2/DirectShow): formato antes da resolução
+        if fourcc:
+            self.cap.set(cv2.CAP_PROP_FOURCC, cv2.VideoWriter_fourcc(*fourcc))
+        self.cap.set(cv2.CAP_PROP_FRAME_WIDTH, size[0])
+        self.cap.set(cv2.CAP_PROP_FRAME_HEIGHT, size[1])
+        if fps:
+            self.cap.set(cv2.CAP_PROP_FPS, fps)
+        # Um frame na fila do driver: o frame lido é o mais recente, não um atrasado
+        self.cap.set(cv2.CAP_PROP_BUFFERSIZE, 1)
+
+        # O que a câmera aceitou de fato
+        w = int(self.cap.get(cv2.CAP_PROP_FRAME_WIDTH)) or size[0]
+        h = int(self.cap.get(cv2.CAP_PROP_FRAME_HEIGHT)) or size[1]
+        self.size = (w, h)
+        self.fps = float(self.cap.get(cv2.CAP_PROP_FPS)) or self.fps
+        code = int(self.cap.get(cv2.CAP_PROP_FOURCC))
+        self.fourcc = ''.join(chr((code >> 8 * i) & 0xFF) for i in range(4)).strip('\x00') if code else '?'
+        if self.size != tuple(size) or (fourcc and self.fourcc != fourcc):
+            print(f"AVISO: câmera entregou {w}x{h} {self.fourcc} (pedido {size[0]}x{size[1]} {fourcc}); "
+                  f"os frames serão redimensionados no pipeline.")
+
+    def read(self, image=None):
+        return self.cap.read(image)
+
+    def get(self, prop):
+        return self.cap.get(prop)
+
+    def isOpened(self):
+        return self.cap.isOpened()
+
+    def release(self):
+        self.cap.release()
+
+    def describe(self):
+        return f"{super().describe()} {getattr(self, 'fourcc', '?')}"
+
+
+class VideoFileSource(CaptureSource):
+    """Vídeo gravado; com `realtime` entrega no FPS do arquivo, com `loop` recomeça no fim."""
+
+    def __init__(self, path, realtime=False, loop=False):
+        import cv2
+        self.cap = cv2.VideoCapture(path)
+        size = (int(self.cap.get(cv2.CAP_PROP_FRAME_WIDTH)), int(self.cap.get(cv2.CAP_PROP_FRAME_HEIGHT)))
+        super().__init__(size, self.cap.get(cv2.CAP_PROP_FPS), realtime)
+        self.path = path
+        self.loop = loop
+
+    def read(self, image=None):
+        self._pace()
+        ret, image = self.cap.read(image)
+        if not ret and self.loop:
+            import cv2
+            self.cap.set(cv2.CAP_PROP_POS_FRAMES, 0)
+            ret, image = self.cap.read(image)
+        return ret, image
+
+    def get(self, prop):
+        # Tamanho e FPS já normalizados na base; o resto (posição, nº de frames...) vem do arquivo
+        import cv2
+        if prop in (cv2.CAP_PROP_FPS, cv2.CAP_PROP_FRAME_WIDTH, cv2.CAP_PROP_FRAME_HEIGHT):
+            return super().get(prop)
+        return self.cap.get(prop)
+
+    def isOpened(self):
+        return self.cap.isOpened()
+
+    def release(self):
+        self.cap.release()
+
+
+def _natural_key(filename):
+    digits = ''.join(filter(str.isdigit, filename))
+    return (int(digits) if digits else -1, filename)
+
+
+class ImageDirSource(CaptureSource):
+    """Imagens de uma pasta, uma por frame, em ordem natural (img2 antes de img10)."""
+
+    def __init__(self, path, fps=DEFAULT_FPS, realtime=False, loop=False):
+        self.files = [os.path.join(path, f) for f in sorted(os.listdir(path), key=_natural_key)
+                      if f.lower().endswith(IMAGE_EXTENSIONS)]
+        self.loop = loop
+        self.position = 0
+        size = DEFAULT_SIZE
+        if self.files:
+            import cv2
+            first = cv2.imread(self.files[0])
+            if first is not None:
+                size = (first.shape[1], first.shape[0])
+        super().__init__(size, fps, realtime)
+
+    def read(self, image=None):
+        import cv2
+        if self.position >= len(self.files):
+            if not self.loop or not self.files:
+                return False, image
+            self.position = 0
+        self._pace()
+        frame = cv2.imread(self.files[self.position])
+        self.position += 1
+        if frame is None:
+            return False, image
+        if image is not None and image.shape == frame.shape:
+            np.copyto(image, frame)
+            return True, image
+        return True, frame
+
+    def isOpened(self):
+        return bool(self.files)
+
+
+class SyntheticSource(CaptureSource):
+    """Frames gerados: faixas de cor deslizando e um retângulo em movimento (sem câmera)."""
+
+    def __init__(self, size=DEFAULT_SIZE, fps=DEFAULT_FPS, realtime=True, frames=None):
+        super().__init__(size, fps, realtime)
+        self.frames = frames
+        self.index = 0
+        w, h = self.size
+        self._base = np.zeros((h, w, 3), dtype=np.uint8)
+        self._base[..., 0] = (np.arange(w, dtype=np.uint16) * 255 // max(w - 1, 1)).astype(np.uint8)
+        self._base[..., 1] = (np.arange(h, dtype=np.uint16) * 255 // max(h - 1, 1)).astype(np.uint8)[:, None]
+
+    def read(self, image=None):
+        if self.frames is not None and self.index >= self.frames:
+            return False, image
+        self._pace()
+        w, h = self.size
+        if image is None or image.shape != self._base.shape:
+            image = np.empty_like(self._base)
+        np.copyto(image, np.roll(self._base, self.index * 4, axis=1))
+        x = int((np.sin(self.index / 15) * 0.4 + 0.5) * (w - w // 5))
+        image[h // 3:h // 3 + h // 4, x:x + w // 5] = 255
+        self.index += 1
+        return True, image
+
+
+def open_source(spec, size=DEFAULT_SIZE, fps=DEFAULT_FPS, fourcc=DEFAULT_FOURCC, realtime=False, loop=False):
+    """Cria a fonte descrita por `spec` (índice de webcam, "sintetico[:LxA]", pasta ou vídeo).
+
+    `realtime` faz vídeo, pasta e gerador entregarem frames no ritmo de uma
+    câmera (o jogo precisa disso; a coleta, que pausa e avança, não).
+    """
+    spec = str(spec)
+    if spec.isdigit():
+        return WebcamSource(int(spec), size, fps, fourcc)
+    if spec.startswith('sintetico'):
+        if ':' in spec:
+            size = tuple(int(v) for v in spec.split(':', 1)[1].lower().split('x'))
+        return SyntheticSource(size, fps, realtime=realtime)
+    if os.path.isdir(spec):
+        return ImageDirSource(spec, fps, realtime=realtime, loop=loop)
+    return VideoFileSource(spec, realtime=realtime, loop=loop)
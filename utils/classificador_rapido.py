@@ -0,0 +1,257 @@
+# utils/classificador_rapido.py
+"""Caminho rápido para os modelos `make_pipeline(StandardScaler(), LogisticRegression())`.
+
+A escala do `StandardScaler` é dobrada nos pesos da regressão logística:
+
+    z = W · ((x - média) / escala) + b
+      = (W / escala) · (x - média) + b
+
+A média continua sendo subtraída (no buffer de entrada, sem alocar): dobrá-la
+também no intercepto faria termos grandes se cancelarem em float32 e
+estragaria a precisão. Assim cada frame custa uma subtração e um único
+produto matriz-vetor em float32 mais softmax/sigmoide, sem a validação e o
+overhead do pipeline do sklearn e sem alocar memória por chamada.
+
+`MultiExerciseClassifier` empilha os pesos de vários exercícios em uma só
+matriz, para pontuar todos eles com um único produto por frame.
+"""
+import math
+
+import numpy as np
+
+# Diferença máxima aceita entre as probabilidades do caminho rápido e do sklearn
+DEFAULT_TOLERANCE = 1e-4
+
+
+def _activate(z, mode, out):
+    """Converte os logits `z` em probabilidades escritas em `out` (altera `z`)."""
+    if mode == 'binary':
+        v = float(z[0])
+        if v >= 0:
+            p = 1.0 / (1.0 + math.exp(-v))
+        else:
+            e = math.exp(v)
+            p = e / (1.0 + e)
+        out[0] = 1.0 - p
+        out[1] = p
+    elif mode == 'ovr':
+        np.negative(z, out=z)
+        np.exp(z, out=z)
+        z += 1.0
+        np.reciprocal(z, out=z)
+        z /= z.sum()
+        out[:] = z
+    else:
+        z -= z.max()
+        np.exp(z, out=z)
+        z /= z.sum()
+        out[:] = z
+    return out
+
+
+class FusedLogisticClassifier:
+    """Scaler + regressão logística compilados em pesos float32."""
+
+    def __init__(self, coef, intercept, classes, mode='multinomial', offset=None):
+        self.coef_ = np.ascontiguousarray(coef, dtype=np.float32)
+        self.intercept_ = np.ascontiguousarray(intercept, dtype=np.float32)
+        # Média do scaler, subtraída da entrada antes do produto
+        self.offset_ = None if offset is None else np.ascontiguousarray(offset, dtype=np.float32)
+        self.classes_ = np.asarray(classes)
+        self.mode = mode  # 'binary', 'multinomial' ou 'ovr'
+        self.n_features_in_ = self.coef_.shape[1]
+        self.n_classes_ = len(self.classes_)
+        # Buffers reaproveitados a cada chamada
+        self._x = np.empty(self.n_features_in_, dtype=np.float32)
+        self._z = np.empty(self.coef_.shape[0], dtype=np.float32)
+
+    @classmethod
+    def from_model(cls, model):
+        """Compila um Pipeline(StandardScaler, LogisticRegression) ou uma LogisticRegression.
+
+        Retorna None se o modelo não tiver esse formato.
+        """
+        from sklearn.linear_model import LogisticRegression
+        from sklearn.pipeline import Pipeline
+        from sklearn.preprocessing import StandardScaler
+
+        scaler = None
+        lr = model
+        if isinstance(model, Pipeline):
+            steps = [step for _, step in model.steps if step is not None and step != 'passthrough']
+            if len(steps) == 2 and isinstance(steps[0], StandardScaler):
+                scaler, lr = steps
+            elif len(steps) == 1:
+                lr = steps[0]
+            else:
+                return None
+        if not isinstance(lr, LogisticRegression) or not hasattr(lr, 'coef_'):
+            return None
+
+        coef = lr.coef_.astype(np.float64)
+        intercept = lr.intercept_.astype(np.float64)
+        offset = None
+        if scaler is not None:
+            offset = scaler.mean_
+            if scaler.scale_ is not None:
+                coef = coef / scaler.scale_
+
+        if len(lr.classes_) == 2:
+            mode = 'binary'
+        elif getattr(lr, 'multi_class', 'auto') == 'ovr':
+            mode = 'ovr'
+        else:
+            mode = 'multinomial'
+        return cls(coef, intercept, lr.classes_, mode, offset)
+
+    def predict_proba_into(self, x, out):
+        """Probabilidades de uma amostra (132 valores) escritas em `out`, sem alocar."""
+        np.copyto(self._x, x.reshape(-1), casting='same_kind')
+        if self.offset_ is not None:
+            self._x -= self.offset_
+        z = self._z
+        np.dot(self.coef_, self._x, out=z)
+        z += self.intercept_
+        return _activate(z, self.mode, out)
+
+    def predict_proba(self, X):
+        """Mesma interface do sklearn: (n_amostras, n_features) -> (n_amostras, n_classes)."""
+        X = np.atleast_2d(X)
+        out = np.empty((X.shape[0], self.n_classes_))
+        for i in range(X.shape[0]):
+            self.predict_proba_into(X[i], out[i])
+        return out
+
+    def predict(self, X):
+        return self.classes_[np.argmax(self.predict_proba(X), axis=1)]
+
+
+class MultiExerciseClassifier:
+    """Classificadores de vários exercícios empilhados em uma única matriz.
+
+    Um frame é pontuado para todos os exercícios com um só produto
+    matriz-vetor; `predict_proba_into` escreve as probabilidades de todos,
+    lado a lado, e `segments[chave]` diz qual fatia pertence a cada um.
+    Em float64: cada modelo tem a sua média, e por isso a entrada é centrada
+    numa média comum e a diferença vai para o intercepto, o que em float32
+    perderia precisão.
+    """
+
+    def __init__(self, fused_by_key):
+        self.keys = list(fused_by_key)
+        offsets = [f.offset_ if f.offset_ is not None else np.zeros(f.n_features_in_)
+                   for f in fused_by_key.values()]
+        self.center_ = np.mean(np.array(offsets, dtype=np.float64), axis=0)
+
+        coefs, intercepts = [], []
+        self.segments = {}
+        self._blocks = []  # (fatia de linhas em z, fatia em out, modo)
+        row, col = 0, 0
+        for (key, fused), offset in zip(fused_by_key.items(), offsets):
+            W = fused.coef_.astype(np.float64)
+            coefs.append(W)
+            intercepts.append(fused.intercept_ - W @ (offset - self.center_))
+            rows = slice(row, row + W.shape[0])
+            cols = slice(col, col + fused.n_classes_)
+            self.segments[key] = cols
+            self._blocks.append((rows, cols, fused.mode))
+            row, col = rows.stop, cols.stop
+
+        self.coef_ = np.ascontiguousarray(np.vstack(coefs))
+        self.intercept_ = np.concatenate(intercepts)
+        self.classes_by_key = {key: f.classes_ for key, f in fused_by_key.items()}
+        self.classes_ = np.concatenate(list(self.classes_by_key.values()))
+        self.n_features_in_ = self.coef_.shape[1]
+        self.n_classes_ = col
+        self._x = np.empty(self.n_features_in_)
+        self._z = np.empty(row)
+
+    def predict_proba_into(self, x, out):
+        np.copyto(self._x, x.reshape(-1), casting='same_kind')
+        self._x -= self.center_
+        np.dot(self.coef_, self._x, out=self._z)
+        self._z += self.intercept_
+        for rows, cols, mode in self._blocks:
+            _activate(self._z[rows], mode, out[cols])
+        return out
+
+    def predict_proba(self, X):
+        X = np.atleast_2d(X)
+        out = np.empty((X.shape[0], self.n_classes_))
+        for i in range(X.shape[0]):
+            self.predict_proba_into(X[i], out[i])
+        return out
+
+    def split(self, probabilities):
+        """{chave do exercício: probabilidades daquele exercício}."""
+        return {key: probabilities[cols] for key, cols in self.segments.items()}
+
+
+def n_classes(model):
+    """Número de classes de um modelo compilado ou do sklearn."""
+    return getattr(model, 'n_classes_', None) or len(model.classes_)
+
+
+def predict_proba_row(model, row, out=None):
+    """Probabilidades de uma única amostra, pelo caminho rápido quando disponível.
+
+    Com `out` (n_classes,), o caminho rápido escreve nele sem alocar; é o que
+    os chamadores por frame usam. Sem `out`, um array novo é devolvido.
+    """
+    if hasattr(model, 'predict_proba_into'):
+        return model.predict_proba_into(row, np.empty(model.n_classes_) if out is None else out)
+    probabilities = model.predict_proba(row.reshape(1, -1))[0]
+    if out is None:
+        return probabilities
+    out[:] = probabilities
+    return out
+
+
+def max_difference(model, fused, n_samples=256, seed=0, columns=slice(None)):
+    """Maior diferença absoluta entre `fused` e `model.predict_proba` em amostras sintéticas.
+
+    `columns` seleciona a fatia de `fused` que corresponde a `model`.
+    """
+    rng = np.random.default_rng(seed)
+    n_features = fused.n_features_in_
+    center, spread = np.zeros(n_features), np.ones(n_features)
+    scaler = getattr(model, 'steps', [(None, None)])[0][1]
+    if getattr(scaler, 'mean_', None) is not None:
+        center = scaler.mean_
+    if getattr(scaler, 'scale_', None) is not None:
+        spread = scaler.scale_
+    X = (center + rng.normal(scale=2.0, size=(n_samples, n_features)) * spread).astype(np.float32)
+    return float(np.max(np.abs(model.predict_proba(X.astype(np.float64)) - fused.predict_proba(X)[:, columns])))
+
+
+def compile_classifier(model, tolerance=DEFAULT_TOLERANCE):
+    """Versão rápida do modelo se ele tiver o formato esperado e bater com o sklearn.
+
+    Caso contrário devolve o próprio modelo, que continua funcionando pelo caminho normal.
+    """
+    fused = FusedLogisticClassifier.from_model(model)
+    if fused is None:
+        return model
+    diff = max_difference(model, fused)
+    if diff > tolerance:
+        print(f"AVISO: classificador rápido difere do sklearn em {diff:.2e}; usando o modelo original.")
+        return model
+    return fused
+
+
+def compile_multi(models, tolerance=DEFAULT_TOLERANCE):
+    """Empilha {chave: modelo} em um MultiExerciseClassifier, ou None se algum não servir."""
+    fused_by_key = {}
+    for key, model in models.items():
+        fused = FusedLogisticClassifier.from_model(model)
+        if fused is None:
+            print(f"AVISO: o modelo de '{key}' não é StandardScaler + LogisticRegression; não dá para empilhar.")
+            return None
+        fused_by_key[key] = fused
+    multi = MultiExerciseClassifier(fused_by_key)
+    for key, model in models.items():
+        diff = max_difference(model, multi, columns=multi.segments[key])
+        if diff > tolerance:
+            print(f"AVISO: classificador empilhado difere do sklearn em {diff:.2e} para '{key}'.")
+            return None
+    return multi
@@ -0,0 +1,109 @@
+# utils/coleta.py
+"""Partes comuns dos scripts de coleta interativa (coleta_dados/coletar_dados_*.py).
+
+Cada script só define o vídeo, o conjunto de dados, as classes e as teclas;
+o `CollectionSession` cuida do resto:
+
+- abre a fonte (vídeo, pasta de imagens ou webcam) e o conjunto em dados/,
+  importando o CSV antigo na primeira vez;
+- lê os landmarks do cache de extração quando o vídeo já foi extraído
+  (sem MediaPipe) e, sem cache, guarda a passada contínua até o fim do vídeo
+  para as próximas coletas, com o timestamp `frame / fps` de cada frame;
+- mantém as faixas rotuladas do vídeo (utils/rotulos.py) e, no fim, mostra
+  como gerar as amostras delas.
+"""
+import os
+from contextlib import nullcontext
+
+import numpy as np
+
+from utils.base_dados import DatasetWriter, dataset_exists, dataset_path, import_csv
+from utils.cache_extracao import ExtractionCache
+from utils.captura import open_source
+from utils.extracao import POSE_KWARGS, FullPassRecorder, cached_landmarks
+from utils.landmarks import landmarks_to_array, new_landmark_buffer
+from utils.rotulos import ANNOTATION_DIR, RangeEditor, annotation_path
+
+
+def setup_dataset(name, csv_path=None):
+    """Abre o conjunto de dados em dados/; na primeira vez, traz as amostras do CSV antigo."""
+    path = dataset_path(name)
+    if not dataset_exists(path) and csv_path and os.path.exists(csv_path):
+        print(f"{import_csv(csv_path, path)} amostras importadas de '{csv_path}'")
+    return DatasetWriter(path)
+
+
+class CollectionSession:
+    """Fonte, conjunto de dados, cache de landmarks e faixas de uma coleta interativa."""
+
+    def __init__(self, source, dataset, csv_path=None, cache=None, annotation_dir=ANNOTATION_DIR):
+        import cv2
+        self.source = source
+        self.dataset_name = dataset
+        self.cap = open_source(source)
+        self.fps = self.cap.get(cv2.CAP_PROP_FPS) or 30.0
+        is_video = os.path.isfile(source)
+        # Vídeo já extraído com as mesmas configurações (python extrair_landmarks.py): sem MediaPipe
+        self.cache = cache or ExtractionCache()
+        self.cached = cached_landmarks(self.cache, source) if is_video else None
+        if self.cached is not None:
+            print(f"Landmarks de '{source}' vindos do cache ({len(self.cached)} frames)")
+        # Sem cache, uma passada até o fim do vídeo é guardada nele para as próximas coletas
+        self.full_pass = FullPassRecorder(source, POSE_KWARGS) if is_video and self.cached is None else None
+        self.video_finished = False
+        # Faixas rotuladas do vídeo (rotulos/<vídeo>.txt, ver rotular_intervalos.py): i = início, f = fim, z = desfaz
+        self.ranges = RangeEditor(annotation_path(source, annotation_dir), self.fps) if is_video else None
+        self.dataset = setup_dataset(dataset, csv_path)
+        self._buffer = new_landmark_buffer()
+
+    def pose(self):
+        """Contexto com o `mp_pose.Pose` da coleta (nenhum, se os landmarks vêm do cache)."""
+        if self.cached is not None:
+            return nullcontext()
+        import mediapipe as mp
+        return mp.solutions.pose.Pose(**POSE_KWARGS)
+
+    def landmarks(self, pose, image, frame_index):
+        """Landmarks (33, 4) do frame RGB: do cache, se o vídeo já foi extraído, senão do MediaPipe."""
+        if self.cached is not None:
+            if frame_index >= len(self.cached) or np.isnan(self.cached[frame_index, 0, 0]):
+                return None
+            return self.cached[frame_index]
+        landmarks = landmarks_to_array(pose.process(image), self._buffer)
+        if self.full_pass is not None:
+            # O tempo sai do índice, como na extração em segmentos (a posição da fonte não é confiável)
+            self.full_pass.add(frame_index, frame_index / self.fps, landmarks)
+        return landmarks
+
+    def save_frame(self, pose_class, landmarks, frame_index):
+        """Acrescenta os landmarks do frame atual ao conjunto de dados com a classe fornecida."""
+        if landmarks is None:
+            print("Nenhuma pose detectada para salvar.")
+            return
+        # Só copia para o bloco em memória; a escrita em disco é feita em lotes por outra thread
+        self.dataset.append(landmarks, pose_class, self.source, frame_index)
+        print(f"Frame {frame_index} salvo para a classe: '{pose_class}'")
+
+    def draw_ranges(self, image_bgr):
+        """Escreve o estado das faixas acima do texto de ajuda."""
+        if self.ranges is not None:
+            import cv2
+            cv2.putText(image_bgr, self.ranges.status(),
+                        (15, image_bgr.shape[0] - 55), cv2.FONT_HERSHEY_SIMPLEX, 0.7, (255, 255, 255), 2)
+
+    def edit_range(self, key, frame_index, pose_class):
+        """Trata as teclas das faixas (i, f, z); devolve True se a tecla era uma delas."""
+        if self.ranges is None or key not in RangeEditor.KEYS:
+            return False
+        self.ranges.edit(key, frame_index, pose_class)
+        return True
+
+    def close(self):
+        """Grava o conjunto, guarda a passada completa no cache e libera a fonte."""
+        self.dataset.close()
+        if self.full_pass is not None and self.video_finished and self.full_pass.save(self.cache, self.fps):
+            print(f"Landmarks de '{self.source}' guardados no cache ({len(self.full_pass.landmarks)} frames)")
+        if self.ranges is not None and self.ranges.intervals:
+            print(f"{len(self.ranges.intervals)} faixas em '{self.ranges.path}'; gere as amostras com: "
+                  f"python rotular_intervalos.py {self.source} --conjunto {self.dataset_name}")
+        self.cap.release()
@@ -0,0 +1,130 @@
+# utils/contador.py
+"""Máquina de estados das repetições, sem nenhuma dependência de interface.
+
+- RepCounter: segue a sequência de estágios de um exercício (EXERCISES[...]['logic'])
+  e conta repetições, exatamente como a MissionFrame fazia.
+- MissionEngine: recebe a saída dos backends de inferência (PoseOutput) e
+  aplica suavização de probabilidades, detecção automática do exercício e o
+  RepCounter, devolvendo eventos que a interface (ou o replay) apresenta.
+"""
+from collections import namedtuple
+
+import numpy as np
+
+from utils.features_temporais import StreamingFeatureEngine
+
+MIN_CONFIDENCE = 0.8  # Limite de confiança para aceitar a pose
+
+# Tipos de evento
+TRANSITION = 'transicao'        # estágio esperado reconhecido, repetição em andamento
+REP = 'repeticao'               # último estágio reconhecido: repetição completa
+WRONG_POSE = 'postura_errada'   # modelo confiante, mas em outro estágio
+LOW_CONFIDENCE = 'confianca_baixa'
+DETECTED = 'exercicio_detectado'  # (missão automática) o exercício detectado mudou
+
+MissionEvent = namedtuple('MissionEvent', [
+    'kind', 'pose_class', 'confidence', 'expected', 'next_stage', 'reps', 'exercise'])
+
+
+class RepCounter:
+    """Segue a sequência de estágios de um exercício e conta repetições."""
+
+    def __init__(self, logic, min_confidence=MIN_CONFIDENCE):
+        self.logic = list(logic)
+        self.min_confidence = min_confidence
+        self.reset()
+
+    def reset(self):
+        self.logic_index = 0
+        self.stage = ""
+        self.reps = 0
+
+    @property
+    def expected(self):
+        return self.logic[self.logic_index]
+
+    def update(self, pose_class, confidence):
+        """Aplica a classe prevista de um frame; retorna o tipo de evento."""
+        expected_stage = self.logic[self.logic_index]
+        if confidence <= self.min_confidence:
+            return LOW_CONFIDENCE
+        if pose_class != expected_stage:
+            return WRONG_POSE
+
+        # Pose correta e com boa confiança: avança.
+        self.stage = pose_class
+        self.logic_index += 1
+        if self.logic_index >= len(self.logic):
+            self.logic_index = 0
+            self.reps += 1
+            return REP
+        return TRANSITION
+
+
+class MissionEngine:
+    """Da saída da inferência aos eventos da missão, para um exercício ou no modo automático.
+
+    `model` precisa de `classes_`; no modo automático (`detector` informado)
+    ele deve ser um MultiExerciseClassifier, com `split` e `classes_by_key`.
+    """
+
+    def __init__(self, model, logic=None, logic_by_key=None, detector=None,
+                 smoothing_window=1, min_confidence=MIN_CONFIDENCE):
+        self.model = model
+        self.logic_by_key = logic_by_key or {}
+        self.detector = detector
+        self.min_confidence = min_confidence
+        self.counter = RepCounter(logic, min_confidence) if logic else None
+        self.exercise = None
+        self.probability_features = None
+        if smoothing_window > 1:
+            self.probability_features = StreamingFeatureEngine(len(model.classes_), smoothing_window,
+                                                               features=('mean',))
+        self.reps = 0
+
+    def reset(self):
+        self.reps = 0
+        self.exercise = None
+        if self.counter:
+            self.counter.reset()
+        if self.detector:
+            self.detector.reset()
+            self.counter = None
+        if self.probability_features:
+            self.probability_features.reset()
+
+    def process(self, output):
+        """Processa um PoseOutput; retorna um MissionEvent ou None se não há pose."""
+        probabilities = output.probabilities
+        if probabilities is None:
+            if self.probability_features:
+                self.probability_features.reset()
+            return None
+        if self.probability_features:
+            # A lógica de repetições vê as probabilidades médias da janela recente
+            probabilities = self.probability_features.update(probabilities).mean
+
+        classes = self.model.classes_
+        if self.detector:
+            # Todos os exercícios foram pontuados de uma vez; o detector escolhe qual contar
+            probabilities_by_key = self.model.split(probabilities)
+            key = self.detector.update(probabilities_by_key)
+            if key != self.exercise:
+                self.exercise = key
+                self.counter = RepCounter(self.logic_by_key[key], self.min_confidence) if key else None
+                if self.counter:
+                    self.counter.reps = self.reps
+                return MissionEvent(DETECTED, None, 0.0, None, None, self.reps, key)
+            if key is None:
+                return None
+            probabilities = probabilities_by_key[key]
+            classes = self.model.classes_by_key[key]
+
+        pose_class_index = int(np.argmax(probabilities))
+        pose_class = classes[pose_class_index]
+        confidence_score = float(probabilities[pose_class_index])
+        expected_stage = self.counter.expected
+        kind = self.counter.update(pose_class, confidence_score)
+        self.reps = self.counter.reps
+        return MissionEvent(kind, pose_class, confidence_score, expected_stage,
+                            self.counter.expected, self.reps, self.exercise)
@@ -0,0 +1,64 @@
+# utils/detector_exercicio.py
+"""Detecção automática do exercício a partir dos padrões de repetição.
+
+Cada exercício tem a sua sequência de estágios (EXERCISES[...]['logic']).
+O detector acompanha, em paralelo, essa sequência para todos os exercícios
+usando as probabilidades do MultiExerciseClassifier, e conta quantos
+estágios esperados cada um viu avançar dentro de uma janela deslizante de
+frames. O exercício com mais avanços (com folga sobre o segundo) é o que a
+criança está fazendo.
+"""
+from collections import deque
+
+import numpy as np
+
+from utils.contador import RepCounter, TRANSITION, REP
+
+
+class ExerciseDetector:
+    """Pontua cada exercício pelo número de avanços de estágio na janela recente."""
+
+    def __init__(self, logic_by_key, classes_by_key, window=150, min_advances=4,
+                 margin=2, min_confidence=0.8):
+        self.logic_by_key = logic_by_key
+        self.classes_by_key = classes_by_key
+        self.window = window
+        self.min_advances = min_advances
+        self.margin = margin
+        self.min_confidence = min_confidence
+        self.reset()
+
+    def reset(self):
+        self.frame_index = 0
+        self.current = None
+        self._counters = {key: RepCounter(logic, self.min_confidence)
+                          for key, logic in self.logic_by_key.items()}
+        self._advances = {key: deque() for key in self.logic_by_key}
+
+    def update(self, probabilities_by_key):
+        """Recebe {chave: probabilidades} de um frame; retorna o exercício detectado (ou None)."""
+        self.frame_index += 1
+        oldest = self.frame_index - self.window
+
+        for key, probabilities in probabilities_by_key.items():
+            i = int(np.argmax(probabilities))
+            pose_class = self.classes_by_key[key][i]
+            if self._counters[key].update(pose_class, probabilities[i]) in (TRANSITION, REP):
+                self._advances[key].append(self.frame_index)
+            advances = self._advances[key]
+            while advances and advances[0] <= oldest:
+                advances.popleft()
+
+        ranking = sorted(self.scores().items(), key=lambda kv: kv[1], reverse=True)
+        best_key, best = ranking[0]
+        second = ranking[1][1] if len(ranking) > 1 else 0
+        if best >= self.min_advances and best - second >= self.margin:
+            self.current = best_key
+        elif self.current is not None and self.scores()[self.current] < self.min_advances:
+            # O exercício anterior parou de aparecer e nenhum outro se destacou
+            self.current = None
+        return self.current
+
+    def scores(self):
+        """{chave: avanços de estágio dentro da janela}."""
+        return {key: len(advances) for key, advances in self._advances.items()}
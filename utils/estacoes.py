@@ -0,0 +1,342 @@
+# utils/estacoes.py
+"""Várias estações (câmera + missão) num só processo, com um pool de pose compartilhado.
+
+Cada `Station` tem a sua fonte de vídeo, a sua `CaptureThread`, o seu
+FramePool e o seu MissionEngine, mas nenhuma tem um Pose próprio: os frames
+vão para o `FairFrameScheduler`, e um número fixo de workers (`PosePool`,
+um Pose por worker) atende todas as estações.
+
+Escalonamento justo: cada estação tem no máximo um frame pendente (o mais
+recente; o anterior é descartado, como na LatestQueue). Um worker livre
+pega o frame da estação com menos frames em processamento e, no empate, a
+que foi atendida há mais tempo. Uma câmera de 60 fps não rouba os workers
+de uma de 15 fps, e nenhum worker fica parado se há frame pendente.
+
+Como qualquer worker pode receber frames de qualquer estação, os Pose do
+pool rodam com `static_image_mode=True` (sem rastreamento entre frames,
+que misturaria as crianças). A classificação é barata e roda no próprio
+worker, com o modelo e a suavização de cada estação.
+"""
+import itertools
+import threading
+import time
+from collections import deque
+
+import numpy as np
+
+from utils.contador import MissionEngine
+from utils.classificador_rapido import n_classes
+from utils.inferencia import ProbabilityBuffers, classify_landmarks, smoothing_engine
+from utils.landmarks import landmarks_to_array
+from utils.pipeline import CaptureThread, FramePool, LatestQueue, StageStats
+
+FRAME_SIZE = (640, 480)
+FPS_WINDOW = 2.0  # segundos usados no cálculo do FPS de cada estação
+
+
+class _StationQueue:
+    """O que a CaptureThread vê como fila de saída: entrega ao escalonador."""
+
+    def __init__(self, scheduler, name):
+        self.scheduler = scheduler
+        self.name = name
+        self.dropped = 0
+
+    def put(self, packet):
+        self.scheduler.put(self.name, packet)
+
+
+class FairFrameScheduler:
+    """Frames pendentes por estação, distribuídos aos workers em rodízio justo."""
+
+    def __init__(self):
+        self._cond = threading.Condition()
+        self._pending = {}
+        self._in_flight = {}
+        self._last_served = {}
+        self._queues = {}
+        self._on_drop = {}
+        self._tickets = itertools.count()
+        self._closed = False
+
+    def register(self, name, on_drop=None):
+        """Cria a fila de uma estação; `on_drop(pacote)` recebe os frames descartados."""
+        with self._cond:
+            self._in_flight[name] = 0
+            self._last_served[name] = -1
+            self._on_drop[name] = on_drop
+            queue = self._queues[name] = _StationQueue(self, name)
+        return queue
+
+    def unregister(self, name):
+        with self._cond:
+            old = self._pending.pop(name, None)
+            on_drop = self._on_drop.pop(name, None)
+            for table in (self._in_flight, self._last_served, self._queues):
+                table.pop(name, None)
+        if old is not None and on_drop:
+            on_drop(old)
+
+    def put(self, name, packet):
+        """Novo frame da estação; o pendente anterior (se houver) é descartado."""
+        with self._cond:
+            if name not in self._queues:
+                old = packet
+            else:
+                old = self._pending.get(name)
+                self._pending[name] = packet
+                if old is not None:
+                    self._queues[name].dropped += 1
+                self._cond.notify()
+            on_drop = self._on_drop.get(name)
+        if old is not None and on_drop:
+            on_drop(old)
+
+    def get(self, timeout=None):
+        """(estação, pacote) a processar, ou None no timeout / depois de `close()`."""
+        with self._cond:
+            if not self._pending and not self._closed:
+                self._cond.wait(timeout)
+            if not self._pending:
+                return None
+            name = min(self._pending, key=lambda n: (self._in_flight[n], self._last_served[n]))
+            packet = self._pending.pop(name)
+            self._in_flight[name] += 1
+            self._last_served[name] = next(self._tickets)
+            return name, packet
+
+    def done(self, name):
+        with self._cond:
+            if name in self._in_flight:
+                self._in_flight[name] -= 1
+
+    def close(self):
+        with self._cond:
+            self._closed = True
+            self._cond.notify_all()
+
+    def drain(self):
+        with self._cond:
+            items = list(self._pending.items())
+            self._pending.clear()
+        return items
+
+
+class RateMeter:
+    """Eventos por segundo na janela recente; `tick` vem de uma thread só de cada vez."""
+
+    def __init__(self, window=FPS_WINDOW):
+        self.window = window
+        self._times = deque()
+        self.total = 0
+
+    def tick(self, now=None):
+        now = time.perf_counter() if now is None else now
+        self._times.append(now)
+        self.total += 1
+        while self._times and now - self._times[0] > self.window:
+            self._times.popleft()
+
+    def rate(self, now=None):
+        now = time.perf_counter() if now is None else now
+        times = [t for t in list(self._times) if now - t <= self.window]
+        if len(times) < 2:
+            return 0.0
+        return (len(times) - 1) / max(times[-1] - times[0], 1e-9)
+
+
+class Station:
+    """Uma criança: fonte de vídeo, missão e contadores próprios; a pose vem do pool."""
+
+    def __init__(self, name, cap, model, logic=None, logic_by_key=None, detector=None,
+                 smoothing_window=1, size=FRAME_SIZE, pool_size=8):
+        self.name = name
+        self.cap = cap
+        self.model = model
+        self.size = size
+        w, h = size
+        self.stats = StageStats()
+        self.pool = FramePool((h, w, 3), count=pool_size)
+        self.results = LatestQueue(maxsize=1, on_drop=lambda item: self.release(item[0]))
+        self.engine = MissionEngine(model, logic=logic, logic_by_key=logic_by_key, detector=detector,
+                                    smoothing_window=smoothing_window)
+        self.engine.reset()
+        self.features = smoothing_engine(smoothing_window)
+        self.probabilities = ProbabilityBuffers(count=pool_size)
+        self.capture = None
+        self.inference_rate = RateMeter()
+        self.display_rate = RateMeter()
+        self.last_event = None
+        self.recorder = None  # SessionRecorder opcional (utils/gravacao.py)
+        self._lock = threading.Lock()
+        self._last_index = -1
+        self.out_of_order = 0
+
+    def attach(self, scheduler):
+        """Liga a captura desta estação ao escalonador do pool."""
+        queue = scheduler.register(self.name, on_drop=self.release)
+        self.capture = CaptureThread(self.cap, queue, self.stats, self.pool, self.size)
+        return queue
+
+    def release(self, packet):
+        self.pool.release(packet.slot)
+
+    def handle(self, packet, landmarks):
+        """Chamado por um worker do pool com os landmarks do frame (ou None)."""
+        with self._lock:
+            # Com dois workers na mesma estação, um frame mais antigo pode terminar depois
+            if packet.index < self._last_index:
+                self.out_of_order += 1
+                self.release(packet)
+                return
+            self._last_index = packet.index
+            output = classify_landmarks(self.model, landmarks, self.features,
+                                        self.probabilities.next(n_classes(self.model)))
+            self.inference_rate.tick()
+            self.results.put((packet, output))
+        self.stats.add_processed('inferencia')
+        self.stats.set_dropped('inferencia', self.results.dropped)
+
+    def poll(self):
+        """Resultado mais recente com o seu evento: (pacote, saída, evento) ou None.
+
+        Quem recebe o pacote deve chamar `release(pacote)` depois de exibi-lo.
+        """
+        item = self.results.get_nowait()
+        if item is None:
+            return None
+        packet, output = item
+        event = self.engine.process(output)
+        if event is not None:
+            self.last_event = event
+        if self.recorder:
+            self.recorder.record(packet.timestamp, output, event, self.engine.reps)
+        self.display_rate.tick()
+        self.stats.add_processed('exibicao')
+        return packet, output, event
+
+    def report(self):
+        processed, dropped = self.stats.snapshot()['captura']
+        return {
+            'fps_inferencia': round(self.inference_rate.rate(), 1),
+            'fps_exibicao': round(self.display_rate.rate(), 1),
+            'frames_capturados': processed,
+            'descartados_na_fila': dropped,
+            'inferidos': self.inference_rate.total,
+            'fora_de_ordem': self.out_of_order,
+            'repeticoes': self.engine.reps,
+        }
+
+
+class PosePool:
+    """Workers de pose compartilhados; `pose_factory()` cria o Pose de cada worker."""
+
+    def __init__(self, pose_factory, workers=2):
+        self.pose_factory = pose_factory
+        self.scheduler = FairFrameScheduler()
+        self.stations = {}
+        self.workers = workers
+        self.busy = [0.0] * workers
+        self._threads = []
+        self._stop_event = threading.Event()
+        self._ready = threading.Barrier(workers + 1)
+        self._started = None
+        self.failed = {}  # worker -> erro ao criar o Pose
+
+    def add(self, station):
+        if station.name in self.stations:
+            raise ValueError(f"estação repetida: {station.name}")
+        self.stations[station.name] = station
+        station.attach(self.scheduler)
+        return station
+
+    def start(self):
+        """Cria e aquece o Pose de cada worker e só então liga as câmeras.
+
+        RuntimeError (com as câmeras e gravações já liberadas) se nenhum
+        worker conseguiu criar o seu Pose: sem isso, todos os frames seriam
+        descartados em silêncio.
+        """
+        for i in range(self.workers):
+            thread = threading.Thread(target=self._run, args=(i,), name=f'pool-pose-{i}', daemon=True)
+            thread.start()
+            self._threads.append(thread)
+        self._ready.wait()
+        if len(self.failed) == self.workers:
+            self._release_stations()
+            raise RuntimeError(f"nenhum worker do pool conseguiu criar o Pose: {self.failed[0]}")
+        if self.failed:
+            print(f"AVISO: {len(self.failed)} de {self.workers} workers sem Pose; "
+                  f"o pool segue com {self.workers - len(self.failed)}")
+        self._started = time.perf_counter()
+        for station in self.stations.values():
+            station.capture.start()
+
+    def _run(self, worker):
+        pose = None
+        try:
+            pose = self.pose_factory()
+            w, h = FRAME_SIZE
+            pose.process(np.zeros((h, w, 3), dtype=np.uint8))
+        except Exception as e:
+            self.failed[worker] = f"{type(e).__name__}: {e}"
+            print(f"ERRO ao criar o Pose do worker {worker}: {e}")
+            if pose is not None:
+                pose.close()
+            return
+        finally:
+            self._ready.wait()
+        try:
+            while not self._stop_event.is_set():
+                item = self.scheduler.get(timeout=0.1)
+                if item is None:
+                    continue
+                name, packet = item
+                station = self.stations[name]
+                t0 = time.perf_counter()
+                try:
+                    landmarks = landmarks_to_array(pose.process(packet.image))
+                    station.handle(packet, landmarks)
+                except Exception as e:
+                    print(f"ERRO na inferência da estação {name}, frame {packet.index}: {e}")
+                    station.release(packet)
+                finally:
+                    self.scheduler.done(name)
+                    self.busy[worker] += time.perf_counter() - t0
+        finally:
+            pose.close()
+
+    def utilization(self):
+        """Fração do tempo em que cada worker esteve ocupado desde o início."""
+        if self._started is None:
+            return [0.0] * self.workers
+        elapsed = max(time.perf_counter() - self._started, 1e-9)
+        return [min(busy / elapsed, 1.0) for busy in self.busy]
+
+    def report(self):
+        return {'workers': self.workers,
+                'workers_sem_pose': len(self.failed),
+                'ocupacao_workers': [round(u, 2) for u in self.utilization()],
+                'estacoes': {name: station.report() for name, station in self.stations.items()}}
+
+    def stop(self, timeout=1.0):
+        """Para câmeras e workers e devolve todos os buffers."""
+        for station in self.stations.values():
+            station.capture.stop()
+        self._stop_event.set()
+        self.scheduler.close()
+        for station in self.stations.values():
+            station.capture.join(timeout)
+        for thread in self._threads:
+            thread.join(timeout)
+        self._release_stations()
+
+    def _release_stations(self):
+        for name, packet in self.scheduler.drain():
+            self.stations[name].release(packet)
+        for station in self.stations.values():
+            for packet, _ in station.results.drain():
+                station.release(packet)
+            station.cap.release()
+            if station.recorder:
+                station.recorder.close()
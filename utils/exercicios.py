@@ -0,0 +1,46 @@
+# utils/exercicios.py
+"""Configuração dos exercícios, compartilhada pelo jogo e pelas ferramentas sem interface.
+
+Os exercícios vêm do manifesto `modelos/manifesto.json`:
+
+    {"exercicios": {"<chave>": {"name": ..., "model": "<arquivo .pkl em modelos/>",
+                                 "logic": [estágios em ordem],
+                                 "dados": [conjuntos em dados/ usados no treino],
+                                 "gating": {"stride": N, "motion_threshold": X}}}}
+
+`gating` é opcional: inferência espaçada (--gating), no máximo a cada
+`stride` frames ou quando há movimento. `dados` é usado pelo
+treinar_modelos.py. Um exercício novo só precisa do modelo em `modelos/` e
+da sua entrada no manifesto.
+"""
+import json
+import os
+
+MODELS_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'modelos')
+MANIFEST_PATH = os.path.join(MODELS_DIR, 'manifesto.json')
+
+
+def load_manifest(path=MANIFEST_PATH):
+    """{chave: dados do exercício}, com `key` e `model_path` (absoluto) preenchidos."""
+    with open(path, encoding='utf-8') as f:
+        manifest = json.load(f)
+    models_dir = os.path.dirname(os.path.abspath(path))
+    exercises = {}
+    for key, data in manifest['exercicios'].items():
+        data = dict(data)
+        data['key'] = key
+        data['model_path'] = os.path.join(models_dir, data['model'])
+        data.setdefault('gating', {})
+        data['dados'] = [data['dados']] if isinstance(data.get('dados'), str) else list(data.get('dados', []))
+        exercises[key] = data
+    return exercises
+
+
+EXERCISES = load_manifest()
+
+# Missão em que todos os modelos são avaliados juntos e o exercício é detectado pelos movimentos
+AUTO_MISSION = {"name": "Detectar Exercício Automaticamente", "auto": True}
+
+# Backends de inferência disponíveis: no próprio processo ou em um processo separado
+INFERENCE_BACKENDS = ('local', 'processo')
+POSE_SETTINGS = dict(min_detection_confidence=0.4, min_tracking_confidence=0.4, model_complexity=0)
@@ -0,0 +1,271 @@
+# utils/extracao.py
+"""Extração em lote dos landmarks de vídeos inteiros, usando todos os núcleos.
+
+Em vez de assistir a cada vídeo na janela da coleta, cada vídeo é dividido
+em segmentos de `segment_frames` frames e os segmentos de todos os vídeos
+vão para um pool de processos. Cada processo cria o seu `mp_pose.Pose` uma
+vez (no inicializador do pool) e o reaproveita; no começo de cada segmento
+o rastreamento é reiniciado, para um segmento não herdar a pose de outro.
+
+O resultado de cada vídeo é uma pasta no formato das gravações
+(utils/gravacao.py), legível com `load_recording` e pelo replay_missao.py:
+
+    frame.bin       int32, índice do frame no vídeo
+    timestamp.bin   float64, segundos desde o início do vídeo
+    landmarks.bin   (33, 4) float32; NaN = nenhuma pose no frame
+
+O meta.json guarda o sha1 de cada coluna; com um `ExtractionCache`
+(utils/cache_extracao.py), vídeos já extraídos com as mesmas configurações
+do Pose e o mesmo tamanho de segmento são copiados do cache em vez de
+passar pelo MediaPipe de novo. A coleta interativa (utils/coleta.py) lê o
+cache com `cached_landmarks` e, quando assiste a um vídeo até o fim, guarda
+a sua passada contínua com um `FullPassRecorder`.
+"""
+import os
+import shutil
+import tempfile
+import time
+from collections import namedtuple
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+import numpy as np
+
+from utils.cache_extracao import column_checksums
+from utils.gravacao import column_specs, read_meta, write_meta
+from utils.landmarks import NUM_LANDMARKS, landmarks_to_array
+
+EXTRACTION_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'extracoes')
+SEGMENT_FRAMES = 300
+# Mesmas configurações da coleta interativa (coleta_dados/)
+POSE_KWARGS = dict(model_complexity=1, min_detection_confidence=0.5, min_tracking_confidence=0.5)
+VIDEO_EXTENSIONS = ('.mp4', '.avi', '.mov', '.mkv', '.webm')
+
+# Trecho [start, stop) de um vídeo; stop None = até o fim (o número de frames informado pode errar)
+Segment = namedtuple('Segment', ['video', 'start', 'stop'])
+
+
+def video_info(path):
+    """(frames, fps) informados pelo arquivo."""
+    import cv2
+    cap = cv2.VideoCapture(path)
+    try:
+        if not cap.isOpened():
+            raise OSError(f"não foi possível abrir o vídeo '{path}'")
+        return int(cap.get(cv2.CAP_PROP_FRAME_COUNT)), float(cap.get(cv2.CAP_PROP_FPS)) or 30.0
+    finally:
+        cap.release()
+
+
+def plan_segments(path, frames, segment_frames=SEGMENT_FRAMES):
+    """Segmentos do vídeo; o último vai até o fim do arquivo."""
+    starts = list(range(0, max(frames, 1), segment_frames))
+    return [Segment(path, start, start + segment_frames if i < len(starts) - 1 else None)
+            for i, start in enumerate(starts)]
+
+
+def find_videos(paths):
+    """Vídeos dos caminhos dados (pastas são percorridas, em ordem de nome)."""
+    videos = []
+    for path in paths:
+        if os.path.isdir(path):
+            videos += sorted(os.path.join(path, f) for f in os.listdir(path) if f.lower().endswith(VIDEO_EXTENSIONS))
+        else:
+            videos.append(path)
+    return videos
+
+
+# --- Processo do pool ----------------------------------------------------------
+
+_pose = None
+
+
+def _make_pose(pose_kwargs):
+    import mediapipe as mp
+    return mp.solutions.pose.Pose(**pose_kwargs)
+
+
+def _init_worker(pose_kwargs):
+    """Inicializador do pool: um Pose por processo, criado uma única vez."""
+    global _pose
+    _pose = _make_pose(pose_kwargs)
+
+
+def extract_segment(segment, fps=30.0):
+    """Roda no pool: (segmento, índices dos frames, timestamps, landmarks) do trecho."""
+    import cv2
+    cap = cv2.VideoCapture(segment.video)
+    if segment.start:
+        cap.set(cv2.CAP_PROP_POS_FRAMES, segment.start)
+    # Começa o rastreamento do zero: o frame anterior do Pose pode ser de outro vídeo
+    _pose.reset()
+    capacity = (segment.stop - segment.start) if segment.stop is not None else SEGMENT_FRAMES
+    landmarks = np.full((capacity, NUM_LANDMARKS, 4), np.nan, dtype=np.float32)
+    timestamps = np.empty(capacity, dtype=np.float64)
+    raw = rgb = None
+    n = 0
+    try:
+        while segment.stop is None or segment.start + n < segment.stop:
+            ret, raw = cap.read(raw)
+            if not ret:
+                break
+            if n == capacity:
+                # Último segmento maior que o previsto: cresce os buffers
+                capacity *= 2
+                landmarks = np.concatenate([landmarks, np.full_like(landmarks, np.nan)])
+                timestamps = np.resize(timestamps, capacity)
+            msec = cap.get(cv2.CAP_PROP_POS_MSEC)
+            timestamps[n] = msec / 1000 if msec > 0 or segment.start + n == 0 else (segment.start + n) / fps
+            rgb = cv2.cvtColor(raw, cv2.COLOR_BGR2RGB, dst=rgb)
+            # Sem pose, a linha continua NaN
+            landmarks_to_array(_pose.process(rgb), landmarks[n])
+            n += 1
+    finally:
+        cap.release()
+    frames = np.arange(segment.start, segment.start + n, dtype=np.int32)
+    return segment, frames, timestamps[:n], landmarks[:n]
+
+
+# --- Processo principal --------------------------------------------------------
+
+def save_extraction(path, frames, timestamps, landmarks, metadata):
+    """Grava a extração numa pasta temporária e a troca de uma vez pela final."""
+    columns = {'frame': frames, 'timestamp': timestamps, 'landmarks': landmarks}
+    tmp = f"{path}.{os.getpid()}.tmp"
+    shutil.rmtree(tmp, ignore_errors=True)
+    os.makedirs(tmp)
+    for name, array in columns.items():
+        np.ascontiguousarray(array).tofile(os.path.join(tmp, f'{name}.bin'))
+    write_meta(tmp, {'versao': 1, 'colunas': column_specs({n: (a.dtype, a.shape[1:]) for n, a in columns.items()}),
+                     'frames': int(len(frames)), 'frames_com_pose': int((~np.isnan(landmarks[:, 0, 0])).sum()),
+                     'sha1': column_checksums(tmp, columns), **metadata})
+    shutil.rmtree(path, ignore_errors=True)
+    os.replace(tmp, path)
+
+
+def save_copy(source, path):
+    """Copia uma extração pronta (ex.: do cache) para `path`, trocando-a de uma vez."""
+    tmp = f"{path}.{os.getpid()}.tmp"
+    shutil.rmtree(tmp, ignore_errors=True)
+    shutil.copytree(source, tmp)
+    shutil.rmtree(path, ignore_errors=True)
+    os.replace(tmp, path)
+
+
+def output_path(video, output_dir=EXTRACTION_DIR):
+    return os.path.join(output_dir, os.path.splitext(os.path.basename(video))[0])
+
+
+def _summary(path):
+    meta = read_meta(path)
+    return {'saida': path, 'frames': meta['frames'], 'frames_com_pose': meta['frames_com_pose']}
+
+
+def extract_videos(videos, output_dir=EXTRACTION_DIR, workers=None, segment_frames=SEGMENT_FRAMES,
+                   pose_kwargs=POSE_KWARGS, cache=None, log=print):
+    """Extrai todos os vídeos em paralelo; devolve {vídeo: resumo} dos que deram certo.
+
+    Com `cache` (ExtractionCache), os vídeos já extraídos vêm do cache e os
+    novos são guardados nele.
+    """
+    workers = workers or os.cpu_count() or 1
+    plans, infos = {}, {}
+    summaries = {}
+    for video in videos:
+        try:
+            cached = cache.get(video, pose_kwargs, segment_frames) if cache else None
+            if cached is None:
+                infos[video] = video_info(video)
+        except OSError as e:
+            log(f"ERRO: {e}")
+            continue
+        if cached is not None:
+            path = output_path(video, output_dir)
+            save_copy(cached, path)
+            summaries[video] = _summary(path)
+            log(f"{os.path.basename(video)}: {summaries[video]['frames']} frames -> {path} [cache]")
+            continue
+        plans[video] = plan_segments(video, infos[video][0], segment_frames)
+    if not plans:
+        return summaries
+
+    parts = {video: [] for video in plans}
+    started = time.perf_counter()
+    with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker, initargs=(pose_kwargs,)) as pool:
+        futures = {pool.submit(extract_segment, segment, infos[video][1]): video
+                   for video, segments in plans.items() for segment in segments}
+        for future in as_completed(futures):
+            video = futures[future]
+            try:
+                parts[video].append(future.result())
+            except Exception as e:
+                log(f"ERRO ao extrair um segmento de '{video}': {e}")
+                parts[video].append(None)
+            if len(parts[video]) < len(plans[video]):
+                continue
+            results = parts.pop(video)
+            if any(r is None for r in results):
+                continue
+            # Segmentos chegam fora de ordem; remonta pelo início de cada um
+            results.sort(key=lambda r: r[0].start)
+            frames, timestamps, landmarks = (np.concatenate([r[i] for r in results]) for i in (1, 2, 3))
+            path = output_path(video, output_dir)
+            save_extraction(path, frames, timestamps, landmarks,
+                            {'video': os.path.abspath(video), 'fps': infos[video][1], 'pose': pose_kwargs,
+                             'segmento': segment_frames, 'segmentos': len(results)})
+            if cache:
+                cache.put(video, pose_kwargs, segment_frames, path)
+            elapsed = time.perf_counter() - started
+            summaries[video] = {'saida': path, 'frames': len(frames),
+                                'frames_com_pose': int((~np.isnan(landmarks[:, 0, 0])).sum())}
+            log(f"{os.path.basename(video)}: {len(frames)} frames ({summaries[video]['frames_com_pose']} com pose) "
+                f"-> {path} [{elapsed:.1f} s]")
+    return summaries
+
+
+# --- Coleta interativa -----------------------------------------------------------
+
+def cached_landmarks(cache, video, pose_kwargs=POSE_KWARGS):
+    """Landmarks em cache de uma passada contínua pelo vídeo ou, na falta dela, da extração em segmentos."""
+    for segment_frames in (None, SEGMENT_FRAMES):
+        landmarks = cache.landmarks(video, pose_kwargs, segment_frames)
+        if landmarks is not None:
+            return landmarks
+    return None
+
+
+class FullPassRecorder:
+    """Landmarks de cada frame de uma passada contínua por um vídeo, guardados no cache no fim.
+
+    `add` só aceita o próximo frame da sequência (frames repetidos, ex.: com
+    a coleta pausada, são ignorados); `save` só grava se o vídeo foi visto
+    do primeiro ao último frame.
+    """
+
+    def __init__(self, video, pose_kwargs=POSE_KWARGS):
+        self.video = video
+        self.pose_kwargs = pose_kwargs
+        self.timestamps = []
+        self.landmarks = []
+
+    def add(self, frame_index, timestamp, landmarks):
+        if frame_index != len(self.landmarks):
+            return
+        self.timestamps.append(timestamp)
+        self.landmarks.append(np.full((NUM_LANDMARKS, 4), np.nan, dtype=np.float32) if landmarks is None
+                              else np.array(landmarks, dtype=np.float32))
+
+    def save(self, cache, fps=30.0):
+        """Grava a passada inteira no cache (segmento None); devolve a pasta da entrada ou None."""
+        if not self.landmarks:
+            return None
+        tmp = tempfile.mkdtemp(prefix='passada_')
+        try:
+            path = os.path.join(tmp, 'extracao')
+            landmarks = np.stack(self.landmarks)
+            save_extraction(path, np.arange(len(landmarks), dtype=np.int32),
+                            np.array(self.timestamps, dtype=np.float64), landmarks,
+                            {'video': os.path.abspath(self.video), 'fps': fps, 'pose': self.pose_kwargs,
+                             'segmento': None, 'segmentos': 1})
+            return cache.put(self.video, self.pose_kwargs, None, path)
+        finally:
+            shutil.rmtree(tmp, ignore_errors=True)
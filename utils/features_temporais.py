@@ -0,0 +1,186 @@
+# utils/features_temporais.py
+"""Features temporais incrementais sobre uma janela deslizante de frames.
+
+`StreamingFeatureEngine` guarda os últimos `window` vetores (ex.: os 132
+valores de landmarks, ou as probabilidades do classificador) num buffer
+circular e atualiza em O(1) por frame (por feature):
+- média da janela (soma corrente);
+- velocidade: (mais recente - mais antigo) / distância em frames;
+- mínimo e máximo da janela (algoritmo de van Herk/Gil-Werman: máximos de
+  prefixo do bloco atual + máximos de sufixo do bloco anterior, com custo
+  amortizado constante).
+
+O jogo só usa a média (a suavização da janela, `--janela`), então o motor
+calcula só as features pedidas em `features`; velocidade e mínimo/máximo
+ficam para quem pedir.
+
+`batch_features` calcula exatamente as mesmas features para uma sequência
+inteira (ex.: as amostras de um conjunto em dados/); o treinamento
+(utils/treino.py) a usa para treinar com as médias da mesma janela que o
+jogo vai usar.
+"""
+import numpy as np
+
+FEATURE_NAMES = ('mean', 'velocity', 'minimum', 'maximum')
+
+
+class StreamingFeatureEngine:
+    """Média, velocidade, mínimo e máximo de uma janela deslizante, atualizados em O(1).
+
+    `features` escolhe o que é atualizado a cada frame (a média sempre é).
+    """
+
+    def __init__(self, n_features=132, window=5, features=FEATURE_NAMES):
+        unknown = set(features) - set(FEATURE_NAMES)
+        if unknown:
+            raise ValueError(f"features desconhecidas: {', '.join(sorted(unknown))}")
+        self.n_features = n_features
+        self.window = max(1, int(window))
+        self.features = tuple(name for name in FEATURE_NAMES if name == 'mean' or name in features)
+        self._velocity = 'velocity' in self.features
+        self._extremes = 'minimum' in self.features or 'maximum' in self.features
+        W, F = self.window, n_features
+        self._ring = np.empty((W, F), dtype=np.float64)
+        self._sum = np.zeros(F, dtype=np.float64)
+        # Saídas, reaproveitadas a cada update
+        self.mean = np.zeros(F)
+        self.velocity = np.zeros(F) if self._velocity else None
+        if self._extremes:
+            # Prefixos do bloco atual e sufixos do bloco anterior (invertidos)
+            self._prefix_min = np.empty(F)
+            self._prefix_max = np.empty(F)
+            self._suffix_min = np.empty((W, F))
+            self._suffix_max = np.empty((W, F))
+            self.minimum = np.zeros(F)
+            self.maximum = np.zeros(F)
+        else:
+            self.minimum = self.maximum = None
+        self.reset()
+
+    def reset(self):
+        """Esquece o histórico (ex.: quando a pose some do quadro)."""
+        self.count = 0
+        self._sum[:] = 0.0
+
+    def update(self, x):
+        """Adiciona um vetor e atualiza as features pedidas."""
+        W = self.window
+        t = self.count
+        j = t % W
+        x = np.asarray(x).reshape(-1)
+
+        if t >= W:
+            self._sum -= self._ring[j]
+        self._ring[j] = x
+        self._sum += self._ring[j]
+        self.count = t + 1
+        n = min(self.count, W)
+        np.divide(self._sum, n, out=self.mean)
+
+        if self._velocity:
+            # Velocidade entre o mais antigo e o mais recente da janela
+            if n > 1:
+                oldest = self._ring[(t - n + 1) % W]
+                np.subtract(self._ring[j], oldest, out=self.velocity)
+                self.velocity /= n - 1
+            else:
+                self.velocity[:] = 0.0
+        if self._extremes:
+            self._update_extremes(t, j)
+        return self
+
+    def _update_extremes(self, t, j):
+        W = self.window
+        # Mínimo/máximo: prefixo do bloco atual (começa em j == 0)
+        if j == 0:
+            self._prefix_min[:] = self._ring[0]
+            self._prefix_max[:] = self._ring[0]
+        else:
+            np.minimum(self._prefix_min, self._ring[j], out=self._prefix_min)
+            np.maximum(self._prefix_max, self._ring[j], out=self._prefix_max)
+
+        if t >= W and j < W - 1:
+            # Janela = fim do bloco anterior (sufixo a partir de j+1) + prefixo do atual
+            np.minimum(self._suffix_min[W - 1 - (j + 1)], self._prefix_min, out=self.minimum)
+            np.maximum(self._suffix_max[W - 1 - (j + 1)], self._prefix_max, out=self.maximum)
+        else:
+            self.minimum[:] = self._prefix_min
+            self.maximum[:] = self._prefix_max
+
+        if j == W - 1:
+            # Bloco completo: sufixos calculados uma vez a cada W frames
+            np.minimum.accumulate(self._ring[::-1], axis=0, out=self._suffix_min)
+            np.maximum.accumulate(self._ring[::-1], axis=0, out=self._suffix_max)
+
+    @property
+    def amplitude(self):
+        """Amplitude do movimento na janela (máximo - mínimo)."""
+        return self.maximum - self.minimum
+
+    def vector(self, out=None):
+        """Features concatenadas [média, velocidade, mínimo, máximo] (4 * n_features)."""
+        if self.features != FEATURE_NAMES:
+            raise ValueError("vector() precisa de todas as features (features=FEATURE_NAMES)")
+        F = self.n_features
+        if out is None:
+            out = np.empty(4 * F)
+        for i, name in enumerate(FEATURE_NAMES):
+            out[i * F:(i + 1) * F] = getattr(self, name)
+        return out
+
+
+def batch_features(X, window=5, reset=None, features=FEATURE_NAMES):
+    """Mesmas features do StreamingFeatureEngine para uma sequência (N, F) inteira.
+
+    `reset` (N,) bool marca as linhas antes das quais o motor seria
+    reiniciado (ex.: outra fonte, ou frames que não são consecutivos); sem
+    ele, a sequência é uma só. Retorna {nome: array (N, F)} para os nomes
+    pedidos; a linha i é igual ao estado do motor depois de receber as
+    linhas anteriores do mesmo trecho e a própria linha i.
+    """
+    X = np.asarray(X, dtype=np.float64)
+    N, F = X.shape
+    W = max(1, int(window))
+    idx = np.arange(N)
+    if reset is None:
+        run_start = np.zeros(N, dtype=np.intp)
+    else:
+        reset = np.asarray(reset, dtype=bool).copy()
+        if N:
+            reset[0] = True
+        run_start = np.maximum.accumulate(np.where(reset, idx, 0))
+    # Primeira linha da janela de cada linha
+    first = np.maximum(idx - W + 1, run_start)
+    n = idx - first + 1
+
+    csum = np.cumsum(X, axis=0)
+    before = np.zeros_like(X)
+    has_before = first > 0
+    before[has_before] = csum[first[has_before] - 1]
+    result = {'mean': (csum - before) / n[:, None]}
+
+    if 'velocity' in features:
+        velocity = np.zeros_like(X)
+        multi = n > 1
+        velocity[multi] = (X[multi] - X[first[multi]]) / (n[multi] - 1)[:, None]
+        result['velocity'] = velocity
+
+    if 'minimum' in features or 'maximum' in features:
+        from numpy.lib.stride_tricks import sliding_window_view
+        minimum, maximum = np.empty_like(X), np.empty_like(X)
+        starts = np.flatnonzero(np.r_[True, run_start[1:] != run_start[:-1]]) if N else []
+        for a, b in zip(starts, list(starts[1:]) + [N]):
+            run = X[a:b]
+            pad_min = np.vstack([np.full((W - 1, F), np.inf), run])
+            pad_max = np.vstack([np.full((W - 1, F), -np.inf), run])
+            minimum[a:b] = sliding_window_view(pad_min, W, axis=0).min(axis=-1)
+            maximum[a:b] = sliding_window_view(pad_max, W, axis=0).max(axis=-1)
+        result['minimum'], result['maximum'] = minimum, maximum
+
+    return {name: result[name] for name in FEATURE_NAMES if name in result}
+
+
+def batch_feature_matrix(X, window=5, reset=None):
+    """Versão matricial de `batch_features`: (N, 4 * F), na mesma ordem de `vector()`."""
+    features = batch_features(X, window, reset)
+    return np.hstack([features[name] for name in FEATURE_NAMES])
@@ -0,0 +1,126 @@
+# utils/gate_movimento.py
+"""Inferência espaçada e disparada por movimento.
+
+O `GatedBackend` envolve qualquer backend de `utils/inferencia.py` e só roda
+a inferência completa (pose + classificador) quando:
+- já se passaram `stride` frames desde a última inferência, ou
+- uma diferença barata entre frames reduzidos (cinza, 80x60) indica movimento.
+
+Nos frames intermediários ele reaproveita as últimas probabilidades e
+reaproveita (ou extrapola linearmente) os últimos landmarks.
+"""
+import numpy as np
+
+from utils.inferencia import PoseOutput
+
+# Valores usados quando o exercício não define os seus em EXERCISES['...']['gating']
+DEFAULT_STRIDE = 3
+DEFAULT_MOTION_THRESHOLD = 4.0  # diferença média absoluta (0-255) na imagem reduzida
+GATE_SIZE = (80, 60)
+
+
+class MotionGate:
+    """Decide, frame a frame, se vale a pena rodar a inferência completa."""
+
+    def __init__(self, stride=DEFAULT_STRIDE, motion_threshold=DEFAULT_MOTION_THRESHOLD, size=GATE_SIZE):
+        self.stride = max(1, int(stride))
+        self.motion_threshold = motion_threshold
+        self.size = size
+        w, h = size
+        self._small = np.empty((h, w, 3), dtype=np.uint8)
+        self._gray = np.empty((h, w), dtype=np.uint8)
+        self._reference = np.empty((h, w), dtype=np.uint8)
+        self._diff = np.empty((h, w), dtype=np.uint8)
+        self.reset()
+
+    def reset(self):
+        self._has_reference = False
+        self.frames_since = 0
+        self.last_motion = 0.0
+
+    def should_infer(self, frame_rgb):
+        import cv2
+        cv2.resize(frame_rgb, self.size, dst=self._small, interpolation=cv2.INTER_AREA)
+        cv2.cvtColor(self._small, cv2.COLOR_RGB2GRAY, dst=self._gray)
+        self.frames_since += 1
+
+        if not self._has_reference or self.frames_since >= self.stride:
+            run = True
+        else:
+            # Movimento medido contra o frame da última inferência completa
+            cv2.absdiff(self._gray, self._reference, dst=self._diff)
+            self.last_motion = float(cv2.mean(self._diff)[0])
+            run = self.last_motion > self.motion_threshold
+
+        if run:
+            self._reference[...] = self._gray
+            self._has_reference = True
+            self.frames_since = 0
+        return run
+
+
+class GatedBackend:
+    """Backend com a mesma interface dos de `utils/inferencia.py`, mas com gate."""
+
+    def __init__(self, backend, stride=DEFAULT_STRIDE, motion_threshold=DEFAULT_MOTION_THRESHOLD, extrapolate=True):
+        self.backend = backend
+        self.gate = MotionGate(stride, motion_threshold)
+        self.extrapolate = extrapolate
+        self.reset()
+
+    @property
+    def classes_(self):
+        return self.backend.classes_
+
+    def set_model(self, model, model_path=None):
+        self.backend.set_model(model, model_path)
+        self.reset()
+
+    def set_smoothing(self, window):
+        self.backend.set_smoothing(window)
+
+    def set_tracer(self, tracer):
+        self.backend.set_tracer(tracer)
+
+    def reset(self):
+        self.gate.reset()
+        self._last = PoseOutput(None, None)
+        self._velocity = None
+        self._skipped_run = 0
+        self.inferred = 0
+        self.skipped = 0
+
+    def infer(self, frame_rgb):
+        if self.gate.should_infer(frame_rgb):
+            output = self.backend.infer(frame_rgb)
+            last = self._last.landmarks
+            if output.landmarks is not None and last is not None:
+                # Velocidade por frame entre as duas últimas inferências completas
+                self._velocity = (output.landmarks - last) / (self._skipped_run + 1)
+            else:
+                self._velocity = None
+            self._last = output
+            self._skipped_run = 0
+            self.inferred += 1
+            return output
+
+        self.skipped += 1
+        self._skipped_run += 1
+        last = self._last
+        if last.landmarks is None or not self.extrapolate or self._velocity is None:
+            return last
+        landmarks = last.landmarks + self._velocity * self._skipped_run
+        # A visibilidade não é extrapolada
+        landmarks[:, 3] = last.landmarks[:, 3]
+        return PoseOutput(landmarks, last.probabilities)
+
+    @property
+    def skip_ratio(self):
+        total = self.inferred + self.skipped
+        return self.skipped / total if total else 0.0
+
+    def __str__(self):
+        return f"{self.inferred} inferências completas, {self.skipped} reaproveitadas ({self.skip_ratio * 100:.0f}%)"
+
+    def close(self):
+        self.backend.close()
@@ -0,0 +1,253 @@
+# utils/gravacao.py
+"""Gravação compacta das missões: landmarks, probabilidades e eventos de cada frame.
+
+Uma gravação é uma pasta com um arquivo binário por coluna e um `meta.json`:
+
+    gravacoes/missao_20250101_153000/
+        meta.json            colunas (dtype e forma), classes, exercício, contagens
+        timestamp.bin        float64, segundos desde o início da missão
+        landmarks.bin        (33, 4) float16 (ou float32); NaN = nenhuma pose
+        probabilities.bin    (n_classes,) float16 (ou float32); NaN = nenhuma pose
+        event.bin            int8, código do evento (EVENT_CODES; 0 = nenhum)
+        reps.bin             uint16, repetições até o frame
+        exercise.bin         int8, índice do exercício detectado (-1 = nenhum)
+
+Cada coluna é só o array concatenado, então `load_recording` devolve
+`np.memmap`s sem parsing nenhum (o número de linhas sai do tamanho dos
+arquivos, o que também recupera uma gravação interrompida).
+
+No caminho quente, `record()` só copia para blocos pré-alocados; um bloco
+cheio vai para a thread de escrita (`ColumnWriter`), que o grava e o devolve. Se o disco
+atrasar e não houver bloco livre, o frame é descartado e contado, mas o
+jogo nunca espera. Em float16 cada frame ocupa ~290 bytes (~31 MB por hora
+a 30 fps); `max_fps` limita a taxa gravada (DEFAULT_RECORD_FPS, 5 fps ~ 5 MB/h,
+é o padrão do `--gravar`), e frames com evento (transição, repetição...) são
+sempre gravados.
+"""
+import json
+import os
+import queue
+import threading
+import time
+
+import numpy as np
+
+from utils.contador import TRANSITION, REP, WRONG_POSE, LOW_CONFIDENCE, DETECTED
+from utils.landmarks import NUM_LANDMARKS
+
+EVENT_CODES = {TRANSITION: 1, REP: 2, WRONG_POSE: 3, LOW_CONFIDENCE: 4, DETECTED: 5}
+EVENT_NAMES = {code: kind for kind, code in EVENT_CODES.items()}
+META_NAME = 'meta.json'
+CHUNK_ROWS = 256
+CHUNKS = 8
+# FPS gravado por `--gravar` sem valor (0 grava todos os frames)
+DEFAULT_RECORD_FPS = 5.0
+
+
+def _columns(n_classes, dtype):
+    """Colunas da gravação: nome -> (dtype, forma de uma linha)."""
+    return {
+        'timestamp': (np.dtype(np.float64), ()),
+        'landmarks': (np.dtype(dtype), (NUM_LANDMARKS, 4)),
+        'probabilities': (np.dtype(dtype), (n_classes,)),
+        'event': (np.dtype(np.int8), ()),
+        'reps': (np.dtype(np.uint16), ()),
+        'exercise': (np.dtype(np.int8), ()),
+    }
+
+
+class ColumnWriter:
+    """Colunas em blocos pré-alocados, anexadas aos arquivos `<coluna>.bin` por uma thread de fundo.
+
+    `row()` devolve (bloco, linha) para quem grava preencher, ou None se
+    todos os blocos estão esperando o disco; `commit()` confirma a linha
+    (`commit(n)`, as n linhas preenchidas a partir dela, até o fim do bloco).
+    Também usado pelo conjunto de dados da coleta (utils/base_dados.py).
+    """
+
+    def __init__(self, path, columns, chunk_rows=CHUNK_ROWS, chunks=CHUNKS, name='gravacao'):
+        self.path = path
+        self.columns = columns
+        self.chunk_rows = chunk_rows
+        os.makedirs(path, exist_ok=True)
+        # Blocos pré-alocados: {coluna: array (chunk_rows, *forma)} cada
+        self._chunks = [{col: np.empty((chunk_rows,) + shape, dtype=dt) for col, (dt, shape) in columns.items()}
+                        for _ in range(chunks)]
+        self._free = queue.SimpleQueue()
+        for i in range(1, chunks):
+            self._free.put(i)
+        self._current = 0
+        self._row = 0
+        self._full = queue.SimpleQueue()
+        self._files = {col: open(os.path.join(path, f'{col}.bin'), 'ab') for col in columns}
+        self._thread = threading.Thread(target=self._write_loop, name=name, daemon=True)
+        self._thread.start()
+
+    def row(self):
+        if self._current is None:
+            try:
+                self._current = self._free.get_nowait()
+            except queue.Empty:
+                return None
+        return self._chunks[self._current], self._row
+
+    def commit(self, rows=1):
+        self._row += rows
+        if self._row == self.chunk_rows:
+            self.flush()
+
+    def flush(self):
+        """Manda o bloco em andamento (mesmo incompleto) para a thread de escrita."""
+        if self._current is not None and self._row:
+            self._full.put((self._current, self._row))
+            self._current = None
+            self._row = 0
+
+    def _write_loop(self):
+        while True:
+            item = self._full.get()
+            if item is None:
+                break
+            index, rows = item
+            chunk = self._chunks[index]
+            for col, f in self._files.items():
+                f.write(memoryview(chunk[col][:rows]).cast('B'))
+                f.flush()
+            self._free.put(index)
+
+    def close(self):
+        """Grava o bloco em andamento e espera a thread de escrita terminar."""
+        if self._thread is None:
+            return
+        self.flush()
+        self._full.put(None)
+        self._thread.join()
+        self._thread = None
+        for f in self._files.values():
+            f.close()
+
+    @property
+    def closed(self):
+        return self._thread is None
+
+    def size_bytes(self):
+        return sum(os.path.getsize(f.name) for f in self._files.values())
+
+
+def write_meta(path, meta):
+    """meta.json gravado de forma atômica (quem lê nunca vê um arquivo pela metade)."""
+    data = json.dumps(meta, ensure_ascii=False, indent=2)
+    tmp = os.path.join(path, META_NAME + '.tmp')
+    with open(tmp, 'w', encoding='utf-8') as f:
+        f.write(data)
+    os.replace(tmp, os.path.join(path, META_NAME))
+
+
+def read_meta(path):
+    with open(os.path.join(path, META_NAME), encoding='utf-8') as f:
+        return json.load(f)
+
+
+def column_specs(columns):
+    """{coluna: (dtype, forma)} -> formato serializável do meta.json."""
+    return {name: {'dtype': dt.str, 'forma': list(shape)} for name, (dt, shape) in columns.items()}
+
+
+def read_columns(path, specs, mode='r'):
+    """{coluna: np.memmap} a partir das especificações do meta.json, sem parsing."""
+    columns = {name: (np.dtype(spec['dtype']), tuple(spec['forma'])) for name, spec in specs.items()}
+    # Linhas completas em todas as colunas (uma gravação interrompida pode ter uma coluna à frente)
+    rows = min(os.path.getsize(os.path.join(path, f'{name}.bin')) // (dt.itemsize * int(np.prod(shape)))
+               if os.path.exists(os.path.join(path, f'{name}.bin')) else 0
+               for name, (dt, shape) in columns.items())
+    data = {}
+    for name, (dt, shape) in columns.items():
+        file = os.path.join(path, f'{name}.bin')
+        data[name] = np.memmap(file, dtype=dt, mode=mode, shape=(rows,) + shape) if rows else np.empty((0,) + shape, dt)
+    return data
+
+
+class SessionRecorder:
+    """Grava os frames de uma missão em colunas binárias, por uma thread de fundo."""
+
+    def __init__(self, path, classes, exercises=(), metadata=None, dtype=np.float16,
+                 max_fps=None, chunk_rows=CHUNK_ROWS, chunks=CHUNKS):
+        self.path = path
+        self.exercises = list(exercises)
+        self.columns = _columns(len(classes), dtype)
+        self.min_interval = 1.0 / max_fps if max_fps else 0.0
+        self.recorded = 0
+        self.dropped = 0
+        self.skipped = 0
+        self._origin = None
+        self._last = float('-inf')
+        self._writer = ColumnWriter(path, self.columns, chunk_rows, chunks)
+        self._meta = {
+            'versao': 1,
+            'colunas': column_specs(self.columns),
+            'classes': [str(c) for c in classes],
+            'exercicios': self.exercises,
+            'eventos': {str(code): kind for code, kind in EVENT_NAMES.items()},
+            'fps_max': max_fps,
+            'inicio': time.strftime('%Y-%m-%dT%H:%M:%S'),
+            **(metadata or {}),
+        }
+        write_meta(path, self._meta)
+
+    def record(self, timestamp, output, event=None, reps=0):
+        """Grava um frame (PoseOutput + evento do MissionEngine); não bloqueia nem aloca arrays."""
+        if self._origin is None:
+            self._origin = timestamp
+        # (a folga de 1 ms absorve o jitter da câmera sem pular um frame no limite)
+        if event is None and timestamp - self._last < self.min_interval - 1e-3:
+            self.skipped += 1
+            return False
+        slot = self._writer.row()
+        if slot is None:
+            # Todos os blocos esperando o disco: descarta em vez de atrasar o jogo
+            self.dropped += 1
+            return False
+        self._last = timestamp
+        chunk, row = slot
+        chunk['timestamp'][row] = timestamp - self._origin
+        if output.landmarks is None:
+            chunk['landmarks'][row] = np.nan
+            chunk['probabilities'][row] = np.nan
+        else:
+            chunk['landmarks'][row] = output.landmarks
+            chunk['probabilities'][row] = output.probabilities
+        if event is None:
+            chunk['event'][row] = 0
+            chunk['exercise'][row] = -1
+        else:
+            chunk['event'][row] = EVENT_CODES.get(event.kind, 0)
+            chunk['exercise'][row] = self.exercises.index(event.exercise) if event.exercise in self.exercises else -1
+            reps = event.reps
+        chunk['reps'][row] = reps
+        self._writer.commit()
+        self.recorded += 1
+        return True
+
+    def close(self):
+        """Grava o bloco em andamento, espera a thread de escrita e atualiza o meta.json."""
+        if self._writer.closed:
+            return
+        self._writer.close()
+        write_meta(self.path, {**self._meta, 'frames': self.recorded, 'descartados': self.dropped,
+                               'fim': time.strftime('%Y-%m-%dT%H:%M:%S')})
+
+    def __str__(self):
+        return (f"{self.recorded} frames gravados ({self._writer.size_bytes() / 1e6:.1f} MB), "
+                f"{self.dropped} descartados")
+
+
+def load_recording(path):
+    """{coluna: np.memmap} de uma gravação, mais 'meta' (o meta.json)."""
+    meta = read_meta(path)
+    data = read_columns(path, meta['colunas'])
+    data['meta'] = meta
+    return data
+
+
+def is_recording(path):
+    return os.path.isdir(path) and os.path.exists(os.path.join(path, META_NAME))
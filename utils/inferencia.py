@@ -0,0 +1,401 @@
+# utils/inferencia.py
+"""Backends de inferência (pose + classificador) usados pela MissionFrame.
+
+- LocalPoseBackend: roda o `mp_pose.Pose` e o modelo no próprio processo.
+- ProcessPoseBackend: roda ambos em um processo separado. Os frames passam
+  por um buffer circular em `multiprocessing.shared_memory` (nunca são
+  serializados com pickle) e os resultados voltam em registros de tamanho fixo.
+  Cada resposta leva o id do frame: respostas atrasadas (de um frame que
+  estourou o tempo) são descartadas, e um erro num frame volta como
+  resposta, sem derrubar o processo filho.
+"""
+import multiprocessing as mp
+import queue
+import time
+from collections import namedtuple
+from multiprocessing import shared_memory
+
+import numpy as np
+
+from utils.classificador_rapido import compile_classifier, n_classes, predict_proba_row
+from utils.landmarks import NUM_LANDMARKS, landmarks_to_array
+from utils.features_temporais import StreamingFeatureEngine
+from utils.registro_modelos import ModelCache
+
+MAX_CLASSES = 16  # cabe a saída empilhada de todos os exercícios
+FRAME_SHAPE = (480, 640, 3)
+FRAME_TIMEOUT = 5.0  # segundos de espera pelo resultado de um frame
+
+# landmarks: array (33, 4) float32 [x, y, z, visibilidade] ou None
+# probabilities: array (n_classes,) ou None se nenhuma pose foi detectada
+PoseOutput = namedtuple('PoseOutput', ['landmarks', 'probabilities'])
+
+# Registro fixo escrito pelo processo de inferência para cada slot do buffer
+RESULT_DTYPE = np.dtype([
+    ('frame_id', np.int64),
+    ('has_pose', np.int8),
+    ('landmarks', np.float32, (NUM_LANDMARKS, 4)),
+    ('probabilities', np.float32, (MAX_CLASSES,)),
+    # perf_counter() no processo filho: início do Pose, fim do Pose, fim da classificação
+    ('timing', np.float64, (3,)),
+])
+
+# Conexões do esqueleto (mesmas de mp_pose.POSE_CONNECTIONS), para desenhar
+# sem depender do objeto de resultado do MediaPipe
+POSE_CONNECTIONS = (
+    (0, 1), (1, 2), (2, 3), (3, 7), (0, 4), (4, 5), (5, 6), (6, 8), (9, 10),
+    (11, 12), (11, 13), (13, 15), (15, 17), (15, 19), (15, 21), (17, 19),
+    (12, 14), (14, 16), (16, 18), (16, 20), (16, 22), (18, 20), (11, 23),
+    (12, 24), (23, 24), (23, 25), (24, 26), (25, 27), (26, 28), (27, 29),
+    (28, 30), (29, 31), (30, 32), (27, 31), (28, 32),
+)
+
+
+def draw_pose(image, landmarks, visibility_threshold=0.5,
+              point_color=(255, 0, 0), line_color=(255, 255, 255)):
+    """Desenha o esqueleto a partir do array (33, 4) de landmarks normalizados.
+
+    As cores são RGB, pois os frames do pipeline já estão em RGB.
+    """
+    import cv2
+    h, w = image.shape[:2]
+    pts = (landmarks[:, :2] * (w, h)).astype(np.int32)
+    visible = landmarks[:, 3] >= visibility_threshold
+    for a, b in POSE_CONNECTIONS:
+        if visible[a] and visible[b]:
+            cv2.line(image, tuple(pts[a]), tuple(pts[b]), line_color, 2)
+    for i in np.flatnonzero(visible):
+        cv2.circle(image, tuple(pts[i]), 3, point_color, -1)
+    return image
+
+
+class ProbabilityBuffers:
+    """Buffers de probabilidades pré-alocados, usados em rodízio (um por frame classificado).
+
+    As probabilidades de um frame continuam válidas pelos `count - 1` frames
+    seguintes, mais do que o pipeline segura ao mesmo tempo (fila de
+    resultados, frame em exibição e o último resultado do gating).
+    """
+
+    def __init__(self, count=8, width=MAX_CLASSES):
+        self._buffers = np.empty((count, width))
+        self._next = 0
+
+    def next(self, n):
+        """Próximo buffer, com `n` classes."""
+        if n > self._buffers.shape[1]:
+            self._buffers = np.empty((len(self._buffers), n))
+        buffer = self._buffers[self._next, :n]
+        self._next = (self._next + 1) % len(self._buffers)
+        return buffer
+
+
+def _extract(results, model, out=None, engine=None, probabilities=None):
+    """Converte o resultado do MediaPipe em PoseOutput (landmarks + probabilidades).
+
+    Com `out`, os landmarks são escritos nesse buffer (33, 4) em vez de num novo,
+    e com `probabilities` (n_classes,), as probabilidades.
+    Com `engine` (StreamingFeatureEngine), o classificador recebe a média da
+    janela recente de landmarks, o que reduz a oscilação perto das fronteiras
+    entre classes; os landmarks devolvidos continuam sendo os do frame.
+    """
+    return classify_landmarks(model, landmarks_to_array(results, out), engine, probabilities)
+
+
+def classify_landmarks(model, landmarks, engine=None, out=None):
+    """PoseOutput a partir de um array (33, 4) já extraído (ou None, se não há pose).
+
+    Com `out` (ex.: `ProbabilityBuffers.next()`), as probabilidades são
+    escritas nele, sem alocar. Usado também para reprocessar sequências
+    gravadas de landmarks, sem rodar o Pose.
+    """
+    if landmarks is None:
+        if engine is not None:
+            engine.reset()
+        return PoseOutput(None, None)
+    features = landmarks
+    if engine is not None:
+        features = engine.update(landmarks).mean
+    probabilities = predict_proba_row(model, features, out)
+    return PoseOutput(landmarks, probabilities)
+
+
+def smoothing_engine(window):
+    """Motor de features para suavizar a entrada do classificador, ou None se desligado."""
+    if not window or window <= 1:
+        return None
+    return StreamingFeatureEngine(NUM_LANDMARKS * 4, window, features=('mean',))
+
+
+class LocalPoseBackend:
+    """Pose e classificador no mesmo processo (compartilham o GIL com o Tk)."""
+
+    def __init__(self, pose):
+        self.pose = pose
+        self.model = None
+        self.engine = None
+        self.tracer = None
+        self.probabilities = ProbabilityBuffers()
+
+    @property
+    def classes_(self):
+        return self.model.classes_
+
+    def set_model(self, model, model_path=None):
+        # Usa o classificador compilado quando o modelo é StandardScaler + LogisticRegression
+        self.model = compile_classifier(model)
+
+    def set_smoothing(self, window):
+        """Janela (em frames) da média de landmarks que vai ao classificador; 1 desliga."""
+        self.engine = smoothing_engine(window)
+
+    def set_tracer(self, tracer):
+        """Liga (ou desliga, com None) os spans 'pose' e 'classificacao'."""
+        self.tracer = tracer
+
+    def infer(self, frame_rgb):
+        probabilities = self.probabilities.next(n_classes(self.model))
+        if self.tracer is None:
+            return _extract(self.pose.process(frame_rgb), self.model, engine=self.engine,
+                            probabilities=probabilities)
+        t0 = time.perf_counter()
+        results = self.pose.process(frame_rgb)
+        t1 = time.perf_counter()
+        output = _extract(results, self.model, engine=self.engine, probabilities=probabilities)
+        self.tracer.add('pose', t0, t1)
+        self.tracer.add('classificacao', t1)
+        return output
+
+    def close(self):
+        pass
+
+
+# Modelos já carregados no processo de inferência (trocar de missão não relê o disco)
+_model_cache = ModelCache()
+
+
+def _load_model(model_path):
+    """Carrega um modelo, ou vários empilhados se `model_path` for {chave: caminho}."""
+    if isinstance(model_path, dict):
+        multi = _model_cache.multi(model_path)
+        if multi is None:
+            raise ValueError("os modelos não puderam ser empilhados")
+        return multi
+    return _model_cache.compiled(model_path)
+
+
+def _process_frame(pose, model, engine, frames, records, slot, frame_id):
+    """Pose + classificador de um slot; o resultado vai para o registro do mesmo slot."""
+    if model is None:
+        raise RuntimeError("nenhum modelo carregado")
+    t0 = time.perf_counter()
+    results = pose.process(frames[slot])
+    t1 = time.perf_counter()
+    # Landmarks e probabilidades vão direto para o registro compartilhado
+    output = _extract(results, model, out=records['landmarks'][slot], engine=engine,
+                      probabilities=records['probabilities'][slot, :n_classes(model)])
+    records['timing'][slot] = (t0, t1, time.perf_counter())
+    records['frame_id'][slot] = frame_id
+    records['has_pose'][slot] = output.landmarks is not None
+
+
+def _worker_main(frames_name, results_name, slots, frame_shape, pose_kwargs, requests, replies):
+    """Laço do processo de inferência: lê slots do buffer e grava registros fixos."""
+    import mediapipe as mp_lib
+
+    frames_shm = shared_memory.SharedMemory(name=frames_name)
+    results_shm = shared_memory.SharedMemory(name=results_name)
+    frames = np.ndarray((slots,) + frame_shape, dtype=np.uint8, buffer=frames_shm.buf)
+    records = np.ndarray((slots,), dtype=RESULT_DTYPE, buffer=results_shm.buf)
+    model = None
+    engine = None
+
+    try:
+        with mp_lib.solutions.pose.Pose(**pose_kwargs) as pose:
+            # Aquece o grafo já na criação: a primeira chamada é a mais lenta
+            pose.process(np.zeros(frame_shape, dtype=np.uint8))
+            while True:
+                msg = requests.get()
+                if msg is None:
+                    break
+                kind = msg[0]
+                if kind == 'model':
+                    try:
+                        model = _load_model(msg[1])
+                        replies.put(('classes', list(model.classes_)))
+                    except Exception as e:
+                        model = None
+                        replies.put(('error', str(e)))
+                elif kind == 'preload':
+                    for path in msg[1]:
+                        try:
+                            _load_model(path)
+                        except Exception as e:
+                            print(f"AVISO: processo de inferência não pré-carregou {path}: {e}")
+                elif kind == 'smoothing':
+                    engine = smoothing_engine(msg[1])
+                elif kind == 'frame':
+                    _, slot, frame_id = msg
+                    try:
+                        _process_frame(pose, model, engine, frames, records, slot, frame_id)
+                        replies.put(('done', slot, frame_id))
+                    except Exception as e:
+                        # Um frame com erro (ex.: nenhum modelo carregado) não derruba o processo
+                        replies.put(('frame_error', slot, frame_id, f"{type(e).__name__}: {e}"))
+    finally:
+        del frames, records
+        frames_shm.close()
+        results_shm.close()
+
+
+class ProcessPoseBackend:
+    """Pose e classificador em um processo filho, alimentado por memória compartilhada.
+
+    Um frame por vez; os outros slots do anel só servem para que um frame
+    que estourou o tempo (e que o filho ainda pode estar lendo) não seja
+    sobrescrito pelo seguinte.
+    """
+
+    def __init__(self, pose_kwargs, slots=4, frame_shape=FRAME_SHAPE):
+        self.slots = slots
+        self.frame_shape = tuple(frame_shape)
+        self.classes_ = []
+        self.tracer = None
+        self.frame_timeout = FRAME_TIMEOUT
+        self.stale_replies = 0  # respostas atrasadas descartadas
+        self._last_error = None
+        self._next_slot = 0
+        self._next_id = 0
+        # slot -> frame ainda sem resposta (estourou o tempo); o filho pode estar lendo o slot
+        self._busy = {}
+
+        frame_bytes = int(np.prod(self.frame_shape))
+        self._frames_shm = shared_memory.SharedMemory(create=True, size=slots * frame_bytes)
+        self._results_shm = shared_memory.SharedMemory(create=True, size=slots * RESULT_DTYPE.itemsize)
+        self._frames = np.ndarray((slots,) + self.frame_shape, dtype=np.uint8, buffer=self._frames_shm.buf)
+        self._records = np.ndarray((slots,), dtype=RESULT_DTYPE, buffer=self._results_shm.buf)
+
+        ctx = mp.get_context('spawn')
+        self._requests = ctx.Queue()
+        self._replies = ctx.Queue()
+        self._process = ctx.Process(
+            target=_worker_main, name='inferencia-pose', daemon=True,
+            args=(self._frames_shm.name, self._results_shm.name, slots,
+                  self.frame_shape, pose_kwargs, self._requests, self._replies))
+        self._process.start()
+
+    def set_model(self, model, model_path=None):
+        """Carrega o modelo no processo filho (só o caminho atravessa a fila).
+
+        `model_path` pode ser {chave: caminho} para a classificação empilhada.
+        """
+        self._requests.put(('model', model_path))
+        while True:
+            reply = self._replies.get(timeout=30)
+            if reply[0] in ('classes', 'error'):
+                break
+            # Resposta atrasada de um frame anterior
+            self.stale_replies += 1
+        kind, payload = reply
+        if kind == 'error':
+            raise RuntimeError(f"processo de inferência não carregou o modelo: {payload}")
+        self.classes_ = np.array(payload)
+
+    def set_smoothing(self, window):
+        self._requests.put(('smoothing', window))
+
+    def preload(self, model_paths):
+        """Carrega os modelos no processo filho antes de serem pedidos (sem esperar resposta)."""
+        self._requests.put(('preload', list(model_paths)))
+
+    def set_tracer(self, tracer):
+        """Spans 'pose' e 'classificacao' medidos no processo filho (perf_counter é do sistema)."""
+        self.tracer = tracer
+
+    def infer(self, frame_rgb):
+        slot = self._free_slot()
+        frame_id = self._next_id
+        self._next_id += 1
+
+        np.copyto(self._frames[slot], frame_rgb)
+        self._busy[slot] = frame_id
+        self._requests.put(('frame', slot, frame_id))
+        record = self._wait_frame(slot, frame_id)
+        if record is None:
+            return PoseOutput(None, None)
+        if self.tracer:
+            t0, t1, t2 = record['timing']
+            self.tracer.add('pose', t0, t1, track='inferencia-pose')
+            self.tracer.add('classificacao', t1, t2, track='inferencia-pose')
+        if not record['has_pose']:
+            return PoseOutput(None, None)
+        n = len(self.classes_)
+        return PoseOutput(record['landmarks'].copy(), record['probabilities'][:n].astype(np.float64))
+
+    def _free_slot(self):
+        """Próximo slot que o processo filho não está usando.
+
+        Um slot cujo frame estourou o tempo só volta a ser usado depois que a
+        resposta atrasada chega; se todos estiverem assim, espera por uma.
+        """
+        while True:
+            for i in range(self.slots):
+                slot = (self._next_slot + i) % self.slots
+                if slot not in self._busy:
+                    self._next_slot = (slot + 1) % self.slots
+                    return slot
+            self._reply(f"nenhum slot livre: {len(self._busy)} frames sem resposta")
+            self.stale_replies += 1
+
+    def _reply(self, waiting_for, timeout=None):
+        """Próxima resposta do processo filho; libera o slot de um frame que terminou.
+
+        TimeoutError (com `waiting_for` na mensagem) se nada chegar a tempo.
+        """
+        timeout = self.frame_timeout if timeout is None else timeout
+        try:
+            reply = self._replies.get(timeout=max(timeout, 0.0))
+        except queue.Empty:
+            if not self._process.is_alive():
+                raise RuntimeError("o processo de inferência terminou") from None
+            raise TimeoutError(f"o processo de inferência não respondeu em {self.frame_timeout:g} s "
+                               f"({waiting_for})") from None
+        if reply[0] in ('done', 'frame_error') and self._busy.get(reply[1]) == reply[2]:
+            del self._busy[reply[1]]
+        return reply
+
+    def _wait_frame(self, slot, frame_id):
+        """Registro do frame `frame_id`, ou None se o processo filho respondeu com erro.
+
+        Respostas de frames anteriores (que estouraram o tempo) são descartadas.
+        """
+        deadline = time.perf_counter() + self.frame_timeout
+        while True:
+            reply = self._reply(f"frame {frame_id}", deadline - time.perf_counter())
+            kind = reply[0]
+            if kind not in ('done', 'frame_error') or reply[2] != frame_id:
+                self.stale_replies += 1
+                continue
+            if kind == 'frame_error':
+                if reply[3] != self._last_error:
+                    # Uma vez por mensagem, não a cada frame
+                    self._last_error = reply[3]
+                    print(f"ERRO no processo de inferência (frame {frame_id}): {reply[3]}")
+                return None
+            record = self._records[slot]
+            if reply[1] != slot or record['frame_id'] != frame_id:
+                raise RuntimeError(f"registro do slot {slot} não é do frame {frame_id}")
+            self._last_error = None
+            return record
+
+    def close(self):
+        if self._process.is_alive():
+            self._requests.put(None)
+            self._process.join(timeout=2)
+            if self._process.is_alive():
+                self._process.terminate()
+        del self._frames, self._records
+        self._frames_shm.close()
+        self._frames_shm.unlink()
+        self._results_shm.close()
+        self._results_shm.unlink()
@@ -0,0 +1,80 @@
+# utils/inicializacao.py
+"""Abertura rápida do jogo: aquecimento em segundo plano e relatório de tempos.
+
+O menu aparece antes de qualquer módulo pesado (mediapipe, sklearn, pygame,
+cv2) ser importado. Enquanto a criança está na tela de seleção, o `Warmup`
+roda numa thread as tarefas caras (decodificar os sons, criar e aquecer o
+grafo do Pose, carregar os modelos); quem precisa de um resultado chama
+`get(nome)`, que só bloqueia se aquela tarefa ainda não terminou.
+O `StartupTimer` registra os marcos (primeira janela, cada tarefa,
+primeira inferência) para o relatório de inicialização.
+"""
+import threading
+import time
+
+
+class StartupTimer:
+    """Marcos da inicialização, em segundos desde `origin` (perf_counter)."""
+
+    def __init__(self, origin=None):
+        self.origin = time.perf_counter() if origin is None else origin
+        self.marks = {}
+        self.durations = {}
+        self._lock = threading.Lock()
+
+    def mark(self, name):
+        """Registra o marco na primeira vez; chamadas seguintes são ignoradas."""
+        with self._lock:
+            if name not in self.marks:
+                self.marks[name] = time.perf_counter() - self.origin
+                return True
+        return False
+
+    def add_duration(self, name, seconds):
+        with self._lock:
+            self.durations[name] = seconds
+
+    def report(self):
+        marks = " | ".join(f"{name} em {t * 1000:.0f} ms" for name, t in self.marks.items())
+        tasks = ", ".join(f"{name} {t * 1000:.0f} ms" for name, t in self.durations.items())
+        return f"Inicialização: {marks}" + (f" | aquecimento: {tasks}" if tasks else "")
+
+
+class Warmup(threading.Thread):
+    """Roda tarefas de aquecimento em ordem numa thread de fundo.
+
+    `tasks` é uma lista de (nome, função sem argumentos). Erros não derrubam
+    o jogo: ficam guardados e são relançados por `get(nome)`.
+    """
+
+    def __init__(self, tasks, timer=None):
+        super().__init__(name='aquecimento', daemon=True)
+        self.tasks = list(tasks)
+        self.timer = timer
+        self._done = {name: threading.Event() for name, _ in self.tasks}
+        self._results = {}
+        self._errors = {}
+
+    def run(self):
+        for name, fn in self.tasks:
+            t0 = time.perf_counter()
+            try:
+                self._results[name] = fn()
+            except Exception as e:
+                print(f"AVISO: aquecimento '{name}' falhou: {e}")
+                self._errors[name] = e
+            finally:
+                if self.timer:
+                    self.timer.add_duration(name, time.perf_counter() - t0)
+                self._done[name].set()
+
+    def done(self, name):
+        return self._done[name].is_set()
+
+    def get(self, name, timeout=None):
+        """Resultado da tarefa, esperando ela terminar se preciso."""
+        if not self._done[name].wait(timeout):
+            raise TimeoutError(f"aquecimento '{name}' não terminou em {timeout} s")
+        if name in self._errors:
+            raise self._errors[name]
+        return self._results.get(name)
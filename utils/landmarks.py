@@ -0,0 +1,64 @@
+# utils/landmarks.py
+"""Conversão única dos landmarks do MediaPipe para arrays NumPy.
+
+Todo o código (jogo, coleta de dados, normalização e PoseDetector) usa
+`landmarks_to_array` para preencher um buffer (33, 4) float32 pré-alocado
+com [x, y, z, visibilidade], sem montar listas Python a cada frame.
+"""
+import numpy as np
+
+NUM_LANDMARKS = 33
+# Colunas do array (33, 4)
+X, Y, Z, VISIBILITY = 0, 1, 2, 3
+
+
+def new_landmark_buffer():
+    """Buffer (33, 4) float32 para ser reaproveitado entre frames."""
+    return np.empty((NUM_LANDMARKS, 4), dtype=np.float32)
+
+
+def landmarks_to_array(results, out=None):
+    """Preenche `out` (33, 4) com os landmarks de `results`.
+
+    Aceita o resultado de `Pose.process` ou a própria lista de landmarks.
+    Retorna `out` (ou um buffer novo, se não for passado) ou None quando
+    nenhuma pose foi detectada.
+    """
+    landmarks = getattr(results, 'pose_landmarks', results)
+    if not landmarks:
+        return None
+    landmarks = getattr(landmarks, 'landmark', landmarks)
+    if out is None:
+        out = new_landmark_buffer()
+    out.reshape(-1)[:] = np.fromiter(
+        (v for lm in landmarks for v in (lm.x, lm.y, lm.z, lm.visibility)),
+        dtype=np.float32, count=NUM_LANDMARKS * 4)
+    return out
+
+
+def pixel_coords(array, width, height, out=None):
+    """Coordenadas (33, 2) em pixels, truncadas como `int(lm.x * largura)`."""
+    if out is None:
+        out = np.empty((NUM_LANDMARKS, 2), dtype=np.int32)
+    np.multiply(array[:, :2], (width, height), out=out, casting='unsafe')
+    return out
+
+
+class FeatureSubset:
+    """Seleção fixa de landmarks/colunas, extraída para um buffer reaproveitado.
+
+    Ex.: `FeatureSubset([11, 13, 15], columns=(X, Y, Z))` para o braço esquerdo.
+    """
+
+    def __init__(self, indices, columns=(X, Y, Z, VISIBILITY)):
+        self.indices = np.asarray(indices, dtype=np.intp)
+        self.columns = np.asarray(columns, dtype=np.intp)
+        # Índices planos no vetor de 132 valores, para um único np.take
+        self._flat = (self.indices[:, None] * 4 + self.columns[None, :]).reshape(-1)
+        self._out = np.empty((len(self.indices), len(self.columns)), dtype=np.float32)
+
+    def __call__(self, array, out=None):
+        if out is None:
+            out = self._out
+        np.take(array.reshape(-1), self._flat, out=out.reshape(-1))
+        return out
@@ -1,19 +1,29 @@
 # utils/normalizar_pose.py
 import numpy as np
 
+from utils.landmarks import landmarks_to_array, FeatureSubset, X, Y, Z
+
 # Índices principais: [11, 13, 15] = braço esquerdo | [12, 14, 16] = braço direito
 ARM_INDICES = {
     "left": [11, 13, 15],
     "right": [12, 14, 16]
 }
 
+# Extratores (x, y, z) de cada braço, com buffers próprios reaproveitados
+_ARM_SUBSETS = {side: FeatureSubset(idxs, columns=(X, Y, Z)) for side, idxs in ARM_INDICES.items()}
+
+
 def normalizar_pose(landmarks):
-    """Retorna vetor 1D normalizado dos braços, ignorando cabeça e tronco."""
-    all_kp = np.array([[lm.x, lm.y, lm.z] for lm in landmarks])
+    """Retorna vetor 1D normalizado dos braços, ignorando cabeça e tronco.
+
+    Aceita os landmarks do MediaPipe ou um array (33, 4) já convertido.
+    """
+    if not isinstance(landmarks, np.ndarray):
+        landmarks = landmarks_to_array(landmarks)
     braços = []
 
-    for side, idxs in ARM_INDICES.items():
-        kp = all_kp[idxs]
+    for side, subset in _ARM_SUBSETS.items():
+        kp = subset(landmarks).astype(np.float64)
         
         # Centraliza o braço no ombro
         kp -= kp[0]
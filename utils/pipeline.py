@@ -0,0 +1,262 @@
+# utils/pipeline.py
+"""Pipeline em threads: captura -> inferência -> exibição.
+
+Cada estágio roda separado e se comunica por filas limitadas do tipo
+"o mais recente vence": quando o estágio seguinte está atrasado, o frame
+antigo é descartado em vez de acumular latência.
+
+Os frames vivem em buffers RGB pré-alocados (FramePool): a captura faz a
+única conversão de cor do caminho, a inferência e a exibição usam o mesmo
+buffer, e quem termina de usá-lo devolve o slot ao pool.
+"""
+import threading
+import time
+from collections import deque, namedtuple
+
+import numpy as np
+
+# Frame capturado: índice sequencial, instante da captura, a imagem (RGB) e
+# o slot do FramePool que ela ocupa
+FramePacket = namedtuple('FramePacket', ['index', 'timestamp', 'image', 'slot'])
+
+
+class FramePool:
+    """Buffers de imagem pré-alocados, emprestados e devolvidos a cada frame."""
+
+    def __init__(self, shape, count=6, dtype=np.uint8):
+        self.buffers = [np.empty(shape, dtype=dtype) for _ in range(count)]
+        self._free = deque(range(count))
+        self._lock = threading.Lock()
+
+    def acquire(self):
+        """Índice de um buffer livre ou None se todos estão em uso."""
+        with self._lock:
+            return self._free.popleft() if self._free else None
+
+    def release(self, slot):
+        with self._lock:
+            self._free.append(slot)
+
+
+class LatestQueue:
+    """Fila limitada que descarta o item mais antigo quando está cheia."""
+
+    def __init__(self, maxsize=1, on_drop=None):
+        self.maxsize = maxsize
+        self.on_drop = on_drop
+        self.dropped = 0
+        self._items = deque()
+        self._cond = threading.Condition()
+        self._closed = False
+
+    def put(self, item):
+        """Insere o item; se a fila estiver cheia, descarta o mais antigo."""
+        with self._cond:
+            old = None
+            if len(self._items) >= self.maxsize:
+                old = self._items.popleft()
+                self.dropped += 1
+            self._items.append(item)
+            self._cond.notify()
+        if old is not None and self.on_drop:
+            self.on_drop(old)
+
+    def get(self, timeout=None):
+        """Espera por um item. Retorna None se a fila foi fechada ou no timeout."""
+        with self._cond:
+            if not self._items and not self._closed:
+                self._cond.wait(timeout)
+            if not self._items:
+                return None
+            return self._items.popleft()
+
+    def get_nowait(self):
+        """Retorna o item mais recente disponível ou None, sem bloquear."""
+        with self._cond:
+            if not self._items:
+                return None
+            return self._items.popleft()
+
+    def close(self):
+        """Acorda quem está esperando; novos get() retornam None imediatamente."""
+        with self._cond:
+            self._closed = True
+            self._cond.notify_all()
+
+    def drain(self):
+        """Remove e devolve tudo o que ainda está na fila."""
+        with self._cond:
+            items = list(self._items)
+            self._items.clear()
+        return items
+
+
+class StageStats:
+    """Contadores de frames processados e descartados por estágio."""
+
+    STAGES = ('captura', 'inferencia', 'exibicao')
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.processed = {stage: 0 for stage in self.STAGES}
+        self.dropped = {stage: 0 for stage in self.STAGES}
+
+    def add_processed(self, stage, n=1):
+        with self._lock:
+            self.processed[stage] += n
+
+    def set_dropped(self, stage, n):
+        with self._lock:
+            self.dropped[stage] = n
+
+    def snapshot(self):
+        """Cópia consistente dos contadores: {estágio: (processados, descartados)}."""
+        with self._lock:
+            return {stage: (self.processed[stage], self.dropped[stage]) for stage in self.STAGES}
+
+    def __str__(self):
+        parts = [f"{stage}: {p} ok / {d} descartados" for stage, (p, d) in self.snapshot().items()]
+        return " | ".join(parts)
+
+
+class CaptureThread(threading.Thread):
+    """Lê a câmera e publica o frame mais recente, já redimensionado e em RGB."""
+
+    def __init__(self, cap, out_queue, stats, pool, size=(640, 480), tracer=None):
+        super().__init__(name='captura', daemon=True)
+        self.cap = cap
+        self.out_queue = out_queue
+        self.stats = stats
+        self.pool = pool
+        self.size = size
+        self.tracer = tracer
+        # Frames lidos e descartados porque todos os buffers do pool estavam em uso
+        self.pool_dropped = 0
+        self._stop_event = threading.Event()
+
+    def run(self):
+        import cv2
+        w, h = self.size
+        raw = None
+        resized = np.empty((h, w, 3), dtype=np.uint8)
+        index = 0
+        tracer = self.tracer
+        while not self._stop_event.is_set():
+            t0 = time.perf_counter()
+            # Reaproveita o buffer do frame anterior em vez de alocar um novo
+            ret, raw = self.cap.read(raw)
+            if not ret:
+                raw = None
+                # Câmera ainda não entregou nada: evita girar em falso
+                time.sleep(0.01)
+                continue
+            slot = self.pool.acquire()
+            if slot is None:
+                # Todos os buffers ainda em uso pelos estágios seguintes: o frame se perde
+                self.pool_dropped += 1
+                self.stats.set_dropped('captura', self.out_queue.dropped + self.pool_dropped)
+                continue
+            t1 = time.perf_counter()
+            if tracer:
+                # Tempo esperando a câmera entregar o frame
+                tracer.add('captura', t0, t1, frame=index)
+            bgr = raw
+            if raw.shape[1] != w or raw.shape[0] != h:
+                cv2.resize(raw, self.size, dst=resized)
+                bgr = resized
+            image = self.pool.buffers[slot]
+            # Única conversão de cor do caminho: BGR da câmera -> RGB
+            cv2.cvtColor(bgr, cv2.COLOR_BGR2RGB, dst=image)
+            if tracer:
+                tracer.add('conversao', t1, frame=index)
+            self.out_queue.put(FramePacket(index, t1, image, slot))
+            index += 1
+            self.stats.add_processed('captura')
+            # Frames que a inferência não chegou a pegar ou que não couberam no pool
+            self.stats.set_dropped('captura', self.out_queue.dropped + self.pool_dropped)
+
+    def stop(self):
+        self._stop_event.set()
+
+
+class InferenceWorker(threading.Thread):
+    """Consome o frame mais recente, roda `infer_fn` e publica (pacote, resultado)."""
+
+    def __init__(self, in_queue, out_queue, infer_fn, stats, release, tracer=None):
+        super().__init__(name='inferencia', daemon=True)
+        self.in_queue = in_queue
+        self.out_queue = out_queue
+        self.infer_fn = infer_fn
+        self.stats = stats
+        self.release = release
+        self.tracer = tracer
+        self._stop_event = threading.Event()
+
+    def run(self):
+        while not self._stop_event.is_set():
+            packet = self.in_queue.get(timeout=0.1)
+            if packet is None:
+                continue
+            t0 = time.perf_counter()
+            try:
+                result = self.infer_fn(packet.image)
+            except Exception as e:
+                print(f"ERRO na inferência do frame {packet.index}: {e}")
+                self.release(packet)
+                continue
+            if self.tracer:
+                self.tracer.add('inferencia', t0, frame=packet.index)
+            self.out_queue.put((packet, result))
+            self.stats.add_processed('inferencia')
+            # Resultados que a interface não chegou a exibir
+            self.stats.set_dropped('inferencia', self.out_queue.dropped)
+
+    def stop(self):
+        self._stop_event.set()
+        self.in_queue.close()
+
+
+class FramePipeline:
+    """Liga captura e inferência; a thread do Tk só consome `latest()`."""
+
+    def __init__(self, cap, infer_fn, size=(640, 480), pool_size=6, tracer=None):
+        w, h = size
+        self.stats = StageStats()
+        # Em voo no máximo: 1 sendo capturado, 1 em cada fila, 1 na inferência
+        # e 1 na exibição; o pool precisa ser maior que isso
+        self.pool = FramePool((h, w, 3), count=pool_size)
+        self.frame_queue = LatestQueue(maxsize=1, on_drop=self.release)
+        self.result_queue = LatestQueue(maxsize=1, on_drop=lambda item: self.release(item[0]))
+        self.capture = CaptureThread(cap, self.frame_queue, self.stats, self.pool, size, tracer)
+        self.worker = InferenceWorker(self.frame_queue, self.result_queue, infer_fn, self.stats,
+                                      self.release, tracer)
+
+    def start(self):
+        self.capture.start()
+        self.worker.start()
+
+    def release(self, packet):
+        """Devolve ao pool o buffer de um frame que não será mais usado."""
+        self.pool.release(packet.slot)
+
+    def latest(self):
+        """Resultado mais recente (pacote, resultado) ou None se não há novidade.
+
+        Quem recebe o pacote deve chamar `release(pacote)` depois de exibi-lo.
+        """
+        item = self.result_queue.get_nowait()
+        if item is not None:
+            self.stats.add_processed('exibicao')
+        return item
+
+    def stop(self, timeout=1.0):
+        """Para as threads e espera terminarem antes de a câmera ser liberada."""
+        self.capture.stop()
+        self.worker.stop()
+        self.result_queue.close()
+        self.capture.join(timeout)
+        self.worker.join(timeout)
+        for packet in self.frame_queue.drain():
+            self.release(packet)
+        for packet, _ in self.result_queue.drain():
+            self.release(packet)
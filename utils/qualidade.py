@@ -0,0 +1,163 @@
+# utils/qualidade.py
+"""Qualidade adaptativa: troca `model_complexity` e resolução da pose para manter um FPS alvo.
+
+O custo do Pose varia muito de máquina para máquina: complexidade 1 em
+640x480 pode sobrar num desktop e travar um notebook velho. O
+`QualityController` observa a latência de cada inferência e anda por uma
+escada de níveis (do mais caro ao mais barato) com histerese:
+
+- desce um nível quando a mediana da janela passa do orçamento (1 / FPS alvo);
+- sobe um nível só quando sobra folga (`up_ratio` do orçamento) e o nível de
+  cima não estourou o orçamento recentemente (evita o vai e vem); se ele
+  estoura de novo logo depois de ser tentado, a espera até a próxima
+  tentativa dobra (até `max_retry_after`);
+- depois de cada troca espera `cooldown` segundos e uma janela nova inteira.
+
+O `AdaptivePoseBackend` mantém uma instância do Pose aquecida para cada
+complexidade, então trocar de nível não recria o grafo no meio da missão.
+Os landmarks são normalizados (0-1), por isso reduzir a entrada não muda
+nada para o classificador nem para o desenho do esqueleto.
+"""
+import time
+from collections import deque, namedtuple
+
+import numpy as np
+
+from utils.inferencia import LocalPoseBackend
+
+# (model_complexity, (largura, altura)), do mais caro ao mais barato
+QUALITY_LEVELS = (
+    (1, (640, 480)),
+    (0, (640, 480)),
+    (0, (480, 360)),
+    (0, (320, 240)),
+)
+DEFAULT_TARGET_FPS = 30.0
+
+# Uma troca de nível: instante (perf_counter), níveis, mediana da janela (ms) e motivo
+QualityDecision = namedtuple('QualityDecision', ['time', 'previous', 'level', 'latency_ms', 'reason'])
+
+
+def level_label(level):
+    complexity, (w, h) = level
+    return f"complexidade {complexity} @ {w}x{h}"
+
+
+class QualityController:
+    """Escolhe o nível de qualidade a partir das latências observadas."""
+
+    def __init__(self, levels=QUALITY_LEVELS, target_fps=DEFAULT_TARGET_FPS, start=None, window=30,
+                 up_ratio=0.6, cooldown=2.0, retry_after=30.0, max_retry_after=600.0, log=print):
+        self.levels = tuple(levels)
+        self.target_fps = float(target_fps)
+        self.budget = 1.0 / self.target_fps
+        self.window = window
+        self.up_ratio = up_ratio
+        self.cooldown = cooldown
+        # Quanto tempo um nível que estourou o orçamento fica sem ser tentado de novo
+        self.retry_after = retry_after
+        self.max_retry_after = max_retry_after
+        self.log = log
+        # Sem indicação, começa no nível das configurações atuais (complexidade 0, 640x480)
+        self.level = min(1, len(self.levels) - 1) if start is None else start
+        self.decisions = []
+        self._latencies = deque(maxlen=window)
+        self._blocked = {}  # nível -> (instante em que estourou o orçamento, espera até tentar de novo)
+        self._last_change = float('-inf')
+
+    @property
+    def current(self):
+        return self.levels[self.level]
+
+    def observe(self, latency, now=None):
+        """Registra a latência (s) de uma inferência; devolve a QualityDecision se o nível mudou."""
+        now = time.perf_counter() if now is None else now
+        self._latencies.append(latency)
+        if len(self._latencies) < self.window or now - self._last_change < self.cooldown:
+            return None
+
+        median = float(np.median(self._latencies))
+        if median > self.budget and self.level < len(self.levels) - 1:
+            self._block(self.level, now)
+            return self._change(self.level + 1, median, now, "acima do orçamento")
+        if median < self.budget * self.up_ratio and self.level > 0:
+            blocked = self._blocked.get(self.level - 1)
+            if blocked is None or now - blocked[0] >= blocked[1]:
+                return self._change(self.level - 1, median, now, "com folga")
+        return None
+
+    def _block(self, level, now):
+        """Bloqueia o nível que estourou; se ele já tinha estourado e não se sustentou, dobra a espera."""
+        previous = self._blocked.get(level)
+        if previous is None or now - self._last_change >= self.retry_after:
+            wait = self.retry_after
+        else:
+            wait = min(previous[1] * 2, self.max_retry_after)
+        self._blocked[level] = (now, wait)
+
+    def _change(self, level, median, now, reason):
+        decision = QualityDecision(now, self.level, level, median * 1000, reason)
+        self.decisions.append(decision)
+        self.level = level
+        self._latencies.clear()
+        self._last_change = now
+        if self.log:
+            self.log(f"Qualidade: {level_label(self.levels[decision.previous])} -> "
+                     f"{level_label(self.levels[level])} (mediana {decision.latency_ms:.1f} ms, "
+                     f"orçamento {self.budget * 1000:.1f} ms, {reason})")
+        return decision
+
+    def report(self):
+        """Decisões em formato serializável (para o trace da missão)."""
+        return [{'t': round(d.time, 3), 'de': level_label(self.levels[d.previous]),
+                 'para': level_label(self.levels[d.level]), 'mediana_ms': round(d.latency_ms, 2),
+                 'motivo': d.reason} for d in self.decisions]
+
+
+class AdaptivePoseBackend(LocalPoseBackend):
+    """Backend local que segue o nível do QualityController.
+
+    `pose_factory(complexidade)` cria um `mp_pose.Pose`; uma instância por
+    complexidade dos níveis é criada e aquecida em `warm_up()`.
+    """
+
+    def __init__(self, pose_factory, controller=None):
+        self.controller = controller or QualityController()
+        self.pose_factory = pose_factory
+        self.poses = {}
+        self._buffers = {}
+        super().__init__(None)
+
+    def warm_up(self):
+        """Cria o Pose de cada complexidade e roda um frame vazio em cada resolução usada."""
+        for complexity, (w, h) in self.controller.levels:
+            if complexity not in self.poses:
+                self.poses[complexity] = self.pose_factory(complexity)
+            self.poses[complexity].process(np.zeros((h, w, 3), dtype=np.uint8))
+        return self
+
+    def _input(self, frame_rgb, size):
+        w, h = size
+        if frame_rgb.shape[1] == w and frame_rgb.shape[0] == h:
+            return frame_rgb
+        import cv2
+        buffer = self._buffers.get(size)
+        if buffer is None:
+            buffer = self._buffers[size] = np.empty((h, w, 3), dtype=np.uint8)
+        cv2.resize(frame_rgb, size, dst=buffer, interpolation=cv2.INTER_AREA)
+        return buffer
+
+    def infer(self, frame_rgb):
+        complexity, size = self.controller.current
+        if complexity not in self.poses:
+            self.poses[complexity] = self.pose_factory(complexity)
+        self.pose = self.poses[complexity]
+        t0 = time.perf_counter()
+        output = super().infer(self._input(frame_rgb, size))
+        self.controller.observe(time.perf_counter() - t0)
+        return output
+
+    def close(self):
+        for pose in self.poses.values():
+            pose.close()
+        self.poses.clear()
@@ -0,0 +1,120 @@
+# utils/rastreamento.py
+"""Rastreamento leve dos estágios de cada frame (captura, pose, classificação, exibição, áudio).
+
+O `Tracer` grava intervalos ("spans") num buffer circular NumPy
+pré-alocado: gravar um span é um `next()` num contador e a escrita de um
+registro fixo, sem locks nem alocação, então pode ficar ligado durante a
+missão inteira. No fim, `export_chrome` salva tudo no formato trace-event
+do Chrome (abre em chrome://tracing ou https://ui.perfetto.dev), com uma
+trilha por thread.
+"""
+import itertools
+import json
+import threading
+import time
+from contextlib import contextmanager
+
+import numpy as np
+
+SPAN_DTYPE = np.dtype([
+    ('name', np.int16),
+    ('track', np.int16),
+    ('start', np.float64),   # time.perf_counter()
+    ('end', np.float64),
+    ('frame', np.int64),     # índice do frame (-1 quando não se aplica)
+])
+
+
+class Tracer:
+    """Buffer circular de spans; os mais antigos são sobrescritos quando enche."""
+
+    def __init__(self, capacity=100_000):
+        self.capacity = capacity
+        self._records = np.zeros(capacity, dtype=SPAN_DTYPE)
+        self._counter = itertools.count()
+        self._written = 0
+        self._names = {}
+        self._tracks = {}
+        self._lock = threading.Lock()  # só para registrar nomes/trilhas novos
+        self.origin = time.perf_counter()
+
+    now = staticmethod(time.perf_counter)
+
+    def _id(self, table, key):
+        ident = table.get(key)
+        if ident is None:
+            with self._lock:
+                ident = table.setdefault(key, len(table))
+        return ident
+
+    def add(self, name, start, end=None, frame=-1, track=None):
+        """Grava um span; `track` padrão é o nome da thread atual."""
+        if end is None:
+            end = time.perf_counter()
+        if track is None:
+            track = threading.current_thread().name
+        i = next(self._counter)
+        self._records[i % self.capacity] = (self._id(self._names, name), self._id(self._tracks, track),
+                                            start, end, frame)
+        self._written = i + 1
+
+    @contextmanager
+    def span(self, name, frame=-1, track=None):
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.add(name, start, frame=frame, track=track)
+
+    def _recent(self, last=4096):
+        """Os últimos `last` registros, em ordem de gravação."""
+        n = min(self._written, self.capacity, last)
+        end = self._written % self.capacity
+        idx = np.arange(end - n, end) % self.capacity
+        return self._records[idx]
+
+    def durations(self, name, last=300):
+        """Durações (ms) dos últimos `last` spans com esse nome."""
+        ident = self._names.get(name)
+        if ident is None:
+            return np.empty(0)
+        records = self._recent()
+        records = records[records['name'] == ident][-last:]
+        return (records['end'] - records['start']) * 1000
+
+    def rate(self, name, seconds=1.0):
+        """Spans por segundo com esse nome terminados no último `seconds`."""
+        ident = self._names.get(name)
+        if ident is None:
+            return 0.0
+        records = self._recent()
+        ends = records['end'][records['name'] == ident]
+        return float(np.count_nonzero(ends >= time.perf_counter() - seconds)) / seconds
+
+    def summary(self):
+        """{nome: {n, p50_ms, p95_ms}} de todos os spans guardados."""
+        records = self._recent(self.capacity)
+        out = {}
+        for name, ident in self._names.items():
+            d = (records['end'] - records['start'])[records['name'] == ident] * 1000
+            if len(d):
+                out[name] = {'n': int(len(d)), 'p50_ms': float(np.percentile(d, 50)),
+                             'p95_ms': float(np.percentile(d, 95))}
+        return out
+
+    def export_chrome(self, path, metadata=None):
+        """Salva os spans no formato trace-event do Chrome (JSON)."""
+        records = self._recent(self.capacity)
+        names = {ident: name for name, ident in self._names.items()}
+        events = [{'ph': 'M', 'name': 'thread_name', 'pid': 1, 'tid': int(ident), 'args': {'name': track}}
+                  for track, ident in self._tracks.items()]
+        starts = (records['start'] - self.origin) * 1e6
+        durs = (records['end'] - records['start']) * 1e6
+        for r, ts, dur in zip(records.tolist(), starts.tolist(), durs.tolist()):
+            event = {'ph': 'X', 'name': names[r[0]], 'pid': 1, 'tid': r[1], 'ts': ts, 'dur': dur}
+            if r[4] >= 0:
+                event['args'] = {'frame': r[4]}
+            events.append(event)
+        with open(path, 'w', encoding='utf-8') as f:
+            json.dump({'traceEvents': events, 'displayTimeUnit': 'ms', 'otherData': metadata or {}}, f)
+        return len(events)
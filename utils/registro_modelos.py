@@ -0,0 +1,113 @@
+# utils/registro_modelos.py
+"""Registro de modelos: carregados uma vez, mantidos em memória e recarregados só se o arquivo mudar.
+
+- ModelCache: cache LRU limitado, por caminho, dos modelos despicklados e das
+  suas versões compiladas (classificador rápido e empilhamento de todos os
+  exercícios). Cada entrada guarda a assinatura (mtime, tamanho) dos
+  arquivos de origem; se um `.pkl` for retreinado, a próxima consulta o
+  recarrega.
+- ModelRegistry: os exercícios do manifesto (utils/exercicios.py) + um
+  ModelCache; `preload()` roda no aquecimento em segundo plano, e trocar de
+  missão passa a não ler nem despicklar nada do disco.
+"""
+import os
+import pickle
+import threading
+from collections import OrderedDict
+
+from utils.classificador_rapido import compile_classifier, compile_multi
+
+DEFAULT_MAX_ENTRIES = 12
+
+
+def _signature(path):
+    st = os.stat(path)
+    return (st.st_mtime_ns, st.st_size)
+
+
+class ModelCache:
+    """Modelos por caminho, em LRU limitado, validados pela assinatura dos arquivos."""
+
+    def __init__(self, max_entries=DEFAULT_MAX_ENTRIES):
+        self.max_entries = max_entries
+        self._entries = OrderedDict()
+        self._lock = threading.RLock()
+        self.loads = 0  # quantas vezes um arquivo foi de fato lido do disco
+
+    def _get(self, key, paths, build):
+        """Valor em cache para `key`, reconstruído se algum arquivo de `paths` mudou."""
+        signature = tuple(_signature(path) for path in paths)
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and entry[0] == signature:
+                self._entries.move_to_end(key)
+                return entry[1]
+            value = build()
+            self._entries[key] = (signature, value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+            return value
+
+    def load(self, path):
+        """O modelo como foi salvo (Pipeline do sklearn)."""
+        path = os.path.abspath(path)
+
+        def build():
+            with open(path, 'rb') as f:
+                model = pickle.load(f)
+            self.loads += 1
+            return model
+        return self._get(('pkl', path), [path], build)
+
+    def compiled(self, path):
+        """Classificador rápido do modelo (ou o próprio modelo, se não der para compilar)."""
+        path = os.path.abspath(path)
+        return self._get(('compilado', path), [path], lambda: compile_classifier(self.load(path)))
+
+    def multi(self, paths_by_key):
+        """Todos os modelos empilhados num MultiExerciseClassifier (None se algum não servir)."""
+        keys = tuple(sorted(paths_by_key))
+        paths = [os.path.abspath(paths_by_key[key]) for key in keys]
+        return self._get(('multi', keys, tuple(paths)), paths,
+                         lambda: compile_multi({key: self.load(path) for key, path in zip(keys, paths)}))
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+
+class ModelRegistry:
+    """Exercícios do manifesto e os seus modelos, prontos em memória."""
+
+    def __init__(self, exercises, max_entries=DEFAULT_MAX_ENTRIES):
+        self.exercises = exercises
+        self.cache = ModelCache(max_entries)
+
+    def model_path(self, key):
+        return self.exercises[key]['model_path']
+
+    def paths(self):
+        return {key: data['model_path'] for key, data in self.exercises.items()}
+
+    def model(self, key):
+        return self.cache.load(self.model_path(key))
+
+    def compiled(self, key):
+        return self.cache.compiled(self.model_path(key))
+
+    def multi(self):
+        return self.cache.multi(self.paths())
+
+    def preload(self):
+        """Carrega e compila todos os modelos (e o empilhamento da missão automática)."""
+        for key in self.exercises:
+            try:
+                self.compiled(key)
+            except Exception as e:
+                print(f"AVISO: modelo de '{key}' não pôde ser carregado: {e}")
+        try:
+            self.multi()
+        except Exception as e:
+            print(f"AVISO: os modelos não puderam ser empilhados: {e}")
+        return self
@@ -0,0 +1,187 @@
+# utils/rotulos.py
+"""Rótulos por intervalo de tempo: um arquivo de faixas por vídeo, em vez de um `s` por frame.
+
+Cada vídeo tem um arquivo texto em `rotulos/<nome do vídeo>.txt` com uma
+faixa por linha (o fim é exclusivo; `#` começa um comentário):
+
+    # inicio  fim   classe
+    0:03-0:05 up
+    0:05.5    0:07  middle
+    12.0,14.25,down
+
+Os tempos aceitam `m:ss`, `h:mm:ss` ou segundos, com fração. As faixas não
+podem se sobrepor.
+
+Nos scripts de `coleta_dados/`, o `RangeEditor` marca as faixas com o
+teclado enquanto o vídeo roda.
+
+`label_frames` cruza as faixas com os timestamps de uma extração
+(utils/extracao.py) de uma vez, com `np.searchsorted`. `label_video` leva
+esse resultado para um conjunto de dados (utils/base_dados.py): milhares
+de amostras rotuladas numa passada. As amostras anteriores do mesmo vídeo
+são substituídas, então rodar de novo depois de editar as faixas não
+duplica nada.
+"""
+import os
+import re
+from collections import namedtuple
+
+import numpy as np
+
+ANNOTATION_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'rotulos')
+NO_LABEL = -1
+
+Interval = namedtuple('Interval', ['start', 'end', 'label'])
+
+_TIME = r'\d+(?::\d+){0,2}(?:\.\d*)?'
+_LINE = re.compile(rf'^\s*({_TIME})\s*(?:-|–|,|\s)\s*({_TIME})\s*[,\s]\s*(\S+)\s*$')
+
+
+def parse_time(text):
+    """'1:02.5' -> 62.5; também 'h:mm:ss' e segundos puros."""
+    seconds = 0.0
+    for part in text.split(':'):
+        seconds = seconds * 60 + float(part)
+    return seconds
+
+
+def format_time(seconds):
+    minutes, seconds = divmod(seconds, 60)
+    return f"{int(minutes)}:{seconds:05.2f}"
+
+
+def check_intervals(intervals):
+    """Faixas ordenadas pelo início; ValueError se alguma estiver vazia ou se sobrepuser a outra."""
+    intervals = sorted(intervals)
+    for interval in intervals:
+        if interval.end <= interval.start:
+            raise ValueError(f"faixa vazia: {format_time(interval.start)}-{format_time(interval.end)}")
+    for a, b in zip(intervals, intervals[1:]):
+        if b.start < a.end:
+            raise ValueError(f"faixas sobrepostas: {format_time(a.start)}-{format_time(a.end)} {a.label} "
+                             f"e {format_time(b.start)}-{format_time(b.end)} {b.label}")
+    return intervals
+
+
+def parse_intervals(lines, source='<faixas>'):
+    intervals = []
+    for number, line in enumerate(lines, start=1):
+        line = line.split('#', 1)[0].strip()
+        if not line:
+            continue
+        match = _LINE.match(line)
+        if not match:
+            raise ValueError(f"{source}:{number}: esperado 'inicio fim classe', veio '{line}'")
+        start, end, label = match.groups()
+        intervals.append(Interval(parse_time(start), parse_time(end), label))
+    return check_intervals(intervals)
+
+
+def load_intervals(path):
+    with open(path, encoding='utf-8') as f:
+        return parse_intervals(f, path)
+
+
+def save_intervals(path, intervals):
+    """Grava as faixas (de forma atômica) no formato que `load_intervals` lê."""
+    intervals = check_intervals(intervals)
+    os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+    tmp = f"{path}.tmp"
+    with open(tmp, 'w', encoding='utf-8') as f:
+        f.write("# inicio-fim classe (fim exclusivo)\n")
+        for interval in intervals:
+            f.write(f"{format_time(interval.start)}-{format_time(interval.end)} {interval.label}\n")
+    os.replace(tmp, path)
+
+
+def annotation_path(video, annotation_dir=ANNOTATION_DIR):
+    """Arquivo de faixas de um vídeo: rotulos/<nome do vídeo sem extensão>.txt."""
+    return os.path.join(annotation_dir, os.path.splitext(os.path.basename(video))[0] + '.txt')
+
+
+class RangeEditor:
+    """Faixas de um vídeo marcadas na coleta interativa: i abre, f fecha com a classe atual, z desfaz.
+
+    Cada mudança é salva na hora em `path`. As bordas ficam no meio entre
+    dois frames, para o frame atual cair dentro da faixa mesmo com
+    arredondamento.
+    """
+
+    KEYS = (ord('i'), ord('f'), ord('z'))
+
+    def __init__(self, path, fps=30.0):
+        self.path = path
+        self.fps = fps
+        self.intervals = load_intervals(path) if os.path.exists(path) else []
+        self.start = None  # início (s) da faixa aberta
+
+    def edit(self, key, frame_index, label):
+        """Aplica a tecla `key` (código do cv2.waitKey) no frame atual; devolve True se as faixas mudaram."""
+        now = frame_index / self.fps
+        if key == ord('i'):
+            self.start = max(now - 0.5 / self.fps, 0.0)
+            print(f"Início de faixa em {format_time(now)}")
+            return False
+        if key == ord('f') and self.start is not None:
+            interval = Interval(self.start, now + 0.5 / self.fps, label)
+            try:
+                check_intervals(self.intervals + [interval])
+            except ValueError as e:
+                print(f"Faixa recusada: {e}")
+                return False
+            self.intervals.append(interval)
+            self.start = None
+            print(f"Faixa {format_time(interval.start)}-{format_time(interval.end)} '{label}' salva")
+        elif key == ord('z') and self.intervals:
+            interval = self.intervals.pop()
+            print(f"Faixa {format_time(interval.start)}-{format_time(interval.end)} '{interval.label}' removida")
+        else:
+            return False
+        save_intervals(self.path, self.intervals)
+        return True
+
+    def status(self):
+        """Linha de ajuda para a janela da coleta."""
+        open_range = f" | ABERTA DESDE {format_time(self.start)}" if self.start is not None else ""
+        return f"FAIXAS: {len(self.intervals)}{open_range} | INICIO (i) | FIM (f) | DESFAZER (z)"
+
+
+def label_frames(timestamps, intervals):
+    """(códigos por frame, classes): índice em `classes` ou NO_LABEL fora das faixas."""
+    intervals = check_intervals(intervals)
+    classes = sorted({i.label for i in intervals})
+    if not intervals:
+        return np.full(len(timestamps), NO_LABEL, dtype=np.int16), classes
+    starts = np.array([i.start for i in intervals])
+    ends = np.array([i.end for i in intervals])
+    codes = np.array([classes.index(i.label) for i in intervals], dtype=np.int16)
+    timestamps = np.asarray(timestamps)
+    # Faixa que começa antes de cada frame (as faixas não se sobrepõem) e se o frame cai nela
+    which = np.searchsorted(starts, timestamps, side='right') - 1
+    inside = (which >= 0) & (timestamps < ends[np.maximum(which, 0)])
+    return np.where(inside, codes[np.maximum(which, 0)], NO_LABEL).astype(np.int16), classes
+
+
+def labelled_samples(extraction, intervals):
+    """(landmarks (N, 33, 4), rótulos, frames) dos frames dentro das faixas e com pose."""
+    from utils.gravacao import load_recording
+    data = load_recording(extraction)
+    codes, classes = label_frames(data['timestamp'], intervals)
+    keep = (codes != NO_LABEL) & ~np.isnan(data['landmarks'][:, 0, 0])
+    labels = np.array(classes, dtype=object)[codes[keep]] if classes else np.empty(0, dtype=object)
+    return data['landmarks'][keep], labels, data['frame'][keep]
+
+
+def label_video(video, intervals, dataset, extraction):
+    """Substitui no conjunto as amostras do vídeo pelas das faixas; devolve {classe: amostras}.
+
+    A fonte é o nome do vídeo (`source_name`), o mesmo que a coleta
+    interativa grava, então as amostras salvas com `s` também são trocadas.
+    """
+    from utils.base_dados import DatasetWriter, remove_source
+    landmarks, labels, frames = labelled_samples(extraction, intervals)
+    remove_source(dataset, video)
+    with DatasetWriter(dataset) as writer:
+        writer.extend(landmarks, labels, video, frames)
+    names, counts = np.unique(labels.astype(str), return_counts=True)
+    return dict(zip(names.tolist(), counts.tolist()))
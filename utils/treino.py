@@ -0,0 +1,206 @@
+# utils/treino.py
+"""Treinamento de todos os exercícios do manifesto, com validação cruzada e busca em grade.
+
+Cada exercício do manifesto (utils/exercicios.py) aponta para os seus
+conjuntos em `dados/` (campo `dados`). Para cada exercício, cada combinação
+de regularização `C` e conjunto de features (`FEATURE_SETS`) é avaliada
+com `StratifiedKFold`. Todas as combinações de todos os exercícios vão para
+um único pool de processos. Assim que as avaliações de um exercício
+terminam, o melhor modelo (maior F1 macro) é treinado com todos os dados,
+no mesmo pool.
+
+Com `window` > 1 (`--janela` do treinar_modelos.py), cada amostra é a
+média dos últimos `window` frames da sua fonte (`batch_features`), a mesma
+entrada que o jogo dá ao modelo com `--janela`.
+
+O modelo continua sendo `make_pipeline(StandardScaler(), LogisticRegression())`
+sobre os 132 valores de landmarks, que é o que o jogo e o classificador
+rápido (utils/classificador_rapido.py) esperam. Um conjunto de features
+menor é treinado só com as suas colunas e depois expandido para as 132,
+com peso zero nas colunas que ficaram de fora.
+"""
+import os
+import time
+from collections import namedtuple
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+import numpy as np
+
+from utils.base_dados import FEATURE_COLUMNS, dataset_path, load_many
+from utils.landmarks import NUM_LANDMARKS, X, Y, Z, VISIBILITY
+
+DEFAULT_C = (0.01, 0.1, 1.0, 10.0)
+DEFAULT_FOLDS = 5
+SEED = 42
+
+
+def _columns(landmarks, fields):
+    """Índices no vetor de 132 valores (x1, y1, z1, v1, ...) dos landmarks e campos dados."""
+    return np.array([i * 4 + f for i in landmarks for f in fields], dtype=np.intp)
+
+
+_ALL, _BODY = range(NUM_LANDMARKS), range(11, NUM_LANDMARKS)  # 0-10: rosto
+FEATURE_SETS = {
+    'todos': _columns(_ALL, (X, Y, Z, VISIBILITY)),
+    'sem_visibilidade': _columns(_ALL, (X, Y, Z)),
+    'corpo': _columns(_BODY, (X, Y, Z, VISIBILITY)),
+    'corpo_sem_visibilidade': _columns(_BODY, (X, Y, Z)),
+}
+
+# Uma combinação da busca para um exercício
+Candidate = namedtuple('Candidate', ['exercise', 'datasets', 'features', 'C', 'folds', 'seed', 'window'])
+
+
+def make_model(C=1.0, seed=SEED):
+    from sklearn.linear_model import LogisticRegression
+    from sklearn.pipeline import make_pipeline
+    from sklearn.preprocessing import StandardScaler
+    return make_pipeline(StandardScaler(), LogisticRegression(C=C, max_iter=1000, random_state=seed))
+
+
+def expand_pipeline(model, columns, n_features=len(FEATURE_COLUMNS)):
+    """Pipeline treinado em `columns` -> o mesmo pipeline sobre as 132 colunas (peso zero no resto)."""
+    scaler, lr = model[0], model[-1]
+    full = make_model(lr.C, lr.random_state)
+    full_scaler, full_lr = full[0], full[-1]
+    full_scaler.mean_ = np.zeros(n_features)
+    full_scaler.var_ = np.ones(n_features)
+    full_scaler.scale_ = np.ones(n_features)
+    full_scaler.mean_[columns] = scaler.mean_
+    full_scaler.var_[columns] = scaler.var_
+    full_scaler.scale_[columns] = scaler.scale_
+    full_scaler.n_samples_seen_ = scaler.n_samples_seen_
+    full_scaler.n_features_in_ = n_features
+    # Como os modelos antigos, treinados a partir do DataFrame (class, x1..v33)
+    full_scaler.feature_names_in_ = np.array(FEATURE_COLUMNS, dtype=object)
+    full_lr.coef_ = np.zeros((lr.coef_.shape[0], n_features))
+    full_lr.coef_[:, columns] = lr.coef_
+    full_lr.intercept_ = lr.intercept_.copy()
+    full_lr.classes_ = lr.classes_
+    full_lr.n_iter_ = lr.n_iter_
+    full_lr.n_features_in_ = n_features
+    return full
+
+
+def fold_count(labels, folds):
+    """Folds possíveis: no máximo a menor contagem de classe (0 = sem validação cruzada)."""
+    _, counts = np.unique(labels, return_counts=True)
+    n = min(folds, int(counts.min())) if len(counts) > 1 else 0
+    return n if n >= 2 else 0
+
+
+# --- Processo do pool ----------------------------------------------------------
+
+_data = {}
+
+
+def _load(datasets, window=1):
+    """(features, rótulos) dos conjuntos, carregados uma vez por processo."""
+    if (datasets, window) not in _data:
+        features, labels = load_many(datasets, window)
+        _data[datasets, window] = (features, labels.astype(str))
+    return _data[datasets, window]
+
+
+def evaluate(candidate):
+    """Roda no pool: métricas da validação cruzada de uma combinação (C, features)."""
+    from sklearn.metrics import accuracy_score, classification_report, f1_score
+    from sklearn.model_selection import StratifiedKFold
+    features, labels = _load(candidate.datasets, candidate.window)
+    columns = FEATURE_SETS[candidate.features]
+    data = features[:, columns]
+    result = {'features': candidate.features, 'n_features': len(columns), 'C': candidate.C}
+    folds = fold_count(labels, candidate.folds)
+    if not folds:
+        return candidate, result
+    predicted = np.empty(len(labels), dtype=labels.dtype)
+    accuracy, f1 = [], []
+    splitter = StratifiedKFold(n_splits=folds, shuffle=True, random_state=candidate.seed)
+    for train, test in splitter.split(data, labels):
+        model = make_model(candidate.C, candidate.seed).fit(data[train], labels[train])
+        predicted[test] = model.predict(data[test])
+        accuracy.append(accuracy_score(labels[test], predicted[test]))
+        f1.append(f1_score(labels[test], predicted[test], average='macro'))
+    result.update({
+        'acuracia': round(float(np.mean(accuracy)), 4), 'acuracia_dp': round(float(np.std(accuracy)), 4),
+        'f1_macro': round(float(np.mean(f1)), 4), 'f1_macro_dp': round(float(np.std(f1)), 4),
+        # Por classe, sobre as previsões fora do fold de todas as amostras
+        'por_classe': classification_report(labels, predicted, output_dict=True, zero_division=0),
+    })
+    return candidate, result
+
+
+def fit_final(candidate):
+    """Roda no pool: a combinação escolhida treinada com todos os dados, já sobre as 132 colunas."""
+    features, labels = _load(candidate.datasets, candidate.window)
+    columns = FEATURE_SETS[candidate.features]
+    model = make_model(candidate.C, candidate.seed).fit(features[:, columns], labels)
+    return candidate, expand_pipeline(model, columns)
+
+
+# --- Processo principal --------------------------------------------------------
+
+def best_result(results):
+    """Maior F1 macro (depois acurácia); no empate, a primeira da grade."""
+    scored = [r for r in results if 'f1_macro' in r]
+    if not scored:
+        return results[0]
+    return max(scored, key=lambda r: (r['f1_macro'], r['acuracia']))
+
+
+def train_exercises(exercises, C_values=DEFAULT_C, feature_sets=tuple(FEATURE_SETS), folds=DEFAULT_FOLDS,
+                    workers=None, seed=SEED, window=1, log=print):
+    """Busca e treino final de cada exercício em paralelo; devolve ({chave: modelo}, {chave: relatório})."""
+    datasets, reports = {}, {}
+    for key, data in exercises.items():
+        if not data['dados']:
+            log(f"AVISO: '{key}' não tem 'dados' no manifesto; ignorado")
+            continue
+        datasets[key] = tuple(dataset_path(name) for name in data['dados'])
+        try:
+            _, labels = load_many(datasets[key])
+        except OSError as e:
+            log(f"AVISO: conjunto de '{key}' não pôde ser aberto ({e}); ignorado")
+            continue
+        names, counts = np.unique(labels.astype(str), return_counts=True)
+        if len(names) < 2:
+            log(f"AVISO: '{key}' precisa de pelo menos duas classes; ignorado")
+            continue
+        reports[key] = {'dados': list(data['dados']), 'janela': window, 'amostras': len(labels),
+                        'classes': dict(zip(names.tolist(), counts.tolist())),
+                        'folds': fold_count(labels, folds), 'busca': []}
+
+    models = {}
+    pending = {key: len(C_values) * len(feature_sets) for key in reports}
+    started = time.perf_counter()
+    with ProcessPoolExecutor(max_workers=workers or os.cpu_count() or 1) as pool:
+        futures = {pool.submit(evaluate, Candidate(key, datasets[key], name, float(C), folds, seed, window))
+                   for key in reports for name in feature_sets for C in C_values}
+        finals = set()
+        while futures:
+            future = next(as_completed(futures))
+            futures.remove(future)
+            candidate, result = future.result()
+            if future in finals:
+                # Treino final: o modelo já vem expandido para as 132 colunas
+                models[candidate.exercise] = result
+                reports[candidate.exercise]['segundos'] = round(time.perf_counter() - started, 2)
+                log(f"{candidate.exercise}: modelo final treinado ({candidate.features}, C={candidate.C:g})")
+                continue
+            reports[candidate.exercise]['busca'].append(result)
+            pending[candidate.exercise] -= 1
+            if pending[candidate.exercise]:
+                continue
+            # Todas as combinações avaliadas: o treino final entra no mesmo pool
+            del pending[candidate.exercise]
+            report = reports[candidate.exercise]
+            report['busca'].sort(key=lambda r: (feature_sets.index(r['features']), r['C']))
+            best = best_result(report['busca'])
+            report['melhor'] = {k: v for k, v in best.items() if k != 'por_classe'}
+            report['por_classe'] = best.get('por_classe')
+            for r in report['busca']:
+                r.pop('por_classe', None)
+            final = pool.submit(fit_final, candidate._replace(features=best['features'], C=best['C']))
+            finals.add(final)
+            futures.add(final)
+    return models, reports